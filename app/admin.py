@@ -9,6 +9,9 @@ from .models import (
     ListItem,
     Follow,
     Activity,
+    Person,
+    Genre,
+    ContentRefreshTask,
 )
 
 
@@ -19,6 +22,24 @@ class ContentAdmin(admin.ModelAdmin):
     list_filter = ("type", "source", "year")
 
 
+@admin.register(ContentRefreshTask)
+class ContentRefreshTaskAdmin(admin.ModelAdmin):
+    list_display = ("content", "priority", "attempts", "not_before", "enqueued_at")
+    raw_id_fields = ("content",)
+
+
+@admin.register(Person)
+class PersonAdmin(admin.ModelAdmin):
+    list_display = ("name", "key")
+    search_fields = ("name", "key")
+
+
+@admin.register(Genre)
+class GenreAdmin(admin.ModelAdmin):
+    list_display = ("name", "key")
+    search_fields = ("name", "key")
+
+
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ("user",)
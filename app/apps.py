@@ -1,5 +1,11 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class AppConfig(AppConfig):
     name = 'app'
+
+    def ready(self):
+        from . import signals
+
+        post_migrate.connect(signals.search_index_after_migrate, sender=self)
@@ -0,0 +1,130 @@
+# app/cache.py
+"""
+Serileştirilmiş Content temsilleri için okuma önbelleği.
+
+Önde süreç içi LRU, arkada Django cache framework'ü (settings.CONTENT_CACHE
+ile seçilen alias). Her kayıt içeriğin sürümüyle (updated_at + puan özetleri)
+birlikte saklanır; sürüm tutmazsa kayıt yok sayılır. Böylece başka bir
+süreçteki değişiklikler de eski veri döndürmez. Content / Rating sinyalleri
+kayıtları ayrıca siler (app/signals.py).
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import metrics
+
+
+def content_version(instance) -> tuple:
+    return (instance.updated_at, instance.rating_count, instance.rating_sum)
+
+
+def serializer_variant(serializer) -> str:
+    # Aynı içerik farklı serializer / alan kümesiyle farklı kayıt olarak tutulur
+    names = ",".join(
+        name for name, field in serializer.fields.items() if not field.write_only
+    )
+    digest = hashlib.md5(names.encode("utf-8"), usedforsecurity=False).hexdigest()[:12]
+    return f"{type(serializer).__name__}.{digest}"
+
+
+class ContentRepresentationCache:
+    def __init__(self, alias="default", max_entries=5000, timeout=600):
+        self.alias = alias
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._local = OrderedDict()
+        self._variants = {}  # content_id -> bu süreçte görülen variant'lar
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_settings(cls):
+        conf = getattr(settings, "CONTENT_CACHE", {})
+        return cls(
+            alias=conf.get("ALIAS", "default"),
+            max_entries=conf.get("LOCAL_MAX_ENTRIES", 5000),
+            timeout=conf.get("TIMEOUT", 600),
+        )
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    @staticmethod
+    def _key(content_id, variant) -> str:
+        return f"content:{variant}:{content_id}"
+
+    def _remember(self, key, content_id, variant, version, data):
+        self._local[key] = (version, data, content_id, variant)
+        self._local.move_to_end(key)
+        self._variants.setdefault(content_id, set()).add(variant)
+        while len(self._local) > self.max_entries:
+            _, (_, _, old_id, old_variant) = self._local.popitem(last=False)
+            variants = self._variants.get(old_id)
+            if variants is not None:
+                variants.discard(old_variant)
+                if not variants:
+                    del self._variants[old_id]
+
+    def get(self, content_id, variant, version):
+        key = self._key(content_id, variant)
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] == version:
+                self._local.move_to_end(key)
+                self.local_hits += 1
+                return entry[1]
+
+        entry = self.shared.get(key)
+        with self._lock:
+            if entry is not None and entry[0] == version:
+                self._remember(key, content_id, variant, entry[0], entry[1])
+                self.shared_hits += 1
+                return entry[1]
+            self.misses += 1
+        return None
+
+    def set(self, content_id, variant, version, data):
+        key = self._key(content_id, variant)
+        with self._lock:
+            self._remember(key, content_id, variant, version, data)
+        self.shared.set(key, (version, data), self.timeout)
+
+    def invalidate(self, content_id):
+        with self._lock:
+            variants = self._variants.pop(content_id, set())
+            keys = [self._key(content_id, v) for v in variants]
+            for key in keys:
+                self._local.pop(key, None)
+            self.invalidations += 1
+        if keys:
+            self.shared.delete_many(keys)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+            self._variants.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.local_hits + self.shared_hits + self.misses
+            return {
+                "local_hits": self.local_hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round((lookups - self.misses) / lookups, 4) if lookups else None,
+                "local_size": len(self._local),
+                "local_max_entries": self.max_entries,
+            }
+
+
+content_cache = ContentRepresentationCache.from_settings()
+metrics.register("content_cache", content_cache.stats)
@@ -0,0 +1,236 @@
+# app/catalog.py
+"""
+Harici kaynaklardan gelen içeriklerin katalog tarafı:
+Content'in JSON kişi/tür listelerini normalize Person/Genre tablolarına yansıtır.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .indexes import contents_created
+from .models import (
+    Content,
+    ContentGenre,
+    ContentPerson,
+    Genre,
+    Person,
+    normalize_name,
+)
+from .services.google_books import GoogleBooksError, get_book_details
+from .services.tmdb import TMDBError, get_movie_details
+
+ROLE_FIELDS = {
+    ContentPerson.Role.DIRECTOR: "directors",
+    ContentPerson.Role.WRITER: "writers",
+    ContentPerson.Role.AUTHOR: "authors",
+    ContentPerson.Role.CAST: "cast",
+}
+# Bağlantıları belirleyen Content alanları
+RELATION_FIELDS = (*ROLE_FIELDS.values(), "genres")
+
+
+def _names(values) -> List[str]:
+    if not isinstance(values, list):
+        return []
+    return [str(v).strip() for v in values if v and str(v).strip()]
+
+
+PERSON_MAX = 255
+GENRE_MAX = 100
+
+
+def _key(name: str, max_length: int) -> str:
+    return normalize_name(name)[:max_length]
+
+
+def _ensure(model, names: Iterable[str], max_length: int) -> Dict[str, int]:
+    """
+    İsimler için satırları (yoksa) oluşturur, key -> id döner.
+    """
+    by_key = {}
+    for name in names:
+        by_key.setdefault(_key(name, max_length), name[:max_length])
+    if not by_key:
+        return {}
+    model.objects.bulk_create(
+        [model(name=name, key=key) for key, name in by_key.items()],
+        ignore_conflicts=True,
+    )
+    return dict(model.objects.filter(key__in=by_key).values_list("key", "id"))
+
+
+def sync_content_relations(contents: Iterable[Content]) -> None:
+    """
+    Verilen içeriklerin ContentPerson / ContentGenre bağlantılarını
+    JSON alanlarından yeniden kurar.
+    """
+    contents = [c for c in contents if c.pk]
+    if not contents:
+        return
+
+    people = [
+        name
+        for c in contents
+        for field in ROLE_FIELDS.values()
+        for name in _names(getattr(c, field))
+    ]
+    genres = [name for c in contents for name in _names(c.genres)]
+
+    with transaction.atomic():
+        person_ids = _ensure(Person, people, PERSON_MAX)
+        genre_ids = _ensure(Genre, genres, GENRE_MAX)
+
+        person_links = []
+        genre_links = []
+        for c in contents:
+            for role, field in ROLE_FIELDS.items():
+                for order, name in enumerate(_names(getattr(c, field))):
+                    person_links.append(
+                        ContentPerson(
+                            content_id=c.pk,
+                            person_id=person_ids[_key(name, PERSON_MAX)],
+                            role=role,
+                            order=order,
+                        )
+                    )
+            for name in _names(c.genres):
+                genre_links.append(
+                    ContentGenre(
+                        content_id=c.pk, genre_id=genre_ids[_key(name, GENRE_MAX)]
+                    )
+                )
+
+        ids = [c.pk for c in contents]
+        ContentPerson.objects.filter(content_id__in=ids).delete()
+        ContentGenre.objects.filter(content_id__in=ids).delete()
+        ContentPerson.objects.bulk_create(person_links, ignore_conflicts=True)
+        ContentGenre.objects.bulk_create(genre_links, ignore_conflicts=True)
+
+
+# source -> detay çeken fonksiyon
+DETAIL_FETCHERS = {
+    "tmdb": lambda external_id: get_movie_details(int(external_id)),
+    "google_books": lambda external_id: get_book_details(str(external_id)),
+}
+
+
+def _year(value):
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def content_from_details(details: Dict[str, Any]) -> Content:
+    """
+    get_movie_details / get_book_details çıktısından kaydedilmemiş Content.
+    """
+    return Content(
+        type=details["type"],
+        source=details["source"],
+        external_id=str(details["external_id"]),
+        title=details.get("title") or "",
+        original_title=details.get("original_title") or "",
+        year=_year(details.get("year")),
+        description=details.get("description") or "",
+        poster_url=details.get("poster_url") or "",
+        runtime_minutes=details.get("runtime_minutes"),
+        page_count=details.get("page_count"),
+        directors=details.get("directors", []),
+        writers=details.get("writers", []),
+        authors=details.get("authors", []),
+        genres=details.get("genres", []),
+        cast=details.get("cast", []),
+        fetched_at=timezone.now(),
+    )
+
+
+def _fetch(pair: Tuple[str, str]):
+    source, external_id = pair
+    try:
+        # İstek içinde çalışır: etkileşimli öncelik (kısa kota beklemesi,
+        # okuma zaman aşımı tekrar denenmez). Havuz thread'leri contextvar
+        # taşımadığından öncelik varsayılandır.
+        return DETAIL_FETCHERS[source](external_id), None
+    except (TMDBError, GoogleBooksError, ValueError) as e:
+        return None, str(e)
+
+
+def _by_pairs(pairs) -> Dict[Tuple[str, str], Content]:
+    if not pairs:
+        return {}
+    match = Q()
+    for source, external_id in pairs:
+        match |= Q(source=source, external_id=external_id)
+    return {(c.source, c.external_id): c for c in Content.objects.filter(match)}
+
+
+def import_contents(pairs: Iterable[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """
+    (source, external_id) çiftlerini toplu içe aktarır:
+    tek sorguda varlık kontrolü, eksiklerin detayları sınırlı paralellikle,
+    tek bulk_create (unique (source, external_id) çakışmaları yok sayılır).
+    Her çift için {"source", "external_id", "status", "content" | "detail"} döner;
+    status: exists / created / error.
+    """
+    pairs = list(dict.fromkeys((source, str(external_id)) for source, external_id in pairs))
+    if not pairs:
+        return []
+    existing = _by_pairs(pairs)
+    missing = [pair for pair in pairs if pair not in existing]
+
+    fetched, errors = {}, {}
+    if missing:
+        workers = min(getattr(settings, "EXTERNAL_IMPORT_CONCURRENCY", 4), len(missing))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import") as pool:
+            for pair, (details, error) in zip(missing, pool.map(_fetch, missing)):
+                if error is not None:
+                    errors[pair] = error
+                else:
+                    fetched[pair] = content_from_details(details)
+
+    created = {}
+    if fetched:
+        Content.objects.bulk_create(fetched.values(), ignore_conflicts=True)
+        # ignore_conflicts ile pk dönmez; aynı anda içe aktarılanlar da burada gelir
+        rows = _by_pairs([(c.source, c.external_id) for c in fetched.values()])
+        created = {
+            pair: rows[(c.source, c.external_id)]
+            for pair, c in fetched.items()
+            if (c.source, c.external_id) in rows
+        }
+        sync_content_relations(rows.values())
+        contents_created(rows.values())
+
+    results = []
+    for pair in pairs:
+        source, external_id = pair
+        item = {"source": source, "external_id": external_id}
+        if pair in existing:
+            item.update(status="exists", content=existing[pair])
+        elif pair in created:
+            item.update(status="created", content=created[pair])
+        else:
+            item.update(status="error", detail=errors.get(pair, "İçerik kaydedilemedi."))
+        results.append(item)
+    return results
+
+
+def filter_by_genre(qs, name: str):
+    return qs.filter(
+        id__in=ContentGenre.objects.filter(genre__key=_key(name, GENRE_MAX)).values(
+            "content_id"
+        )
+    )
+
+
+def filter_by_person(qs, role: str, name: str):
+    return qs.filter(
+        id__in=ContentPerson.objects.filter(
+            role=role, person__key=_key(name, PERSON_MAX)
+        ).values("content_id")
+    )
@@ -0,0 +1,156 @@
+# app/conditional.py
+"""
+ETag / Last-Modified desteği.
+
+Doğrulayıcılar serializer çalışmadan, küçük bir `values()` sorgusuyla
+hesaplanır; If-None-Match / If-Modified-Since tutuyorsa 304 döner ve
+gövde hiç üretilmez.
+"""
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .models import Follow
+
+# Content sürümü: updated_at puan özetleri değişince de ilerler;
+# özet alanları yine de ETag'e katılır.
+CONTENT_VERSION_FIELDS = ("id", "updated_at", "rating_count", "rating_sum")
+
+
+def make_etag(*parts, weak=False) -> str:
+    digest = hashlib.md5(
+        "|".join(str(p) for p in parts).encode("utf-8"), usedforsecurity=False
+    ).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def _timestamp(dt):
+    return timegm(dt.utctimetuple()) if dt else None
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Koşullu istek tutuyorsa 304 (ETag başlığıyla) döner, yoksa None.
+    """
+    response = get_conditional_response(
+        request, etag=etag, last_modified=_timestamp(last_modified)
+    )
+    if response is not None:
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(_timestamp(last_modified))
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(_timestamp(last_modified))
+    return response
+
+
+def content_version(values) -> tuple:
+    return tuple(values[f] for f in CONTENT_VERSION_FIELDS)
+
+
+def _follow_count(**filters):
+    counts = (
+        Follow.objects.filter(**filters)
+        .order_by()
+        .values(*filters)
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def annotate_profile_version(queryset, request):
+    """
+    Profil sürümünü (ve serializer'ın saydıklarını) aynı sorguda getirir;
+    liste ETag'i ve serileştirme satır başına sorgu atmaz.
+    """
+    viewer = request.user.pk if request.user.is_authenticated else None
+    follow_id = Value(None, output_field=IntegerField())
+    if viewer:
+        follow_id = Subquery(
+            Follow.objects.filter(follower_id=viewer, following_id=OuterRef("user_id")).values(
+                "id"
+            )[:1]
+        )
+    # Takipçi sayısı Profile.followers_count kolonunda tutulur
+    return queryset.annotate(
+        following_total=_follow_count(follower_id=OuterRef("user_id")),
+        viewer_follow_id=follow_id,
+    )
+
+
+def profile_version(profile, request) -> tuple:
+    """
+    ProfileSerializer çıktısını belirleyen her şey: profil satırı,
+    takip sayıları ve isteği yapan kullanıcının takip durumu.
+    annotate_profile_version'dan gelmeyen tek profil için sorgu atar.
+    """
+    viewer = request.user.pk if request.user.is_authenticated else None
+    if hasattr(profile, "following_total"):
+        return (
+            profile.pk,
+            profile.updated_at,
+            profile.followers_count,
+            profile.following_total,
+            viewer,
+            profile.viewer_follow_id,
+        )
+    follow_id = None
+    if viewer:
+        follow_id = (
+            Follow.objects.filter(follower_id=viewer, following_id=profile.user_id)
+            .values_list("id", flat=True)
+            .first()
+        )
+    return (
+        profile.pk,
+        profile.updated_at,
+        profile.followers_count,
+        Follow.objects.filter(follower_id=profile.user_id).count(),
+        viewer,
+        follow_id,
+    )
+
+
+class ConditionalListMixin:
+    """
+    list(): sayfadaki nesnelerin sürümlerinden zayıf ETag üretir,
+    eşleşirse serileştirmeden 304 döner.
+    """
+
+    vary_on_user = False
+
+    def get_list_version(self, obj):
+        return (obj.pk, getattr(obj, "updated_at", None))
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        objects = page if page is not None else list(queryset)
+
+        etag = make_etag(
+            request.get_full_path(),
+            *(self.get_list_version(obj) for obj in objects),
+            weak=True,
+        )
+        response = not_modified(request, etag)
+        if response is None:
+            serializer = self.get_serializer(objects, many=True)
+            if page is not None:
+                response = self.get_paginated_response(serializer.data)
+            else:
+                response = Response(serializer.data)
+            response["ETag"] = etag
+        if self.vary_on_user:
+            patch_vary_headers(response, ("Authorization",))
+        return response
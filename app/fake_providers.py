@@ -0,0 +1,234 @@
+# app/fake_providers.py
+"""
+Ağa çıkmadan performans ölçümü için yerel TMDb / Google Books taklidi.
+
+Kayıtlı örnekler (app/fixtures/fake_providers.json) önce eşleştirilir;
+eşleşmeyen sorgu ve id'ler için deterministik sentetik kayıt üretilir,
+böylece her sorgu ve her id sonuç döner. Gecikme, hata oranı ve 429
+(Retry-After ile) enjekte edilebilir.
+
+Servisleri yönlendirmek için:
+    TMDB_BASE_URL=http://127.0.0.1:8001/3
+    GOOGLE_BOOKS_BASE=http://127.0.0.1:8001/books/v1/volumes
+"""
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "fake_providers.json")
+
+TMDB_PREFIX = "/3"
+GOOGLE_BOOKS_PREFIX = "/books/v1/volumes"
+SYNTHETIC_GENRES = ["Dram", "Komedi", "Aksiyon", "Korku", "Bilim Kurgu", "Macera", "Animasyon"]
+TMDB_PAGE_SIZE = 20
+TMDB_TOTAL_PAGES = 5
+GOOGLE_BOOKS_TOTAL = 100
+
+
+@dataclass
+class FakeProviderConfig:
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    error_rate: float = 0.0  # 500 dönen isteklerin oranı
+    throttle_rate: float = 0.0  # 429 dönen isteklerin oranı
+    retry_after: int = 1
+    seed: Optional[int] = None
+
+
+def load_fixtures(path: str = FIXTURES_PATH) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _n(text: str) -> int:
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def _synthetic_movie(movie_id: int) -> Dict[str, Any]:
+    year = 1950 + movie_id % 75
+    return {
+        "id": movie_id,
+        "title": f"Film {movie_id}",
+        "original_title": f"Movie {movie_id}",
+        "release_date": f"{year}-01-01",
+        "runtime": 80 + movie_id % 90,
+        "overview": f"Sentetik film {movie_id}.",
+        "poster_path": f"/synthetic{movie_id}.jpg",
+        "genres": [{"id": movie_id % 7, "name": SYNTHETIC_GENRES[movie_id % 7]}],
+        "credits": {
+            "crew": [{"job": "Director", "name": f"Yönetmen {movie_id % 500}"}],
+            "cast": [{"name": f"Oyuncu {(movie_id + i) % 2000}", "order": i} for i in range(5)],
+        },
+    }
+
+
+def _synthetic_volume(volume_id: str) -> Dict[str, Any]:
+    n = _n(volume_id)
+    return {
+        "id": volume_id,
+        "volumeInfo": {
+            "title": f"Kitap {volume_id}",
+            "publishedDate": f"{1900 + n % 125}-01-01",
+            "authors": [f"Yazar {n % 800}"],
+            "categories": [["Fiction", "History", "Science", "Poetry"][n % 4]],
+            "pageCount": 100 + n % 600,
+            "description": f"Sentetik kitap {volume_id}.",
+            "imageLinks": {"thumbnail": f"http://books.google.com/books/content?id={volume_id}"},
+        },
+    }
+
+
+class FakeProviderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: FakeProviderConfig, fixtures: Dict[str, Any]):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.counters = {"requests": 0, "errors": 0, "throttled": 0}
+        self.movies = {m["id"]: m for m in fixtures.get("tmdb", {}).get("movies", [])}
+        self.volumes = {v["id"]: v for v in fixtures.get("google_books", {}).get("volumes", [])}
+
+    @property
+    def base_urls(self) -> Dict[str, str]:
+        host, port = self.server_address[:2]
+        return {
+            "tmdb": f"http://{host}:{port}{TMDB_PREFIX}",
+            "google_books": f"http://{host}:{port}{GOOGLE_BOOKS_PREFIX}",
+        }
+
+    def roll(self):
+        """
+        Bu istek için (gecikme saniye, enjekte edilecek durum kodu | None).
+        """
+        c = self.config
+        with self.lock:
+            self.counters["requests"] += 1
+            delay = max(c.latency_ms + self.random.uniform(-c.jitter_ms, c.jitter_ms), 0) / 1000
+            r = self.random.random()
+            if r < c.throttle_rate:
+                self.counters["throttled"] += 1
+                return delay, 429
+            if r < c.throttle_rate + c.error_rate:
+                self.counters["errors"] += 1
+                return delay, 500
+        return delay, None
+
+    def search_movies(self, query: str, page: int) -> Dict[str, Any]:
+        q = query.casefold()
+        matches = [
+            m for m in self.movies.values()
+            if q in m["title"].casefold() or q in m["original_title"].casefold()
+        ]
+        base = 1_000_000 + _n(q) % 1_000_000 * 100
+        synthetic = [
+            _synthetic_movie(base + i)
+            for i in range(TMDB_PAGE_SIZE * TMDB_TOTAL_PAGES - len(matches))
+        ]
+        items = (matches + synthetic)[(page - 1) * TMDB_PAGE_SIZE:page * TMDB_PAGE_SIZE]
+        return {
+            "page": page,
+            "total_pages": TMDB_TOTAL_PAGES,
+            "total_results": TMDB_PAGE_SIZE * TMDB_TOTAL_PAGES,
+            "results": [
+                {k: m[k] for k in ("id", "title", "original_title", "release_date", "overview", "poster_path")}
+                for m in items
+            ],
+        }
+
+    def movie(self, movie_id: int) -> Dict[str, Any]:
+        return self.movies.get(movie_id) or _synthetic_movie(movie_id)
+
+    def search_volumes(self, query: str, start: int, size: int) -> Dict[str, Any]:
+        q = query.casefold()
+        matches = [
+            v for v in self.volumes.values() if q in v["volumeInfo"]["title"].casefold()
+        ]
+        prefix = f"s{_n(q) % 100000}-"
+        synthetic = [
+            _synthetic_volume(f"{prefix}{i}") for i in range(GOOGLE_BOOKS_TOTAL - len(matches))
+        ]
+        return {
+            "totalItems": GOOGLE_BOOKS_TOTAL,
+            "items": (matches + synthetic)[start:start + size],
+        }
+
+    def volume(self, volume_id: str) -> Dict[str, Any]:
+        return self.volumes.get(volume_id) or _synthetic_volume(volume_id)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Dict[str, Any], headers: Dict[str, str] = None):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server: FakeProviderServer = self.server
+        delay, injected = server.roll()
+        if delay:
+            time.sleep(delay)
+        if injected == 429:
+            return self._send(
+                429, {"status_message": "rate limited"}, {"Retry-After": str(server.config.retry_after)}
+            )
+        if injected == 500:
+            return self._send(500, {"status_message": "injected error"})
+
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = url.path.rstrip("/")
+        try:
+            if path == f"{TMDB_PREFIX}/search/movie":
+                page = max(int(params.get("page", 1)), 1)
+                return self._send(200, server.search_movies(params.get("query", ""), page))
+            if path.startswith(f"{TMDB_PREFIX}/movie/"):
+                return self._send(200, server.movie(int(path.rsplit("/", 1)[1])))
+            if path == GOOGLE_BOOKS_PREFIX:
+                return self._send(
+                    200,
+                    server.search_volumes(
+                        params.get("q", ""),
+                        max(int(params.get("startIndex", 0)), 0),
+                        min(max(int(params.get("maxResults", 10)), 1), 40),
+                    ),
+                )
+            if path.startswith(f"{GOOGLE_BOOKS_PREFIX}/"):
+                return self._send(200, server.volume(path.rsplit("/", 1)[1]))
+        except ValueError:
+            return self._send(400, {"status_message": "bad request"})
+        return self._send(404, {"status_message": "not found"})
+
+
+def start_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    config: FakeProviderConfig = None,
+    fixtures: Dict[str, Any] = None,
+) -> FakeProviderServer:
+    """
+    Sunucuyu arka plan thread'inde başlatır (port=0: boş port seçilir).
+    """
+    if fixtures is None:
+        fixtures = load_fixtures()
+    server = FakeProviderServer((host, port), config or FakeProviderConfig(), fixtures)
+    threading.Thread(target=server.serve_forever, name="fake-providers", daemon=True).start()
+    return server
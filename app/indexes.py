@@ -0,0 +1,666 @@
+# app/indexes.py
+"""
+Content üzerinde süreç içi (in-memory) index'ler.
+
+wsgi/asgi açılışında (warm_indexes) ya da ilk kullanımda veritabanından
+kurulur; bu süreçte eklenen içerikler sinyallerle anında, başka
+süreçlerin eklediği satırlar ise `id > son görülen id` sorgusuyla
+periyodik olarak içeri alınır. Silme/güncellemelerin diğer süreçlere
+yansıması için index belirli aralıklarla baştan kurulur.
+
+İlk kurulum, yakalama ve yeniden kurulum arka plan thread'inde çalışır;
+istekler beklemez, o arada eldeki index'le (başlık index'i kurulmadıysa
+veritabanındaki ön ek sorgusuyla) cevaplanır. Toplu eklemelerden sonra
+(REBUILD_THRESHOLD'dan fazla satır) satır satır eklemek yerine index
+baştan kurulur.
+"""
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+
+from .models import Content, ContentGenre
+from . import metrics
+
+# Sinyalsiz toplu güncellemelerden sonra artırılır (request_rebuild); paylaşılan
+# cache üzerinden diğer süreçlerin index'leri de yeniden kurulur
+GENERATION_KEY = "content_indexes:generation"
+
+# Türkçe noktalı/noktasız i: İ, I, ı hepsi "i" olarak aranır
+_TURKISH = str.maketrans({"İ": "i", "I": "i", "ı": "i"})
+_PUNCT_RE = re.compile(r"[^\w\s]+", re.UNICODE)
+
+
+def _generation() -> int:
+    return cache.get(GENERATION_KEY, 0)
+
+
+def fold(text) -> str:
+    """
+    Aksanları ve büyük/küçük harf farkını kaldırır: "Çöl Gezegeni" -> "col gezegeni".
+    """
+    text = str(text or "").translate(_TURKISH)
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _PUNCT_RE.sub(" ", text.casefold())
+    return " ".join(text.split())
+
+
+class ContentIndex:
+    # Yeni satırları (başka süreçlerin eklediklerini) yakalama aralığı, saniye
+    refresh_interval = 30
+    # Silme / başlık değişikliklerini temizlemek için tam yeniden kurulum aralığı
+    rebuild_interval = 3600
+    # Bundan fazla yeni satır tek tek eklenmez, index baştan kurulur
+    rebuild_threshold = 1000
+
+    fields = ("id",)
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._building = threading.Lock()
+        self._state = self._new_state()
+        self._built_at = None
+        self._checked_at = 0.0
+        self._last_id = 0
+        self._generation = 0
+        self._jobs = set()  # arka plan thread'inin sıradaki işleri: "warm" / "build" / "catch_up"
+        self._worker = False
+
+    # Alt sınıfların doldurduğu kısım: state üzerinde çalışan saf fonksiyonlar
+    def _new_state(self):
+        raise NotImplementedError
+
+    def _add(self, state, row):
+        raise NotImplementedError
+
+    def _remove(self, state, content_id):
+        raise NotImplementedError
+
+    def _contains(self, state, content_id):
+        raise NotImplementedError
+
+    def _build_state(self, rows):
+        state = self._new_state()
+        for row in rows:
+            self._add(state, row)
+        return state
+
+    # Ortak akış
+    def _rows(self, qs):
+        return qs.order_by("id").values(*self.fields).iterator(chunk_size=5000)
+
+    def _instance_row(self, instance):
+        return {name: getattr(instance, name) for name in self.fields}
+
+    def build(self, only_if_missing=False):
+        # Yeni index kilit dışında kurulur, okuyucular eskisiyle devam eder
+        with self._building:
+            if only_if_missing and self._built_at is not None:
+                return
+            generation = _generation()
+            rows = list(self._rows(Content.objects.all()))
+            state = self._build_state(rows)
+            with self._lock:
+                self._state = state
+                self._generation = generation
+                self._last_id = rows[-1]["id"] if rows else 0
+                self._built_at = self._checked_at = time.monotonic()
+        self._catch_up()
+
+    def warm(self):
+        self.build(only_if_missing=True)
+
+    def _catch_up(self):
+        self._checked_at = time.monotonic()
+        pending = Content.objects.filter(id__gt=self._last_id)
+        if pending.order_by("id")[self.rebuild_threshold:].exists():
+            self.build()
+            return
+        for row in self._rows(pending):
+            # Satır başına kilit: aradaki okumalar uzun süre beklemez
+            with self._lock:
+                if not self._contains(self._state, row["id"]):
+                    self._add(self._state, row)
+                self._last_id = max(self._last_id, row["id"])
+
+    def _schedule(self, job):
+        """
+        İşi süreç başına tek arka plan thread'ine verir; çağıran beklemez.
+        """
+        with self._lock:
+            self._jobs.add(job)
+            if self._worker:
+                return
+            self._worker = True
+        threading.Thread(
+            target=self._work, name=f"{type(self).__name__}-refresh", daemon=True
+        ).start()
+
+    def _work(self):
+        try:
+            while True:
+                with self._lock:
+                    jobs, self._jobs = self._jobs, set()
+                    if not jobs:
+                        self._worker = False
+                        return
+                if "build" in jobs:
+                    self.build()
+                elif "warm" in jobs:
+                    # warm_indexes açılışta zaten kuruyorsa ikinci kez kurulmaz
+                    self.warm()
+                else:
+                    self._catch_up()
+        except Exception:
+            with self._lock:
+                self._worker = False
+            raise
+        finally:
+            connection.close()
+
+    def ensure_fresh(self) -> bool:
+        """
+        Gerekirse arka plan işini planlar; index kuruluysa True. İlk kurulum da
+        arka planda yapılır, istek beklemez.
+        """
+        now = time.monotonic()
+        if self._built_at is None:
+            self._schedule("warm")
+            return False
+        if now - self._built_at > self.rebuild_interval:
+            self._schedule("build")
+        elif now - self._checked_at > self.refresh_interval:
+            self._checked_at = now
+            self._schedule("build" if _generation() != self._generation else "catch_up")
+        return True
+
+    def invalidate(self):
+        """
+        Kurulu index'i arka planda baştan kurar.
+        """
+        if self._built_at is not None:
+            self._schedule("build")
+
+    def content_saved(self, instance, created):
+        if self._built_at is None:
+            return
+        row = self._instance_row(instance)
+        with self._lock:
+            self._remove(self._state, instance.pk)
+            self._add(self._state, row)
+
+    def contents_saved(self, instances):
+        """
+        Toplu yazımlar: az satır yerinde güncellenir, çoksa index arka planda
+        baştan kurulur (tek tek ekleme her satırda O(n)).
+        """
+        if self._built_at is None:
+            return
+        if len(instances) > self.rebuild_threshold:
+            self._schedule("build")
+            return
+        for instance in instances:
+            self.content_saved(instance, True)
+
+    def content_deleted(self, instance):
+        if self._built_at is None:
+            return
+        with self._lock:
+            self._remove(self._state, instance.pk)
+
+
+class _TitleState:
+    __slots__ = ("keys", "ids", "meta")
+
+    def __init__(self, keys=None, ids=None):
+        self.keys = keys if keys is not None else []
+        self.ids = ids if ids is not None else array("q")
+        self.meta = {}  # id -> (title, type, year, katlanmış anahtarlar)
+
+
+class TitleIndex(ContentIndex):
+    """
+    Katlanmış (fold) başlıkların sıralı dizisi; ön ek araması bisect ile
+    O(log n + k). Her içerik başlığı ve farklıysa orijinal başlığıyla girer.
+    """
+
+    fields = ("id", "title", "original_title", "type", "year")
+    # Tür filtresi yüzünden atlanan kayıtlar için tarama sınırı
+    max_scan = 500
+
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+        self.fallbacks = 0  # index kurulmadan veritabanından cevaplananlar
+
+    def _new_state(self):
+        return _TitleState()
+
+    @staticmethod
+    def _row_keys(row):
+        keys = {fold(row["title"]), fold(row["original_title"])}
+        keys.discard("")
+        return tuple(keys)
+
+    def _add(self, state, row):
+        keys = self._row_keys(row)
+        state.meta[row["id"]] = (row["title"], row["type"], row["year"], keys)
+        for key in keys:
+            pos = bisect_right(state.keys, key)
+            state.keys.insert(pos, key)
+            state.ids.insert(pos, row["id"])
+
+    def _build_state(self, rows):
+        # Tek tek insert yerine bir kez sıralama
+        pairs = []
+        meta = {}
+        for row in rows:
+            keys = self._row_keys(row)
+            meta[row["id"]] = (row["title"], row["type"], row["year"], keys)
+            pairs.extend((key, row["id"]) for key in keys)
+        pairs.sort()
+        state = _TitleState(
+            keys=[key for key, _ in pairs],
+            ids=array("q", (content_id for _, content_id in pairs)),
+        )
+        state.meta = meta
+        return state
+
+    def _contains(self, state, content_id):
+        return content_id in state.meta
+
+    def _remove(self, state, content_id):
+        meta = state.meta.pop(content_id, None)
+        if meta is None:
+            return
+        for key in meta[3]:
+            lo = bisect_left(state.keys, key)
+            hi = bisect_right(state.keys, key)
+            for pos in range(lo, hi):
+                if state.ids[pos] == content_id:
+                    del state.keys[pos]
+                    del state.ids[pos]
+                    break
+
+    @staticmethod
+    def _db_lookup(prefix, content_type, limit):
+        # Index kurulana kadar: başlık ön ekiyle veritabanından (aksan katlaması yok)
+        prefix = " ".join(str(prefix or "").split())
+        if not prefix:
+            return []
+        qs = Content.objects.filter(
+            Q(title__istartswith=prefix) | Q(original_title__istartswith=prefix)
+        )
+        if content_type:
+            qs = qs.filter(type=content_type)
+        return list(qs.order_by("title", "id").values("id", "title", "type", "year")[:limit])
+
+    def lookup(self, prefix, content_type=None, limit=10):
+        started = time.perf_counter()
+        key = fold(prefix)
+        results = []
+        fallback = not self.ensure_fresh()
+        if fallback:
+            results = self._db_lookup(prefix, content_type, limit)
+        elif key:
+            with self._lock:
+                state = self._state
+                seen = set()
+                pos = bisect_left(state.keys, key)
+                end = min(len(state.keys), pos + self.max_scan)
+                while pos < end and len(results) < limit:
+                    if not state.keys[pos].startswith(key):
+                        break
+                    content_id = state.ids[pos]
+                    pos += 1
+                    if content_id in seen:
+                        continue
+                    seen.add(content_id)
+                    title, ctype, year, _ = state.meta[content_id]
+                    if content_type and ctype != content_type:
+                        continue
+                    results.append(
+                        {"id": content_id, "title": title, "type": ctype, "year": year}
+                    )
+        with self._lock:
+            self.lookups += 1
+            self.fallbacks += fallback
+            self.lookup_seconds += time.perf_counter() - started
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._state.keys),
+                "contents": len(self._state.meta),
+                "built": self._built_at is not None,
+                "last_id": self._last_id,
+                "lookups": self.lookups,
+                "fallbacks": self.fallbacks,
+                "avg_lookup_ms": round(self.lookup_seconds / self.lookups * 1000, 3)
+                if self.lookups
+                else None,
+            }
+
+
+def bitmap_from_ids(ids) -> int:
+    """
+    id listesinden bitmap (Python int); bytearray üzerinden O(k + n/8).
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    buf = bytearray((max(ids) >> 3) + 1)
+    for content_id in ids:
+        buf[content_id >> 3] |= 1 << (content_id & 7)
+    return int.from_bytes(buf, "little")
+
+
+class _FacetState:
+    __slots__ = ("postings", "sizes", "labels", "all", "combos", "combo_ids", "combo_of")
+
+    def __init__(self, facets):
+        # facet -> değer -> sıralı id dizisi (seyrek) ya da bitmap (sık değerler)
+        self.postings = {facet: {} for facet in facets}
+        self.sizes = {}  # (facet, değer) -> bitmap'teki id sayısı; filtresiz sayım popcount'suz
+        self.labels = {facet: {} for facet in facets}
+        self.all = 0
+        # İçeriğin facet değerleri bir kez saklanır; aynı (tür, yıl, kaynak,
+        # türler) birleşimini paylaşan içerikler aynı kaydı gösterir
+        self.combos = [()]
+        self.combo_ids = {(): 0}
+        self.combo_of = array("I")  # content id -> combos sırası (0: index'te yok)
+
+
+class FacetIndex(ContentIndex):
+    """
+    Facet değerleri başına posting: seyrek değerler için sıralı id dizisi, id
+    aralığının 1/DENSE_RATIO'sundan sık değerler için bitmap (bit i = Content
+    id i). Sık değerler bitmap AND + popcount ile, seyrek değerler id'leri
+    tek tek yoklanarak sayılır; binlerce nadir tür/yıl değeri ne bellekte
+    ne de her istekte id aralığı boyunda bitmap maliyeti doğurur.
+    """
+
+    FACETS = ("type", "decade", "year", "genre", "source")
+    # genres JSON'dan değil, ?genre= filtresiyle aynı kaynaktan (ContentGenre) okunur;
+    # burada yalnız değişiklik tespiti için listede
+    fields = ("id", "type", "year", "source", "genres")
+    columns = ("id", "type", "year", "source")
+    # Bitmap, seyrek dizinin bir popcount'tan pahalı hale geldiği yoğunlukta başlar
+    DENSE_RATIO = 512
+    DENSE_MIN = 64
+
+    def __init__(self):
+        super().__init__()
+        self.computations = 0
+        self.compute_seconds = 0.0
+
+    def _new_state(self):
+        return _FacetState(self.FACETS)
+
+    def _dense_cutoff(self, id_range):
+        return max(id_range // self.DENSE_RATIO, self.DENSE_MIN)
+
+    @staticmethod
+    def _with_genres(rows):
+        genres = {}
+        if rows:
+            links = ContentGenre.objects.filter(
+                content_id__gte=rows[0]["id"], content_id__lte=rows[-1]["id"]
+            ).values_list("content_id", "genre__key", "genre__name")
+            for content_id, key, name in links:
+                genres.setdefault(content_id, []).append((key, name))
+        for row in rows:
+            row["genres"] = genres.get(row["id"], [])
+        return rows
+
+    def _rows(self, qs):
+        chunk = []
+        for row in qs.order_by("id").values(*self.columns).iterator(chunk_size=5000):
+            chunk.append(row)
+            if len(chunk) == 5000:
+                yield from self._with_genres(chunk)
+                chunk = []
+        yield from self._with_genres(chunk)
+
+    def _instance_row(self, instance):
+        return self._with_genres([{name: getattr(instance, name) for name in self.columns}])[0]
+
+    @staticmethod
+    def _row_values(row):
+        values = [("type", row["type"], row["type"]), ("source", row["source"], row["source"])]
+        year = row["year"]
+        if year:
+            decade = year // 10 * 10
+            values.append(("year", str(year), str(year)))
+            values.append(("decade", str(decade), f"{decade}s"))
+        for key, label in row["genres"]:
+            values.append(("genre", key, label))
+        return tuple(values)
+
+    @staticmethod
+    def _combo(state, values):
+        index = state.combo_ids.get(values)
+        if index is None:
+            index = state.combo_ids[values] = len(state.combos)
+            state.combos.append(values)
+        return index
+
+    def _contains(self, state, content_id):
+        return content_id < len(state.combo_of) and state.combo_of[content_id] != 0
+
+    def _add(self, state, row):
+        content_id = row["id"]
+        values = self._row_values(row)
+        if content_id >= len(state.combo_of):
+            state.combo_of.extend(array("I", bytes(4 * (content_id + 1 - len(state.combo_of)))))
+        state.combo_of[content_id] = self._combo(state, values)
+        bit = 1 << content_id
+        state.all |= bit
+        cutoff = self._dense_cutoff(len(state.combo_of))
+        for facet, key, label in values:
+            postings = state.postings[facet]
+            posting = postings.get(key)
+            if posting is None:
+                postings[key] = array("q", [content_id])
+                state.labels[facet].setdefault(key, label)
+            elif isinstance(posting, int):
+                postings[key] = posting | bit
+                state.sizes[(facet, key)] += 1
+            else:
+                posting.insert(bisect_left(posting, content_id), content_id)
+                if len(posting) >= cutoff:
+                    postings[key] = bitmap_from_ids(posting)
+                    state.sizes[(facet, key)] = len(posting)
+
+    def _remove(self, state, content_id):
+        # Yalnız içeriğin kendi değerlerinin posting'lerine dokunur
+        if not self._contains(state, content_id):
+            return
+        values = state.combos[state.combo_of[content_id]]
+        state.combo_of[content_id] = 0
+        bit = 1 << content_id
+        state.all &= ~bit
+        for facet, key, _ in values:
+            postings = state.postings[facet]
+            posting = postings.get(key)
+            if posting is None:
+                continue
+            if isinstance(posting, int):
+                posting &= ~bit
+                state.sizes[(facet, key)] -= 1
+            else:
+                pos = bisect_left(posting, content_id)
+                if pos < len(posting) and posting[pos] == content_id:
+                    del posting[pos]
+            if posting:
+                postings[key] = posting
+            else:
+                del postings[key]
+                state.sizes.pop((facet, key), None)
+
+    def _build_state(self, rows):
+        state = self._new_state()
+        ids = {}
+        all_ids = array("q")
+        for row in rows:
+            content_id = row["id"]
+            values = self._row_values(row)
+            if content_id >= len(state.combo_of):
+                state.combo_of.extend(
+                    array("I", bytes(4 * (content_id + 1 - len(state.combo_of))))
+                )
+            state.combo_of[content_id] = self._combo(state, values)
+            all_ids.append(content_id)
+            for facet, key, label in values:
+                posting = ids.get((facet, key))
+                if posting is None:
+                    posting = ids[(facet, key)] = array("q")
+                    state.labels[facet][key] = label
+                posting.append(content_id)
+
+        if not all_ids:
+            return state
+        state.all = bitmap_from_ids(all_ids)
+        cutoff = self._dense_cutoff(len(state.combo_of))
+        for (facet, key), posting in ids.items():
+            # rows id sırasıyla gelir; diziler zaten sıralı
+            if len(posting) >= cutoff:
+                state.postings[facet][key] = bitmap_from_ids(posting)
+                state.sizes[(facet, key)] = len(posting)
+            else:
+                state.postings[facet][key] = posting
+        return state
+
+    def counts(self, filters=None, restrict=None):
+        """
+        filters: {facet: değer} (ör. {"type": "movie", "genre": "drama"})
+        restrict: index dışı filtrelerin (arama, kişi) eşleşmelerinin bitmap'i
+        Her facet kendi filtresi hariç diğerlerine göre sayılır, böylece
+        seçili değerin alternatifleri de görünür.
+        """
+        started = time.perf_counter()
+        if not self.ensure_fresh():
+            # Sayıların yaklaşığı yok; ilk kurulum sürüyorsa onu bekler
+            self.warm()
+        filters = {f: v for f, v in (filters or {}).items() if f in self.FACETS and v}
+
+        with self._lock:
+            state = self._state
+            postings = {facet: dict(values) for facet, values in state.postings.items()}
+            sizes = dict(state.sizes)
+            size = (len(state.combo_of) >> 3) + 1
+
+        def as_bitmap(posting):
+            if posting is None:
+                return 0
+            return posting if isinstance(posting, int) else bitmap_from_ids(posting)
+
+        selected = {facet: as_bitmap(postings[facet].get(key)) for facet, key in filters.items()}
+
+        def base_without(skip=None):
+            bitmap = state.all if restrict is None else state.all & restrict
+            narrowed = restrict is not None
+            for facet, bitmap_of_value in selected.items():
+                if facet != skip:
+                    bitmap &= bitmap_of_value
+                    narrowed = True
+            return bitmap, narrowed
+
+        total, _ = base_without()
+        result = {"total": total.bit_count(), "facets": {}}
+        for facet in self.FACETS:
+            base, narrowed = base_without(facet)
+            base_bytes = None
+            values = []
+            for key, posting in postings[facet].items():
+                if isinstance(posting, int):
+                    count = (base & posting).bit_count() if narrowed else sizes[(facet, key)]
+                elif not narrowed:
+                    count = len(posting)
+                else:
+                    if base_bytes is None:
+                        base_bytes = base.to_bytes(size, "little")
+                    count = sum(base_bytes[i >> 3] >> (i & 7) & 1 for i in posting)
+                if count:
+                    values.append(
+                        {"value": key, "label": state.labels[facet].get(key, key), "count": count}
+                    )
+            values.sort(key=lambda v: (-v["count"], v["value"]))
+            result["facets"][facet] = values
+
+        with self._lock:
+            self.computations += 1
+            self.compute_seconds += time.perf_counter() - started
+        return result
+
+    def stats(self):
+        with self._lock:
+            state = self._state
+            postings = [p for values in state.postings.values() for p in values.values()]
+            dense = [p for p in postings if isinstance(p, int)]
+            return {
+                "contents": state.all.bit_count(),
+                "postings": len(postings),
+                "dense_postings": len(dense),
+                "approx_bytes": sum(p.bit_length() // 8 for p in dense)
+                + sum(p.itemsize * len(p) for p in postings if not isinstance(p, int))
+                + state.combo_of.itemsize * len(state.combo_of),
+                "computations": self.computations,
+                "avg_compute_ms": round(self.compute_seconds / self.computations * 1000, 3)
+                if self.computations
+                else None,
+            }
+
+
+title_index = TitleIndex()
+metrics.register("title_index", title_index.stats)
+
+facet_index = FacetIndex()
+metrics.register("facet_index", facet_index.stats)
+
+
+CONTENT_INDEXES = (title_index, facet_index)
+
+
+def contents_created(contents):
+    """
+    bulk_create / upsert sinyal üretmez; toplu yazılan içerikleri index'lere bildirir.
+    """
+    contents = list(contents)
+    for index in CONTENT_INDEXES:
+        index.contents_saved(contents)
+
+
+def request_rebuild():
+    """
+    Sinyal üretmeyen toplu güncellemelerden (ingest upsert'i) sonra çağrılır:
+    bu süreçteki index'ler hemen, diğer süreçlerinkiler sonraki tazelik
+    kontrolünde baştan kurulur.
+    """
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+    for index in CONTENT_INDEXES:
+        index.invalidate()
+
+
+def warm_indexes():
+    """
+    wsgi/asgi açılışında çağrılır; index'leri ilk istekten önce arka planda kurar.
+    """
+    def run():
+        for index in CONTENT_INDEXES:
+            index.warm()
+
+    threading.Thread(target=run, name="content-index-warmup", daemon=True).start()
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from app.catalog import sync_content_relations
+from app.models import Content
+
+
+class Command(BaseCommand):
+    help = "Content JSON listelerinden Person/Genre bağlantılarını doldurur."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        done = 0
+
+        while True:
+            contents = list(
+                Content.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .only("id", "directors", "writers", "authors", "genres", "cast")[:batch_size]
+            )
+            if not contents:
+                break
+            last_id = contents[-1].id
+            sync_content_relations(contents)
+            done += len(contents)
+            self.stdout.write(f"{done} içerik işlendi...")
+
+        self.stdout.write(self.style.SUCCESS(f"Tamamlandı: {done} içerik."))
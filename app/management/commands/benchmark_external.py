@@ -0,0 +1,220 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from app.fake_providers import FakeProviderConfig, start_server
+from app.models import Content
+from app.services import google_books, tmdb
+from app.services.search_cache import search_cache
+from app.views import (
+    ExternalBookSearchView,
+    ExternalImportView,
+    ExternalMovieSearchView,
+    ExternalSearchView,
+)
+
+BENCH_MOVIE_BASE = 900_000_000  # içe aktarmada kullanılan sentetik TMDb id'leri
+BENCH_BOOK_PREFIX = "bench-"
+
+
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = min(int(len(sorted_values) * p), len(sorted_values) - 1)
+    return round(sorted_values[index] * 1000, 1)
+
+
+class Command(BaseCommand):
+    help = (
+        "Harici arama ve içe aktarma yolunu yerel sahte sağlayıcılara karşı ölçer: "
+        "arama gecikme yüzdelikleri ve ExternalImportView verimi (eşzamanlı)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Senaryo başına istek")
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--imports", type=int, default=200, help="İçe aktarılacak öğe")
+        parser.add_argument(
+            "--import-batch", type=int, default=0, help="0: tek tek, N: N'lik toplu istekler"
+        )
+        parser.add_argument("--latency", type=float, default=50.0, help="Sağlayıcı gecikmesi (ms)")
+        parser.add_argument("--jitter", type=float, default=20.0)
+        parser.add_argument("--error-rate", type=float, default=0.0)
+        parser.add_argument("--throttle-rate", type=float, default=0.0)
+        parser.add_argument(
+            "--no-rate-limit",
+            action="store_true",
+            help="İstemci tarafı kota sınırlayıcısını kapat (ham taşıma ölçümü)",
+        )
+        parser.add_argument(
+            "--max-p95-ms",
+            type=float,
+            help="Herhangi bir senaryonun p95'i bunu aşarsa hata koduyla çık",
+        )
+        parser.add_argument("--keep", action="store_true", help="İçe aktarılanları silme")
+
+    # --- yardımcılar -----------------------------------------------------
+
+    def _run(self, name, calls, concurrency, items_per_call=1):
+        """
+        calls: argümansız fonksiyonlar; her biri Response döner.
+        """
+        def timed(call):
+            started = time.perf_counter()
+            try:
+                response = call()
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            finally:
+                connection.close()
+            return time.perf_counter() - started, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(timed, calls))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(t for t, _ in outcomes)
+        failures = sum(1 for _, ok in outcomes if not ok)
+        row = {
+            "name": name,
+            "requests": len(outcomes),
+            "failures": failures,
+            "p50": _percentile(latencies, 0.50),
+            "p95": _percentile(latencies, 0.95),
+            "p99": _percentile(latencies, 0.99),
+            "max": _percentile(latencies, 1.0),
+            "throughput": round(len(outcomes) * items_per_call / elapsed, 1) if elapsed else None,
+        }
+        self.stdout.write(
+            f"{name:<22} n={row['requests']:<5} hata={failures:<4} "
+            f"p50={row['p50']}ms p95={row['p95']}ms p99={row['p99']}ms max={row['max']}ms "
+            f"({row['throughput']}/sn)"
+        )
+        return row
+
+    def _search_calls(self, view_class, prefix, n, unique=True):
+        factory = APIRequestFactory()
+        view = view_class.as_view()
+        return [
+            (lambda q=(f"{prefix} {i}" if unique else f"{prefix} {i % 10}"): view(
+                factory.get("/bench/", {"q": q})
+            ))
+            for i in range(n)
+        ]
+
+    def _import_calls(self, user, n, batch):
+        factory = APIRequestFactory()
+        view = ExternalImportView.as_view()
+        items = []
+        for i in range(n):
+            if i % 2:
+                items.append({"source": "tmdb", "external_id": str(BENCH_MOVIE_BASE + i)})
+            else:
+                items.append({"source": "google_books", "external_id": f"{BENCH_BOOK_PREFIX}{i}"})
+
+        def call(payload):
+            request = factory.post("/bench/", payload, format="json")
+            force_authenticate(request, user)
+            return view(request)
+
+        if batch:
+            groups = [items[i:i + batch] for i in range(0, n, batch)]
+            return [lambda g=g: call({"items": g}) for g in groups], items
+        return [lambda item=item: call(item) for item in items], items
+
+    # --- akış ------------------------------------------------------------
+
+    def handle(self, *args, **options):
+        server = start_server(
+            config=FakeProviderConfig(
+                latency_ms=options["latency"],
+                jitter_ms=options["jitter"],
+                error_rate=options["error_rate"],
+                throttle_rate=options["throttle_rate"],
+                seed=42,
+            )
+        )
+        urls = server.base_urls
+        saved = {
+            "tmdb_url": tmdb.client.base_url,
+            "books_url": google_books.client.base_url,
+            "tmdb_key": tmdb.TMDB_API_KEY,
+            "tmdb_limiter": tmdb.client.limiter,
+            "books_limiter": google_books.client.limiter,
+        }
+        tmdb.client.base_url = urls["tmdb"]
+        google_books.client.base_url = urls["google_books"]
+        tmdb.TMDB_API_KEY = tmdb.TMDB_API_KEY or "fake"
+        if options["no_rate_limit"]:
+            tmdb.client.limiter = None
+            google_books.client.limiter = None
+
+        self.stdout.write(f"Sahte sağlayıcılar: {urls['tmdb']} , {urls['google_books']}")
+        n, concurrency = options["requests"], options["concurrency"]
+        # Önceden var olan kullanıcı / içerikler temizlikte silinmez
+        user, user_created = get_user_model().objects.get_or_create(username="benchmark_external")
+        imported, existing = [], set()
+        rows = []
+        try:
+            # Benzersiz sorgular upstream'e gider; son senaryo aynı 10 sorguyu tekrarlar
+            search_cache.clear()
+            scenarios = [
+                ("film arama", ExternalMovieSearchView, "film", True),
+                ("kitap arama", ExternalBookSearchView, "kitap", True),
+                ("birleşik arama", ExternalSearchView, "ortak", True),
+                ("birleşik arama (cache)", ExternalSearchView, "ortak", False),
+            ]
+            for name, view_class, prefix, unique in scenarios:
+                calls = self._search_calls(view_class, prefix, n, unique=unique)
+                rows.append(self._run(name, calls, concurrency))
+
+            batch = options["import_batch"]
+            calls, imported = self._import_calls(user, options["imports"], batch)
+            existing = {
+                (source, external_id)
+                for source in ("tmdb", "google_books")
+                for external_id in Content.objects.filter(
+                    source=source,
+                    external_id__in=[i["external_id"] for i in imported if i["source"] == source],
+                ).values_list("external_id", flat=True)
+            }
+            rows.append(
+                self._run(
+                    f"içe aktarma{f' (x{batch})' if batch else ''}",
+                    calls,
+                    concurrency,
+                    items_per_call=batch or 1,
+                )
+            )
+        finally:
+            tmdb.client.base_url = saved["tmdb_url"]
+            google_books.client.base_url = saved["books_url"]
+            tmdb.TMDB_API_KEY = saved["tmdb_key"]
+            tmdb.client.limiter = saved["tmdb_limiter"]
+            google_books.client.limiter = saved["books_limiter"]
+            server.shutdown()
+            server.server_close()
+            if not options["keep"]:
+                for source in ("tmdb", "google_books"):
+                    ids = [
+                        i["external_id"]
+                        for i in imported
+                        if i["source"] == source and (source, i["external_id"]) not in existing
+                    ]
+                    Content.objects.filter(source=source, external_id__in=ids).delete()
+                if user_created:
+                    user.delete()
+
+        self.stdout.write(f"Sağlayıcı sayaçları: {server.counters}")
+        limit = options["max_p95_ms"]
+        if limit is not None:
+            slow = [r["name"] for r in rows if r["p95"] is not None and r["p95"] > limit]
+            if slow:
+                raise CommandError(f"p95 sınırı ({limit}ms) aşıldı: {', '.join(slow)}")
+        self.stdout.write(self.style.SUCCESS("Benchmark tamamlandı."))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+
+from app.fake_providers import (
+    FIXTURES_PATH,
+    FakeProviderConfig,
+    FakeProviderServer,
+    load_fixtures,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Yerel TMDb / Google Books taklidi çalıştırır (gecikme, hata ve 429 "
+        "enjeksiyonu). Servisler TMDB_BASE_URL / GOOGLE_BOOKS_BASE ile yönlendirilir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8001)
+        parser.add_argument("--latency", type=float, default=50.0, help="ms")
+        parser.add_argument("--jitter", type=float, default=20.0, help="ms")
+        parser.add_argument("--error-rate", type=float, default=0.0)
+        parser.add_argument("--throttle-rate", type=float, default=0.0, help="429 oranı")
+        parser.add_argument("--retry-after", type=int, default=1)
+        parser.add_argument("--fixtures", default=FIXTURES_PATH)
+        parser.add_argument("--seed", type=int)
+
+    def handle(self, *args, **options):
+        config = FakeProviderConfig(
+            latency_ms=options["latency"],
+            jitter_ms=options["jitter"],
+            error_rate=options["error_rate"],
+            throttle_rate=options["throttle_rate"],
+            retry_after=options["retry_after"],
+            seed=options["seed"],
+        )
+        server = FakeProviderServer(
+            (options["host"], options["port"]), config, load_fixtures(options["fixtures"])
+        )
+        urls = server.base_urls
+        self.stdout.write(
+            self.style.SUCCESS("Sahte sağlayıcılar çalışıyor. Uygulamayı şu ayarlarla başlatın:")
+        )
+        self.stdout.write(f"  TMDB_BASE_URL={urls['tmdb']}")
+        self.stdout.write(f"  GOOGLE_BOOKS_BASE={urls['google_books']}")
+        self.stdout.write("  TMDB_API_KEY=fake")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        self.stdout.write(f"Kapatıldı: {server.counters}")
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app import outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "ActivityOutbox'ta bekleyen kayıtları toplu işleyip Activity üretir ve "
+        "akışlara dağıtır (ACTIVITY_OUTBOX['AUTO_FLUSH'] kapalıysa ya da birikme varsa)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument("--loop", action="store_true", help="Boşalınca bekleyip tekrar dene")
+        parser.add_argument("--idle-sleep", type=float, default=2.0)
+
+    def handle(self, *args, **options):
+        total = 0
+        try:
+            while True:
+                done = outbox.flush_all(options["batch_size"])
+                total += done
+                if done:
+                    self.stdout.write(f"{done} kayıt işlendi.")
+                if not options["loop"]:
+                    break
+                time.sleep(options["idle_sleep"])
+        except KeyboardInterrupt:
+            pass
+
+        stats = outbox.stats()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Bitti: {total} kayıt işlendi, {stats['created']} aktivite oluştu, "
+                f"{stats['coalesced']} birleştirildi, bekleyen {stats['pending']}."
+            )
+        )
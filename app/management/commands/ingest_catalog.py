@@ -0,0 +1,237 @@
+import csv
+import gzip
+import io
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from app.catalog import content_from_details, sync_content_relations
+from app.indexes import request_rebuild
+from app.models import Content
+from app.services.google_books import normalize_book
+from app.services.tmdb import normalize_movie
+
+NORMALIZERS = {
+    "tmdb": normalize_movie,
+    "google_books": normalize_book,
+}
+
+# Upsert'te güncellenen alanlar (puan özetleri ve created_at korunur)
+UPDATE_FIELDS = [
+    "type",
+    "title",
+    "original_title",
+    "year",
+    "description",
+    "poster_url",
+    "runtime_minutes",
+    "page_count",
+    "directors",
+    "writers",
+    "authors",
+    "genres",
+    "cast",
+    "fetched_at",
+    "updated_at",
+]
+
+
+def _open(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _csv_value(value):
+    # İç içe alanlar (genres, credits, imageLinks...) CSV'de JSON metni olarak gelir
+    if value and value[0] in "[{":
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value if value != "" else None
+
+
+def _unflatten(row):
+    """
+    "volumeInfo.title" gibi noktalı sütunları iç içe sözlüğe çevirir.
+    """
+    record = {}
+    for column, value in row.items():
+        if column is None:
+            continue
+        target = record
+        *parents, leaf = column.split(".")
+        for part in parents:
+            target = target.setdefault(part, {})
+        target[leaf] = _csv_value(value)
+    return record
+
+
+class Command(BaseCommand):
+    help = (
+        "TMDb / Google Books dökümlerini (JSONL ya da CSV, .gz olabilir) akış "
+        "halinde okuyup Content'e sabit boyutlu partilerle upsert eder."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--source", choices=sorted(NORMALIZERS), required=True)
+        parser.add_argument("--format", choices=["jsonl", "csv"])
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--checkpoint",
+            help="İlerleme dosyası (varsayılan: <path>.checkpoint)",
+        )
+        parser.add_argument(
+            "--resume", action="store_true", help="Checkpoint'ten devam et"
+        )
+        parser.add_argument(
+            "--skip-relations",
+            action="store_true",
+            help="Person/Genre bağlantılarını atla (sonra backfill_content_relations)",
+        )
+
+    # --- okuma -----------------------------------------------------------
+
+    def _jsonl(self, path, offset):
+        """
+        (kayıt, sonraki satırın bayt ofseti) üretir; ofset checkpoint'e yazılır.
+        """
+        with _open(path) as f:
+            f.seek(offset)
+            position = offset
+            while True:
+                line = f.readline()
+                if not line:
+                    break
+                position += len(line)
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line), position
+                except ValueError:
+                    self.errors += 1
+                    yield None, position
+
+    def _csv(self, path, offset):
+        """
+        CSV'de ofset = işlenen satır sayısı; devam ederken o kadar satır atlanır.
+        """
+        with _open(path) as raw:
+            reader = csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8", newline=""))
+            for number, row in enumerate(reader, start=1):
+                if number <= offset:
+                    continue
+                yield _unflatten(row), number
+
+    # --- checkpoint ------------------------------------------------------
+
+    def _load_checkpoint(self, path, data_path, fmt):
+        if not os.path.exists(path):
+            return 0, 0
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("path") != os.path.abspath(data_path) or state.get("format") != fmt:
+            raise CommandError(f"Checkpoint başka bir dosyaya ait: {path}")
+        return state["offset"], state.get("rows", 0)
+
+    def _save_checkpoint(self, path, data_path, fmt, offset, rows):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"path": os.path.abspath(data_path), "format": fmt, "offset": offset, "rows": rows},
+                f,
+            )
+        os.replace(tmp, path)
+
+    # --- yazma -----------------------------------------------------------
+
+    def _flush(self, source, batch, with_relations):
+        # Aynı partide tekrar eden external_id: sonuncusu kazanır
+        contents = list({c.external_id: c for c in batch}.values())
+        with transaction.atomic():
+            Content.objects.bulk_create(
+                contents,
+                batch_size=len(contents),
+                update_conflicts=True,
+                unique_fields=["source", "external_id"],
+                update_fields=UPDATE_FIELDS,
+            )
+            if with_relations:
+                ids = dict(
+                    Content.objects.filter(
+                        source=source, external_id__in=[c.external_id for c in contents]
+                    ).values_list("external_id", "id")
+                )
+                for content in contents:
+                    content.pk = ids.get(content.external_id)
+                sync_content_relations(contents)
+        return len(contents)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        source = options["source"]
+        batch_size = options["batch_size"]
+        fmt = options["format"] or ("csv" if ".csv" in os.path.basename(path) else "jsonl")
+        checkpoint = options["checkpoint"] or f"{path}.checkpoint"
+        normalize = NORMALIZERS[source]
+
+        if not os.path.exists(path):
+            raise CommandError(f"Dosya bulunamadı: {path}")
+
+        offset, rows_done = 0, 0
+        if options["resume"]:
+            offset, rows_done = self._load_checkpoint(checkpoint, path, fmt)
+            if offset:
+                self.stdout.write(f"Checkpoint'ten devam: {rows_done} satır işlenmiş.")
+
+        self.errors = 0
+        records = self._csv(path, offset) if fmt == "csv" else self._jsonl(path, offset)
+        started = time.monotonic()
+        written = 0
+        batch = []
+
+        def flush(position):
+            nonlocal written, batch
+            if batch:
+                written += self._flush(source, batch, not options["skip_relations"])
+                batch = []
+            self._save_checkpoint(checkpoint, path, fmt, position, rows_done)
+            elapsed = max(time.monotonic() - started, 1e-9)
+            self.stdout.write(
+                f"{rows_done} satır, {written} yazıldı, {self.errors} hatalı "
+                f"({written / elapsed:.0f} satır/sn)"
+            )
+
+        position = offset
+        for record, position in records:
+            rows_done += 1
+            if record is None:
+                continue
+            try:
+                details = normalize(record)
+                details["source"] = source
+                batch.append(content_from_details(details))
+            except (KeyError, TypeError, ValueError, AttributeError):
+                self.errors += 1
+                continue
+            if len(batch) >= batch_size:
+                flush(position)
+        flush(position)
+        # Upsert sinyal üretmez; güncellenen satırlar title/facet index'lerine
+        # ancak yeniden kurulumla yansır
+        if written:
+            request_rebuild()
+
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Tamamlandı: {written} içerik, {self.errors} hatalı satır, "
+                f"{elapsed:.1f} sn ({written / elapsed:.0f} satır/sn)."
+            )
+        )
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from app.models import Content, Rating
+
+
+AGGREGATE_FIELDS = ["rating_sum", "rating_count", "average_rating", "rating_histogram"]
+
+
+class Command(BaseCommand):
+    help = "Content üzerindeki puan özetlerini Rating tablosundan yeniden hesaplar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        updated = 0
+
+        while True:
+            contents = list(
+                Content.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .only("id", "updated_at", *AGGREGATE_FIELDS)[:batch_size]
+            )
+            if not contents:
+                break
+            last_id = contents[-1].id
+
+            histograms = {c.id: [0] * 10 for c in contents}
+            rows = (
+                Rating.objects.filter(content_id__in=histograms.keys(), score__range=(1, 10))
+                .values("content_id", "score")
+                .annotate(n=Count("id"))
+            )
+            for row in rows:
+                histograms[row["content_id"]][row["score"] - 1] = row["n"]
+
+            changed = []
+            now = timezone.now()
+            for content in contents:
+                before = [getattr(content, f) for f in AGGREGATE_FIELDS]
+                content.set_rating_aggregates(histograms[content.id])
+                if before != [getattr(content, f) for f in AGGREGATE_FIELDS]:
+                    content.updated_at = now
+                    changed.append(content)
+
+            if changed:
+                with transaction.atomic():
+                    Content.objects.bulk_update(changed, AGGREGATE_FIELDS + ["updated_at"])
+            updated += len(changed)
+
+        self.stdout.write(self.style.SUCCESS(f"{updated} içerik güncellendi."))
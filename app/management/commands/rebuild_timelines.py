@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from app import timeline
+
+
+class Command(BaseCommand):
+    help = (
+        "Ana sayfa akışlarını (TimelineEntry) Follow ve Activity tablolarından "
+        "baştan kurar; her akış TIMELINE['MAX_LENGTH'] satırla sınırlanır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", help="Yalnız bu kullanıcı(lar)")
+        parser.add_argument(
+            "--trim-only",
+            action="store_true",
+            help="Kurma, yalnız MAX_LENGTH'i aşan akışları buda (periyodik çalıştırılabilir)",
+        )
+
+    def handle(self, *args, **options):
+        if options["trim_only"]:
+            deleted = timeline.trim(options["user"]) if options["user"] else timeline.trim_all()
+            self.stdout.write(self.style.SUCCESS(f"{deleted} satır budandı."))
+            return
+        owner_ids = options["user"] or get_user_model().objects.values_list("id", flat=True)
+        users = entries = 0
+        for owner_id in owner_ids:
+            entries += timeline.rebuild(owner_id)
+            users += 1
+        self.stdout.write(self.style.SUCCESS(f"{users} akış kuruldu, {entries} satır yazıldı."))
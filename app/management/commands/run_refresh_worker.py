@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app import refresh
+
+
+class Command(BaseCommand):
+    help = (
+        "Bayat içerikleri ContentRefreshTask kuyruğundan öncelik sırasıyla "
+        "harici kaynaktan yeniler (dakikada en fazla RATE_PER_MINUTE istek)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rate", type=float, help="Dakikada en fazla yenileme")
+        parser.add_argument(
+            "--sweep",
+            type=int,
+            default=0,
+            help="Başlarken görüntülenmemiş bayat içeriklerden en fazla N tanesini kuyruğa al",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Kuyruk boşalınca çık"
+        )
+        parser.add_argument("--idle-sleep", type=float, default=10.0)
+
+    def handle(self, *args, **options):
+        rate = options["rate"] or refresh.config()["RATE_PER_MINUTE"]
+        interval = 60.0 / rate if rate > 0 else 0.0
+
+        if options["sweep"]:
+            added = refresh.enqueue_stale(options["sweep"])
+            self.stdout.write(f"{added} bayat içerik kuyruğa alındı.")
+
+        next_at = time.monotonic()
+        try:
+            while True:
+                task = refresh.claim_next()
+                if task is None:
+                    if options["once"]:
+                        break
+                    time.sleep(options["idle_sleep"])
+                    continue
+
+                # Sabit aralıklı hız sınırı: sağlayıcılara dakikada en fazla `rate` istek
+                delay = next_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_at = max(next_at, time.monotonic()) + interval
+
+                ok = refresh.process(task)
+                self.stdout.write(
+                    f"{'yenilendi' if ok else 'başarısız'}: content={task.content_id} "
+                    f"(kuyruk: {refresh.stats()['queue_depth']})"
+                )
+        except KeyboardInterrupt:
+            pass
+
+        stats = refresh.stats()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Bitti: {stats['refreshed']} yenilendi, {stats['failed']} başarısız, "
+                f"kuyrukta {stats['queue_depth']}."
+            )
+        )
@@ -0,0 +1,17 @@
+# app/metrics.py
+"""
+Süreç içi sayaçlar için basit kayıt defteri.
+Modüller `register("isim", fonksiyon)` ile anlık değer üreten bir
+fonksiyon kaydeder; /api/metrics/ hepsini tek JSON'da döner.
+"""
+from typing import Any, Callable, Dict
+
+_sources: Dict[str, Callable[[], Any]] = {}
+
+
+def register(name: str, source: Callable[[], Any]) -> None:
+    _sources[name] = source
+
+
+def snapshot() -> Dict[str, Any]:
+    return {name: source() for name, source in sorted(_sources.items())}
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from app.search import create_search_index, drop_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_passwordresettoken'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
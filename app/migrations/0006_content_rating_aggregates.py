@@ -0,0 +1,60 @@
+# Generated by Django 6.0 on 2026-10-18 00:57
+
+import app.models
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_rating_aggregates(apps, schema_editor):
+    Content = apps.get_model("app", "Content")
+    Rating = apps.get_model("app", "Rating")
+
+    histograms = {}
+    rows = (
+        Rating.objects.filter(score__range=(1, 10))
+        .values("content_id", "score")
+        .annotate(n=Count("id"))
+    )
+    for row in rows:
+        histograms.setdefault(row["content_id"], [0] * 10)[row["score"] - 1] = row["n"]
+
+    for content_id, histogram in histograms.items():
+        count = sum(histogram)
+        total = sum(n * score for score, n in enumerate(histogram, start=1))
+        Content.objects.filter(pk=content_id).update(
+            rating_histogram=histogram,
+            rating_count=count,
+            rating_sum=total,
+            average_rating=round(total / count, 2),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_content_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='content',
+            name='average_rating',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='rating_histogram',
+            field=models.JSONField(blank=True, default=app.models.empty_rating_histogram),
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_rating_aggregates, migrations.RunPython.noop),
+    ]
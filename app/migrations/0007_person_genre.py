@@ -0,0 +1,56 @@
+# Generated by Django 6.0 on 2026-10-18 01:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_content_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Genre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('key', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Person',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('key', models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ContentGenre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='genre_links', to='app.content')),
+                ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='content_links', to='app.genre')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['genre', 'content'], name='app_content_genre_i_553468_idx')],
+                'unique_together': {('content', 'genre')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ContentPerson',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('director', 'Director'), ('writer', 'Writer'), ('author', 'Author'), ('cast', 'Cast')], max_length=10)),
+                ('order', models.PositiveSmallIntegerField(default=0)),
+                ('content', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='person_links', to='app.content')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='content_links', to='app.person')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['person', 'role', 'content'], name='app_content_person__c0970c_idx')],
+                'unique_together': {('content', 'person', 'role')},
+            },
+        ),
+    ]
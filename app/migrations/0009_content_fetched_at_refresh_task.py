@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-18 11:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_content_profile_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='content',
+            name='fetched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ContentRefreshTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('priority', models.IntegerField(default=0)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('not_before', models.DateTimeField(default=django.utils.timezone.now)),
+                ('enqueued_at', models.DateTimeField(auto_now_add=True)),
+                ('content', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='refresh_task', to='app.content')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-priority', 'not_before'], name='app_content_priorit_d3b7f2_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 6.0 on 2026-10-18 11:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Q
+
+# Kurulumda kullanıcı başına yazılan satır (TIMELINE["MAX_LENGTH"] varsayılanı)
+INITIAL_LENGTH = 800
+
+
+def fill_timelines(apps, schema_editor):
+    Activity = apps.get_model("app", "Activity")
+    Follow = apps.get_model("app", "Follow")
+    TimelineEntry = apps.get_model("app", "TimelineEntry")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    for owner_id in User.objects.values_list("id", flat=True).iterator():
+        following = Follow.objects.filter(follower_id=owner_id).values_list(
+            "following_id", flat=True
+        )
+        recent = (
+            Activity.objects.filter(Q(user_id=owner_id) | Q(user_id__in=following))
+            .order_by("-created_at", "-id")
+            .values_list("id", "user_id", "created_at")[:INITIAL_LENGTH]
+        )
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(
+                    owner_id=owner_id,
+                    activity_id=activity_id,
+                    author_id=author_id,
+                    created_at=created_at,
+                )
+                for activity_id, author_id, created_at in recent
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0009_content_fetched_at_refresh_task'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('activity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='app.activity')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', '-created_at', '-id'], name='app_timelin_owner_i_32a144_idx'), models.Index(fields=['owner', 'author'], name='app_timelin_owner_i_93e079_idx')],
+                'unique_together': {('owner', 'activity')},
+            },
+        ),
+        migrations.RunPython(fill_timelines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0 on 2026-10-18 12:20
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_followers_count(apps, schema_editor):
+    Follow = apps.get_model("app", "Follow")
+    Profile = apps.get_model("app", "Profile")
+
+    counts = Follow.objects.values("following_id").annotate(n=Count("id"))
+    for row in counts:
+        Profile.objects.filter(user_id=row["following_id"]).update(followers_count=row["n"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_timeline_entry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='timelineentry',
+            name='app_timelin_owner_i_32a144_idx',
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_followers_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='timelineentry',
+            index=models.Index(fields=['owner', '-created_at', '-activity'], name='app_timelin_owner_i_5a244c_idx'),
+        ),
+    ]
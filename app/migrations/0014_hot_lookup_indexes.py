@@ -0,0 +1,51 @@
+# Generated by Django 6.0 on 2026-10-18 14:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0013_profile_cursor_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='app_activit_user_id_efcf62_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['following', 'follower'], name='app_follow_followi_77f9ce_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['follower', '-created_at', '-id'], name='app_follow_followe_897730_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='list',
+            index=models.Index(fields=['user', 'is_public', '-created_at', '-id'], name='app_list_user_id_d330f9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='list',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='app_list_user_id_bd65d4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['content', '-created_at', '-id'], name='app_review_content_3175d5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['-created_at', '-id'], name='app_review_created_c3ca62_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userlibraryentry',
+            index=models.Index(fields=['user', 'status', '-created_at', '-id'], name='app_userlib_user_id_4648e9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userlibraryentry',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='app_userlib_user_id_bdc0db_idx'),
+        ),
+    ]
@@ -1,5 +1,5 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 import secrets
 from django.utils import timezone
 from datetime import timedelta
@@ -10,11 +10,26 @@ class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
     avatar_url = models.URLField(blank=True)
     bio = models.TextField(blank=True)
+    # Follow yazıldıkça güncellenir; akışta yüksek takipçili yazarları ayırmak için
+    followers_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # /api/profiles/ cursor sırası
+        indexes = [
+            models.Index(fields=["-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return f"Profile({self.user.username})"
 
+
+def empty_rating_histogram():
+    # 1..10 puanlarının adetleri (index 0 -> puan 1)
+    return [0] * 10
+
+
 class Content(models.Model):
     class ContentType(models.TextChoices):
         MOVIE = "movie", "Movie"
@@ -40,7 +55,18 @@ class Content(models.Model):
     genres = models.JSONField(default=list, blank=True)
     cast = models.JSONField(default=list, blank=True)
 
+    # Puan özetleri: Rating yazıldıkça apply_rating_change ile güncellenir,
+    # sapma olursa `manage.py rebuild_rating_aggregates` ile yeniden hesaplanır.
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    average_rating = models.FloatField(null=True, blank=True)
+    rating_histogram = models.JSONField(default=empty_rating_histogram, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
+    # ETag / Last-Modified için; puan özetleri değişince de ilerler
+    updated_at = models.DateTimeField(auto_now=True)
+    # Harici kaynaktan en son çekildiği an (null: bilinmiyor, bayat sayılır)
+    fetched_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         unique_together = ("source", "external_id")
@@ -48,6 +74,146 @@ class Content(models.Model):
     def __str__(self):
         return self.title
 
+    def set_rating_aggregates(self, histogram):
+        histogram = (list(histogram) + [0] * 10)[:10]
+        self.rating_histogram = histogram
+        self.rating_count = sum(histogram)
+        self.rating_sum = sum(count * score for score, count in enumerate(histogram, start=1))
+        self.average_rating = (
+            round(self.rating_sum / self.rating_count, 2) if self.rating_count else None
+        )
+
+    @classmethod
+    def apply_rating_change(cls, content_id, old_score=None, new_score=None):
+        """
+        Bir puan eklendi (old_score=None), değişti ya da silindi (new_score=None).
+        Content satırını kilitleyip özet alanlarını aynı transaction içinde günceller.
+        """
+        with transaction.atomic():
+            try:
+                content = cls.objects.select_for_update().get(pk=content_id)
+            except cls.DoesNotExist:
+                return None
+            histogram = (list(content.rating_histogram or []) + [0] * 10)[:10]
+            if old_score is not None and histogram[old_score - 1] > 0:
+                histogram[old_score - 1] -= 1
+            if new_score is not None:
+                histogram[new_score - 1] += 1
+            content.set_rating_aggregates(histogram)
+            content.save(
+                update_fields=[
+                    "rating_sum",
+                    "rating_count",
+                    "average_rating",
+                    "rating_histogram",
+                    "updated_at",
+                ]
+            )
+            return content
+
+
+def normalize_name(name) -> str:
+    # Person/Genre eşleştirmesi için: boşlukları sadeleştir, büyük/küçük harf farkını kaldır
+    return " ".join(str(name).split()).casefold()
+
+
+class Person(models.Model):
+    name = models.CharField(max_length=255)
+    key = models.CharField(max_length=255, unique=True)  # normalize_name(name)
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        if not self.key:
+            self.key = normalize_name(self.name)
+        super().save(*args, **kwargs)
+
+
+class Genre(models.Model):
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, unique=True)  # normalize_name(name)
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        if not self.key:
+            self.key = normalize_name(self.name)
+        super().save(*args, **kwargs)
+
+
+class ContentPerson(models.Model):
+    """
+    Content.directors / writers / authors / cast JSON listelerinin
+    index'li karşılığı. JSON alanları okuma önbelleği olarak kalır.
+    """
+    class Role(models.TextChoices):
+        DIRECTOR = "director", "Director"
+        WRITER = "writer", "Writer"
+        AUTHOR = "author", "Author"
+        CAST = "cast", "Cast"
+
+    content = models.ForeignKey(
+        Content, on_delete=models.CASCADE, related_name="person_links"
+    )
+    person = models.ForeignKey(
+        Person, on_delete=models.CASCADE, related_name="content_links"
+    )
+    role = models.CharField(max_length=10, choices=Role.choices)
+    order = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("content", "person", "role")
+        indexes = [
+            models.Index(fields=["person", "role", "content"]),
+        ]
+
+    def __str__(self):
+        return f"{self.person} - {self.content} ({self.role})"
+
+
+class ContentGenre(models.Model):
+    content = models.ForeignKey(
+        Content, on_delete=models.CASCADE, related_name="genre_links"
+    )
+    genre = models.ForeignKey(
+        Genre, on_delete=models.CASCADE, related_name="content_links"
+    )
+
+    class Meta:
+        unique_together = ("content", "genre")
+        indexes = [
+            models.Index(fields=["genre", "content"]),
+        ]
+
+    def __str__(self):
+        return f"{self.content} - {self.genre}"
+
+
+class ContentRefreshTask(models.Model):
+    """
+    Harici kaynaktan yeniden çekilecek içerik kuyruğu (app/refresh.py).
+    Yüksek öncelik (görüntülenme + puan sayısı) önce işlenir.
+    """
+    content = models.OneToOneField(
+        Content, on_delete=models.CASCADE, related_name="refresh_task"
+    )
+    priority = models.IntegerField(default=0)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    # Bu andan önce alınmaz: hata sonrası bekleme ya da işleyen worker'ın kirası
+    not_before = models.DateTimeField(default=timezone.now)
+    enqueued_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-priority", "not_before"]),
+        ]
+
+    def __str__(self):
+        return f"Refresh({self.content_id}, p={self.priority})"
+
 
 class UserLibraryEntry(models.Model):
     class Status(models.TextChoices):
@@ -67,6 +233,11 @@ class UserLibraryEntry(models.Model):
 
     class Meta:
         unique_together = ("user", "content", "status")
+        # Kütüphane listesi: kullanıcı (+ durum) filtresi, (-created_at, -id) cursor sırası
+        indexes = [
+            models.Index(fields=["user", "status", "-created_at", "-id"]),
+            models.Index(fields=["user", "-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.content} ({self.status})"
@@ -106,6 +277,12 @@ class Review(models.Model):
         Rating, on_delete=models.SET_NULL, null=True, blank=True, related_name="review"
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["content", "-created_at", "-id"]),
+            models.Index(fields=["-created_at", "-id"]),
+        ]
+
     def __str__(self):
         return f"Review by {self.user} on {self.content}"
 
@@ -119,6 +296,12 @@ class List(models.Model):
     is_public = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "is_public", "-created_at", "-id"]),
+            models.Index(fields=["user", "-created_at", "-id"]),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.user})"
 
@@ -156,6 +339,11 @@ class Follow(models.Model):
 
     class Meta:
         unique_together = ("follower", "following")
+        indexes = [
+            # Takipçi listesi / fan-out: following'den follower'a index'ten okunur
+            models.Index(fields=["following", "follower"]),
+            models.Index(fields=["follower", "-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return f"{self.follower} → {self.following}"
@@ -190,10 +378,71 @@ class Activity(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.activity_type} ({self.created_at})"
-    
+
+
+class ActivityOutbox(models.Model):
+    """
+    Üretilecek Activity'lerin transactional outbox'ı (app/outbox.py).
+    Kaynak kayıtla aynı transaction'da yazılır, istek dışında toplu işlenir.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    activity_type = models.CharField(max_length=20, choices=Activity.ActivityType.choices)
+    content = models.ForeignKey(
+        Content, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    rating = models.ForeignKey(
+        Rating, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    review = models.ForeignKey(
+        Review, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    list = models.ForeignKey(
+        List, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Outbox({self.user_id}, {self.activity_type})"
+
+
+class TimelineEntry(models.Model):
+    """
+    Ana sayfa akışının hazır hali (app/timeline.py): Activity oluşunca
+    yazara ve takipçilerine birer satır yazılır; akış okuması `owner`
+    index'i üzerinde tek aralık taramasıdır. Yüksek takipçili yazarların
+    aktiviteleri yalnız kendi akışlarına yazılır, okurken birleştirilir.
+    """
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    activity = models.ForeignKey(
+        Activity, on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    # Takipten çıkınca silinecek satırları bulmak için (Activity'ye join'siz)
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    # Activity.created_at kopyası; sıralama bu tablodan yapılır
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("owner", "activity")
+        indexes = [
+            models.Index(fields=["owner", "-created_at", "-activity"]),
+            models.Index(fields=["owner", "author"]),
+        ]
+
+    def __str__(self):
+        return f"Timeline({self.owner_id}, {self.activity_id})"
+
 
 class PasswordResetToken(models.Model):
     user = models.ForeignKey(
@@ -0,0 +1,199 @@
+# app/outbox.py
+"""
+Activity üretimi için transactional outbox.
+
+Puan, yorum, kütüphane ve liste yazımları `record()` ile aynı transaction
+içinde tek bir ActivityOutbox satırı ekler; Activity oluşturma ve akışlara
+dağıtım (timeline.fan_out) istekte yapılmaz. Commit sonrası süreç içi bir
+thread FLUSH_DELAY kadar bekleyip birikenleri toplu işler; AUTO_FLUSH
+kapalıysa `manage.py flush_activity_outbox --loop` aynı işi yapar.
+
+Birleştirme: aynı (kullanıcı, tür, içerik, liste) için COALESCE_WINDOW
+içindeki tekrarlar (ör. aynı içeriği dakikalar içinde yeniden puanlamak)
+tek Activity olarak kalır; mevcut Activity en son kayda bağlanır.
+Yorumlar birleşmez: her yorum ayrı bir kayıttır, kendi Activity'sini alır.
+"""
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import metrics, timeline
+from .models import Activity, ActivityOutbox
+
+DEFAULTS = {
+    "AUTO_FLUSH": True,  # commit sonrası süreç içi thread ile işle
+    "FLUSH_DELAY": 1.0,  # saniye; bu sürede biriken yazımlar tek partide işlenir
+    "BATCH_SIZE": 500,
+    "COALESCE_WINDOW": 600,  # saniye
+}
+
+_lock = threading.Lock()
+_counters = {"recorded": 0, "flushed": 0, "coalesced": 0, "created": 0, "batches": 0}
+
+
+def _count(**amounts) -> None:
+    with _lock:
+        for name, amount in amounts.items():
+            _counters[name] += amount
+
+
+def config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, "ACTIVITY_OUTBOX", {})}
+
+
+def record(
+    user_id: int,
+    activity_type: str,
+    content_id: Optional[int] = None,
+    rating_id: Optional[int] = None,
+    review_id: Optional[int] = None,
+    list_id: Optional[int] = None,
+) -> None:
+    """
+    Kaynak yazımla aynı transaction içinde çağrılır; rollback olursa satır da gider.
+    """
+    ActivityOutbox.objects.create(
+        user_id=user_id,
+        activity_type=activity_type,
+        content_id=content_id,
+        rating_id=rating_id,
+        review_id=review_id,
+        list_id=list_id,
+    )
+    _count(recorded=1)
+    if config()["AUTO_FLUSH"]:
+        transaction.on_commit(_flusher.wake)
+
+
+def _key(row) -> tuple:
+    # Outbox satırı ve Activity için ortak; yorumun anahtarında kendi id'si var
+    review_id = row.review_id if row.activity_type == Activity.ActivityType.REVIEW else None
+    return (row.user_id, row.activity_type, row.content_id, row.list_id, review_id)
+
+
+def flush(batch_size: Optional[int] = None) -> int:
+    """
+    Outbox'tan bir parti işler; işlenen satır sayısı (0: boş).
+    """
+    conf = config()
+    batch_size = batch_size or conf["BATCH_SIZE"]
+    with transaction.atomic():
+        rows = list(
+            ActivityOutbox.objects.select_for_update(skip_locked=True).order_by("id")[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        # Parti içinde aynı anahtarın son hali kalır
+        latest = {}
+        for row in rows:
+            latest[_key(row)] = row
+
+        since = timezone.now() - timedelta(seconds=conf["COALESCE_WINDOW"])
+        recent = {
+            _key(a): a
+            for a in Activity.objects.filter(
+                user_id__in={row.user_id for row in rows},
+                activity_type__in={row.activity_type for row in rows},
+                created_at__gte=since,
+            ).only("id", "user_id", "activity_type", "content_id", "list_id", "rating", "review")
+        }
+
+        updated, created = [], []
+        for key, row in latest.items():
+            activity = recent.get(key)
+            if activity is not None:
+                activity.rating_id = row.rating_id or activity.rating_id
+                activity.review_id = row.review_id or activity.review_id
+                updated.append(activity)
+            else:
+                created.append(
+                    Activity(
+                        user_id=row.user_id,
+                        activity_type=row.activity_type,
+                        content_id=row.content_id,
+                        rating_id=row.rating_id,
+                        review_id=row.review_id,
+                        list_id=row.list_id,
+                    )
+                )
+
+        if updated:
+            Activity.objects.bulk_update(updated, ["rating", "review"])
+        # bulk_create post_save göndermez; akışlara burada dağıtılır
+        Activity.objects.bulk_create(created)
+        for activity in created:
+            timeline.fan_out(activity)
+        ActivityOutbox.objects.filter(id__in=[row.id for row in rows]).delete()
+
+    _count(
+        flushed=len(rows),
+        coalesced=len(rows) - len(created),
+        created=len(created),
+        batches=1,
+    )
+    return len(rows)
+
+
+def flush_all(batch_size: Optional[int] = None) -> int:
+    total = 0
+    while True:
+        done = flush(batch_size)
+        total += done
+        if not done:
+            return total
+
+
+class _Flusher:
+    """
+    Süreç başına tek arka plan thread'i; commit sonrası uyandırılır.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.errors = 0
+
+    def wake(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="activity-outbox", daemon=True
+                    )
+                    self._thread.start()
+        self._event.set()
+
+    def _run(self) -> None:
+        while True:
+            self._event.wait()
+            # Kısa süre biriktir: ardışık yazımlar tek partide işlenir
+            time.sleep(config()["FLUSH_DELAY"])
+            self._event.clear()
+            try:
+                flush_all()
+            except Exception:
+                # Satırlar outbox'ta kalır; sonraki uyanışta ya da komutla işlenir
+                self.errors += 1
+            finally:
+                connection.close()
+
+
+_flusher = _Flusher()
+
+
+def stats() -> Dict[str, Any]:
+    with _lock:
+        data = dict(_counters)
+    data["flush_errors"] = _flusher.errors
+    data["pending"] = ActivityOutbox.objects.count()
+    return data
+
+
+metrics.register("activity_outbox", stats)
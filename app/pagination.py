@@ -0,0 +1,145 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+def _flip(ordering):
+    return tuple(f[1:] if f.startswith("-") else f"-{f}" for f in ordering)
+
+
+def keyset_filter(ordering, values) -> Q:
+    """
+    `ordering` sırasında `values` satırından sonra gelenler. (-a, -b) için:
+    a <= x AND (a < x OR (a = x AND b < y)). Baştaki a <= x index aralığını
+    daraltır; OR yalnız o aralığın içinde elenir.
+    """
+    condition = None
+    for field, value in reversed(list(zip(ordering, values))):
+        name = field.lstrip("-")
+        strict = Q(**{f"{name}__{'lt' if field.startswith('-') else 'gt'}": value})
+        condition = strict if condition is None else strict | (Q(**{name: value}) & condition)
+    first = ordering[0]
+    lead = Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": values[0]})
+    return lead & condition
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Varsayılan sayfalama: sıralama alanlarının tamamı üzerinden keyset cursor,
+    ör. (created_at, id). Cursor sayfanın sınır satırının bu alanlardaki
+    değerlerini taşır ve sonraki sayfa keyset_filter ile okunur. DRF'in
+    CursorPagination'ı konumu yalnız ilk alandan alıp eşitlerde OFFSET'e
+    düşer; burada aynı created_at'i paylaşan satırlar (toplu içe aktarma) da
+    index'ten okunur, araya giren yazımlar satır atlatmaz ya da tekrarlatmaz.
+
+    Sıralamanın son alanı tekil olmalı (id). View'lar `cursor_ordering` ile
+    sıralamayı değiştirebilir (ör. aramada search_rank), `pagination_class = None`
+    ile de kapatabilir.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = getattr(settings, "MAX_PAGE_SIZE", 100)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "cursor_ordering", None)
+        if ordering:
+            return tuple(ordering)
+        return super().get_ordering(request, queryset, view)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        values, reverse = self.cursor or (None, False)
+
+        ordering = _flip(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            values = self._to_python(queryset.model, values)
+            queryset = queryset.filter(keyset_filter(ordering, values))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _to_python(self, model, values):
+        converted = []
+        for field, value in zip(self.ordering, values):
+            try:
+                model_field = model._meta.get_field(field.lstrip("-"))
+            except FieldDoesNotExist:
+                # Annotasyon (search_rank): JSON'daki sayı olduğu gibi kullanılır
+                converted.append(value)
+                continue
+            try:
+                converted.append(model_field.to_python(value))
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+        return converted
+
+    def _position(self, instance):
+        values = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip("-"))
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return values
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            return self.encode_cursor((self._position(self.page[-1]), False))
+        # Geriye giderken boş sayfa: cursor satırından itibaren ileri
+        return self.encode_cursor((self.cursor[0], False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            return self.encode_cursor((self._position(self.page[0]), True))
+        return self.encode_cursor((self.cursor[0], True))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            data = json.loads(raw)
+            values, reverse = data["v"], bool(data.get("r"))
+        except (TypeError, ValueError, KeyError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, cursor):
+        values, reverse = cursor
+        data = {"v": list(values)}
+        if reverse:
+            data["r"] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(data, separators=(",", ":")).encode()
+        ).decode().rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
@@ -0,0 +1,254 @@
+# app/posters.py
+"""
+Poster görselleri için vekil (proxy) ve disk önbelleği.
+
+Orijinal görsel bir kez indirilir ve içeriğinin sha256'sı adıyla saklanır
+(content-addressed); aynı görsele giden farklı URL'ler tek dosyayı paylaşır.
+Küçük boyutlar (thumb / card / detail) ilk istendiklerinde üretilir:
+TMDb için kaynağın kendi boyutu (/t/p/w185 gibi) çekilir, diğerleri için
+Pillow kuruluysa yeniden boyutlandırılır, değilse orijinal döner.
+"""
+import hashlib
+import io
+import os
+import re
+import threading
+from typing import Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import requests
+from django.conf import settings
+
+from . import metrics
+from .services.http import get_client
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow opsiyonel
+    Image = None
+
+# boyut adı -> genişlik (px)
+VARIANTS = {
+    "thumb": 92,
+    "card": 185,
+    "detail": 500,
+}
+
+DEFAULTS = {
+    "DIR": os.path.join(settings.BASE_DIR, "poster_cache"),
+    "MAX_AGE": 60 * 60 * 24 * 365,
+    "UNVERSIONED_MAX_AGE": 300,  # v= yok ya da eskiyse; poster_url değişebilir
+    "MAX_BYTES": 5 * 1024 * 1024,
+    "ALLOWED_HOSTS": [
+        "image.tmdb.org",
+        "books.google.com",
+        "books.googleusercontent.com",
+    ],
+}
+
+_TMDB_SIZE_RE = re.compile(r"^(/t/p/)(w\d+|original)(/.+)$")
+_CONTENT_TYPES = {b"\xff\xd8\xff": "image/jpeg", b"\x89PNG": "image/png", b"GIF8": "image/gif"}
+
+
+class PosterError(Exception):
+    pass
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, "POSTER_CACHE", {})}
+
+
+def url_version(url: str) -> str:
+    # Serializer'daki URL'lere eklenir; poster_url değişince tarayıcı önbelleği de değişir
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:10]
+
+
+def sniff_type(data: bytes) -> str:
+    for magic, content_type in _CONTENT_TYPES.items():
+        if data.startswith(magic):
+            return content_type
+    if data[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+class PosterStore:
+    """
+    Dizin düzeni:
+      blobs/ab/<sha256>           görsel baytları
+      urls/<sha256(url)>          o URL'nin blob hash'i
+    """
+
+    def __init__(self, root: str, max_bytes: int, allowed_hosts):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.allowed_hosts = set(allowed_hosts)
+        self.client = get_client("images")
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self.hits = 0
+        self.fetches = 0
+        self.resizes = 0
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            if len(self._locks) > 10000:
+                self._locks.clear()
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], digest)
+
+    def _url_path(self, url_key: str) -> str:
+        return os.path.join(self.root, "urls", url_key)
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    # Yönlendirmeler elle izlenir; her adımın host'u ALLOWED_HOSTS'ta olmalı
+    max_redirects = 3
+
+    def _download(self, url: str) -> bytes:
+        for _ in range(self.max_redirects + 1):
+            parsed = urlparse(url)
+            if parsed.scheme not in ("http", "https") or parsed.hostname not in self.allowed_hosts:
+                raise PosterError("Bu adresten görsel alınmıyor.")
+            try:
+                resp = self.client.get(url, allow_redirects=False, stream=True)
+            except requests.RequestException as e:
+                raise PosterError(f"Görsel indirilemedi: {e}") from e
+            try:
+                if resp.is_redirect:
+                    url = urljoin(url, resp.headers["Location"])
+                    continue
+                if resp.status_code != 200:
+                    raise PosterError(f"Görsel indirilemedi: {resp.status_code}")
+                return self._read(resp)
+            finally:
+                resp.close()
+        raise PosterError("Görsel indirilemedi: çok fazla yönlendirme.")
+
+    def _read(self, resp) -> bytes:
+        # Gövde parça parça okunur; sınır aşılınca okumayı bırakır
+        length = resp.headers.get("Content-Length", "")
+        if length.isdigit() and int(length) > self.max_bytes:
+            raise PosterError("Görsel çok büyük.")
+        chunks, size = [], 0
+        try:
+            for chunk in resp.iter_content(64 * 1024):
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise PosterError("Görsel çok büyük.")
+                chunks.append(chunk)
+        except requests.RequestException as e:
+            raise PosterError(f"Görsel indirilemedi: {e}") from e
+        return b"".join(chunks)
+
+    def _store(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            self._write(path, data)
+        return digest
+
+    def fetch(self, url: str) -> str:
+        """
+        URL'nin blob hash'i; gerekirse indirir (URL başına tek indirme).
+        """
+        url_key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        pointer = self._url_path(url_key)
+        if os.path.exists(pointer):
+            with open(pointer, encoding="ascii") as f:
+                digest = f.read().strip()
+            if os.path.exists(self._blob_path(digest)):
+                self.hits += 1
+                return digest
+        with self._lock_for(url_key):
+            if os.path.exists(pointer):
+                with open(pointer, encoding="ascii") as f:
+                    digest = f.read().strip()
+                if os.path.exists(self._blob_path(digest)):
+                    return digest
+            self.fetches += 1
+            digest = self._store(self._download(url))
+            self._write(pointer, digest.encode("ascii"))
+            return digest
+
+    def _resize(self, digest: str, width: int) -> Optional[str]:
+        if Image is None:
+            return None
+        with open(self._blob_path(digest), "rb") as f:
+            data = f.read()
+        out = io.BytesIO()
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.load()
+            if image.width <= width:
+                return digest
+            height = round(image.height * width / image.width)
+            image = image.convert("RGB").resize((width, height), Image.LANCZOS)
+            image.save(out, "JPEG", quality=85, optimize=True, progressive=True)
+        except (Image.DecompressionBombError, OSError, ValueError) as e:
+            # UnidentifiedImageError (görsel değil) ve bozuk dosyalar OSError'dır
+            raise PosterError(f"Görsel işlenemedi: {e}") from e
+        self.resizes += 1
+        return self._store(out.getvalue())
+
+    def variant(self, url: str, size: str) -> Tuple[str, str]:
+        """
+        (blob hash, content type). size: VARIANTS anahtarı ya da "original".
+        """
+        width = VARIANTS.get(size)
+        if width is None:
+            digest = self.fetch(url)
+        else:
+            parsed = urlparse(url)
+            match = _TMDB_SIZE_RE.match(parsed.path) if parsed.hostname == "image.tmdb.org" else None
+            if match:
+                # TMDb aynı görseli istenen genişlikte zaten sunuyor
+                sized = parsed._replace(path=f"{match.group(1)}w{width}{match.group(3)}").geturl()
+                digest = self.fetch(sized)
+            else:
+                variant_key = f"{url}#w{width}"
+                variant_pointer = self._url_path(
+                    hashlib.sha256(variant_key.encode("utf-8")).hexdigest()
+                )
+                digest = None
+                if os.path.exists(variant_pointer):
+                    with open(variant_pointer, encoding="ascii") as f:
+                        digest = f.read().strip()
+                    if not os.path.exists(self._blob_path(digest)):
+                        digest = None
+                if digest is None:
+                    with self._lock_for(variant_key):
+                        original = self.fetch(url)
+                        digest = self._resize(original, width) or original
+                        self._write(variant_pointer, digest.encode("ascii"))
+        with open(self._blob_path(digest), "rb") as f:
+            head = f.read(16)
+        return digest, sniff_type(head)
+
+    def open(self, digest: str):
+        return open(self._blob_path(digest), "rb")
+
+    def stats(self):
+        return {
+            "disk_hits": self.hits,
+            "fetches": self.fetches,
+            "resizes": self.resizes,
+            "resize_available": Image is not None,
+        }
+
+
+def from_settings() -> PosterStore:
+    conf = config()
+    return PosterStore(str(conf["DIR"]), conf["MAX_BYTES"], conf["ALLOWED_HOSTS"])
+
+
+poster_store = from_settings()
+metrics.register("posters", poster_store.stats)
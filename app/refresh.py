@@ -0,0 +1,288 @@
+# app/refresh.py
+"""
+İçerik meta verisinin arka planda tazelenmesi (stale-while-revalidate).
+
+Okuma yolu her zaman eldeki veriyi döner; `fetched_at` değeri MAX_AGE'den
+eski olan içerikler ContentRefreshTask kuyruğuna girer (her görüntülenme
+önceliği artırır). Görüntülenmeler istekte yalnız bellekte biriktirilir,
+süreç içi bir thread FLUSH_INTERVAL'da bir toplu yazar.
+`manage.py run_refresh_worker` kuyruğu öncelik sırasıyla, dakikada
+RATE_PER_MINUTE isteği aşmadan TMDb / Google Books'tan yeniler.
+"""
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from . import metrics
+from .catalog import DETAIL_FETCHERS, content_from_details
+from .models import Content, ContentRefreshTask
+from .services.google_books import GoogleBooksError
+from .services.ratelimit import background
+from .services.tmdb import TMDBError
+
+DEFAULTS = {
+    "MAX_AGE_DAYS": 30,
+    "RATE_PER_MINUTE": 30,
+    "MAX_ATTEMPTS": 5,
+    "RETRY_BACKOFF": 300,  # saniye; her hatada iki katına çıkar
+    "LEASE": 120,  # alınan görevin başka worker'a görünmediği süre
+    "BUMP_INTERVAL": 60,  # aynı içerik için görüntülenme artışı en fazla bu sıklıkta
+    "FLUSH_INTERVAL": 5,  # saniye; biriken görüntülenmeler bu aralıkla yazılır
+}
+
+# Yenilemede üzerine yazılan alanlar (puan özetleri, created_at korunur)
+REFRESH_FIELDS = [
+    "title",
+    "original_title",
+    "year",
+    "description",
+    "poster_url",
+    "runtime_minutes",
+    "page_count",
+    "directors",
+    "writers",
+    "authors",
+    "genres",
+    "cast",
+]
+
+
+def config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, "CONTENT_REFRESH", {})}
+
+
+def is_stale(fetched_at, now=None) -> bool:
+    if fetched_at is None:
+        return True
+    now = now or timezone.now()
+    return fetched_at < now - timedelta(days=config()["MAX_AGE_DAYS"])
+
+
+class _Counters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bumped = {}  # content_id -> son artış zamanı (monotonic)
+        self.enqueued = 0
+        self.bumped = 0
+        self.refreshed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.flush_errors = 0
+
+    def should_bump(self, content_id, interval) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            last = self._bumped.get(content_id)
+            if last is not None and now - last < interval:
+                return False
+            if len(self._bumped) > 10000:
+                self._bumped.clear()
+            self._bumped[content_id] = now
+            return True
+
+    def incr(self, name, n=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+
+counters = _Counters()
+
+
+class _ViewBuffer:
+    """
+    Görüntülenme artışlarını bellekte biriktirir; süreç başına tek thread
+    FLUSH_INTERVAL'da bir flush_views() çağırır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}  # content_id -> [görüntülenme, puan sayısı]
+        self._thread = None
+
+    def add(self, content_id, rating_count) -> None:
+        with self._lock:
+            entry = self._views.get(content_id)
+            if entry is None:
+                self._views[content_id] = [1, rating_count]
+            else:
+                entry[0] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="content-refresh-views", daemon=True
+                )
+                self._thread.start()
+
+    def drain(self) -> Dict[int, list]:
+        with self._lock:
+            views, self._views = self._views, {}
+        return views
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(config()["FLUSH_INTERVAL"])
+            try:
+                flush_views()
+            except Exception:
+                # Artışlar kaybolur; içerik bir sonraki görüntülenmede yine gelir
+                counters.incr("flush_errors")
+            finally:
+                connection.close()
+
+
+_view_buffer = _ViewBuffer()
+
+
+def note_view(content_id: int, source: str, fetched_at, rating_count: int = 0) -> None:
+    """
+    Görüntülenen içerik bayatsa kuyruğa alınmak / önceliği artırılmak üzere
+    not edilir. İstek yolunda çağrılır; veritabanına dokunmaz.
+    """
+    if source not in DETAIL_FETCHERS or not is_stale(fetched_at):
+        return
+    if not counters.should_bump(content_id, config()["BUMP_INTERVAL"]):
+        return
+    _view_buffer.add(content_id, rating_count)
+
+
+def flush_views() -> int:
+    """
+    Biriken görüntülenmeleri yazar: kuyrukta olanların önceliği artar,
+    olmayanlar (puan sayısı + görüntülenme) öncelikle eklenir.
+    """
+    views = _view_buffer.drain()
+    if not views:
+        return 0
+    queued = set(
+        ContentRefreshTask.objects.filter(content_id__in=views).values_list(
+            "content_id", flat=True
+        )
+    )
+    by_count = defaultdict(list)
+    for content_id in queued:
+        by_count[views[content_id][0]].append(content_id)
+    for count, ids in by_count.items():
+        ContentRefreshTask.objects.filter(content_id__in=ids).update(
+            priority=F("priority") + count
+        )
+    new = [
+        ContentRefreshTask(content_id=content_id, priority=rating_count + count)
+        for content_id, (count, rating_count) in views.items()
+        if content_id not in queued
+    ]
+    # Aynı anda başka süreç kuyruğa almış olabilir
+    ContentRefreshTask.objects.bulk_create(new, ignore_conflicts=True)
+    counters.incr("bumped", len(queued))
+    counters.incr("enqueued", len(new))
+    return len(views)
+
+
+def enqueue_stale(limit: int) -> int:
+    """
+    Hiç görüntülenmemiş bayat içerikleri de puan sayısına göre kuyruğa alır.
+    """
+    cutoff = timezone.now() - timedelta(days=config()["MAX_AGE_DAYS"])
+    rows = (
+        Content.objects.filter(refresh_task__isnull=True)
+        .exclude(fetched_at__gte=cutoff)
+        .filter(source__in=list(DETAIL_FETCHERS))
+        .order_by("-rating_count", "id")
+        .values_list("id", "rating_count")[:limit]
+    )
+    tasks = [ContentRefreshTask(content_id=pk, priority=count) for pk, count in rows]
+    ContentRefreshTask.objects.bulk_create(tasks, ignore_conflicts=True)
+    counters.incr("enqueued", len(tasks))
+    return len(tasks)
+
+
+def claim_next() -> Optional[ContentRefreshTask]:
+    """
+    En yüksek öncelikli hazır görevi kiralar (koşullu update ile; birden
+    fazla worker aynı görevi almaz).
+    """
+    lease = config()["LEASE"]
+    for _ in range(5):
+        now = timezone.now()
+        task = (
+            ContentRefreshTask.objects.filter(not_before__lte=now)
+            .order_by("-priority", "not_before")
+            .first()
+        )
+        if task is None:
+            return None
+        claimed = ContentRefreshTask.objects.filter(
+            pk=task.pk, not_before=task.not_before
+        ).update(not_before=now + timedelta(seconds=lease))
+        if claimed:
+            return task
+    return None
+
+
+def refresh_content(content: Content) -> Content:
+    """
+    İçeriği kaynağından yeniden çeker ve yerinde günceller.
+    """
+    details = DETAIL_FETCHERS[content.source](content.external_id)
+    fresh = content_from_details(details)
+    for field in REFRESH_FIELDS:
+        setattr(content, field, getattr(fresh, field))
+    content.fetched_at = timezone.now()
+    content.save(update_fields=REFRESH_FIELDS + ["fetched_at", "updated_at"])
+    return content
+
+
+def process(task: ContentRefreshTask) -> bool:
+    cfg = config()
+    try:
+        content = Content.objects.get(pk=task.content_id)
+        if content.source not in DETAIL_FETCHERS:
+            # Yenilenemez; tekrar denemek anlamsız
+            task.delete()
+            counters.incr("dropped")
+            return False
+        with background():
+            refresh_content(content)
+    except Content.DoesNotExist:
+        task.delete()
+        return False
+    except (TMDBError, GoogleBooksError, KeyError, ValueError) as e:
+        attempts = task.attempts + 1
+        if attempts >= cfg["MAX_ATTEMPTS"]:
+            task.delete()
+            counters.incr("dropped")
+        else:
+            delay = cfg["RETRY_BACKOFF"] * (2 ** (attempts - 1))
+            ContentRefreshTask.objects.filter(pk=task.pk).update(
+                attempts=attempts,
+                last_error=str(e)[:1000],
+                not_before=timezone.now() + timedelta(seconds=delay),
+            )
+        counters.incr("failed")
+        return False
+    task.delete()
+    counters.incr("refreshed")
+    return True
+
+
+def stats() -> Dict[str, Any]:
+    now = timezone.now()
+    return {
+        "queue_depth": ContentRefreshTask.objects.count(),
+        "ready": ContentRefreshTask.objects.filter(not_before__lte=now).count(),
+        "retrying": ContentRefreshTask.objects.filter(attempts__gt=0).count(),
+        "enqueued": counters.enqueued,
+        "bumped": counters.bumped,
+        "refreshed": counters.refreshed,
+        "failed": counters.failed,
+        "dropped": counters.dropped,
+        "flush_errors": counters.flush_errors,
+    }
+
+
+metrics.register("content_refresh", stats)
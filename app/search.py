@@ -0,0 +1,216 @@
+# app/search.py
+"""
+Content için tam metin arama.
+
+SQLite'ta contentless FTS5 sanal tablosu (app_content_fts), Postgres'te tsvector
+üzerine GIN index kullanılır. İkisi de app_content tablosundaki
+title, original_title, description, directors, authors ve cast
+kolonlarını kapsar; senkronizasyonu veritabanı tetikleyicileri/ifade
+index'i yapar, bu yüzden bulk_create ile yazılan satırlar da aranabilir.
+"""
+import re
+from typing import Dict, List
+
+from django.db import connection
+from django.db.models import FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "app_content_fts"
+SEARCH_COLUMNS = ["title", "original_title", "description", "directors", "authors", "cast"]
+JSON_COLUMNS = {"directors", "authors", "cast"}
+# bm25 / setweight için kolon ağırlıkları (SEARCH_COLUMNS sırasıyla)
+SQLITE_WEIGHTS = [10.0, 8.0, 1.0, 3.0, 3.0, 2.0]
+PG_WEIGHTS = ["A", "A", "D", "B", "B", "C"]
+PG_INDEX = "app_content_search_idx"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _tokens(query: str) -> List[str]:
+    return _TOKEN_RE.findall(query or "")[:16]
+
+
+def _pg_document() -> str:
+    parts = []
+    for column, weight in zip(SEARCH_COLUMNS, PG_WEIGHTS):
+        parts.append(
+            f"setweight(to_tsvector('simple'::regconfig, "
+            f"coalesce(\"app_content\".\"{column}\"::text, '')), '{weight}')"
+        )
+    return " || ".join(parts)
+
+
+# Postgres'te index ve sorgu birebir aynı ifadeyi kullanmalı,
+# yoksa planner GIN index'i seçmez.
+PG_DOCUMENT = _pg_document()
+
+
+# -----------------------------
+# Şema (migration'dan çağrılır)
+# -----------------------------
+
+def _sqlite_values(row: str) -> str:
+    """
+    Tetikleyicide / yeniden doldurmada index'e yazılan değerler. JSON listeleri
+    çözülmüş metin olarak yazılır: Django JSON'u ensure_ascii ile saklar,
+    ham metinde "Özpetek" "\\u00d6zpetek" olarak durur ve aranamaz.
+    """
+    values = []
+    for column in SEARCH_COLUMNS:
+        if column in JSON_COLUMNS:
+            values.append(
+                f"(SELECT group_concat(value, ' ') FROM json_each({row}.\"{column}\"))"
+            )
+        else:
+            values.append(f'{row}."{column}"')
+    return ", ".join(values)
+
+
+def _sqlite_trigger_sql() -> Dict[str, str]:
+    cols = ", ".join(f'"{c}"' for c in SEARCH_COLUMNS)
+    delete_old = (
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) "
+        f"VALUES ('delete', old.id, {_sqlite_values('old')});"
+    )
+    insert_new = (
+        f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {_sqlite_values('new')});"
+    )
+    return {
+        "app_content_fts_ai": f"AFTER INSERT ON app_content BEGIN {insert_new} END",
+        "app_content_fts_ad": f"AFTER DELETE ON app_content BEGIN {delete_old} END",
+        # Sadece aranan kolonlar değişince tetiklenir; puan özeti gibi
+        # update_fields ile yapılan yazımlar FTS satırına dokunmaz.
+        "app_content_fts_au": (
+            f"AFTER UPDATE OF {cols} ON app_content BEGIN {delete_old} {insert_new} END"
+        ),
+    }
+
+
+def _create_sqlite_triggers(cursor, names) -> None:
+    triggers = _sqlite_trigger_sql()
+    for name in names:
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {triggers[name]}")
+
+
+def _fill_sqlite_index(cursor) -> None:
+    cols = ", ".join(f'"{c}"' for c in SEARCH_COLUMNS)
+    cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')")
+    cursor.execute(
+        f"INSERT INTO {FTS_TABLE}(rowid, {cols}) "
+        f"SELECT id, {_sqlite_values('app_content')} FROM app_content"
+    )
+
+
+def _create_sqlite_index(cursor) -> None:
+    # contentless: index app_content kolonlarını değil çözülmüş değerleri tutar
+    cols = ", ".join(f'"{c}"' for c in SEARCH_COLUMNS)
+    weights = ", ".join(str(w) for w in SQLITE_WEIGHTS)
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({cols}, content='', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    _create_sqlite_triggers(cursor, _sqlite_trigger_sql())
+    cursor.execute(
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', 'bm25({weights})')"
+    )
+    _fill_sqlite_index(cursor)
+
+
+def _drop_sqlite_index(cursor) -> None:
+    for trigger in _sqlite_trigger_sql():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            _create_sqlite_index(cursor)
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX {PG_INDEX} ON app_content USING GIN (({PG_DOCUMENT}))"
+        )
+
+
+def sync_search_index(connection) -> None:
+    """
+    SQLite'ta app_content'i yeniden yaratan migration'lar (AddField vb.)
+    tetikleyicileri siler. Eksik tetikleyicileri kurar ve index'i yeniden doldurur;
+    ham JSON metnini index'leyen eski (content='app_content') tabloyu da baştan
+    kurar. post_migrate'te çalışır.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type IN ('table', 'trigger') "
+            "AND name IN (%s, %s, %s, %s)",
+            [FTS_TABLE, *_sqlite_trigger_sql()],
+        )
+        existing = dict(cursor.fetchall())
+        if FTS_TABLE not in existing:
+            return
+        if "content=''" not in existing[FTS_TABLE]:
+            _drop_sqlite_index(cursor)
+            _create_sqlite_index(cursor)
+            return
+        missing = [name for name in _sqlite_trigger_sql() if name not in existing]
+        if missing:
+            _create_sqlite_triggers(cursor, missing)
+            _fill_sqlite_index(cursor)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            _drop_sqlite_index(cursor)
+    elif vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {PG_INDEX}")
+
+
+# -----------------------------
+# Sorgu
+# -----------------------------
+
+def search_contents(qs: QuerySet, query: str) -> QuerySet:
+    """
+    qs'i arama sorgusuyla filtreler ve `search_rank` ile işaretler.
+    search_rank küçükten büyüğe sıralandığında en alakalı sonuç önce gelir.
+    """
+    tokens = _tokens(query)
+    if not tokens:
+        # Görünümler search_rank'e göre sıraladığı için boş sonuç da işaretli döner
+        return qs.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    vendor = connection.vendor
+    if vendor == "sqlite":
+        # Her kelime ön ek olarak aranır: "dun"* -> Dune, Dünya ...
+        match = " ".join('"{}"*'.format(t.replace('"', "")) for t in tokens)
+        # FTS tablosu bir kez join edilir; rank satır başına alt sorguyla okunmaz
+        qs = qs.extra(
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = \"app_content\".\"id\"", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+        )
+        rank = RawSQL(f"{FTS_TABLE}.rank", (), output_field=FloatField())
+        return qs.annotate(search_rank=rank)
+
+    if vendor == "postgresql":
+        tsquery = " & ".join(f"{t}:*" for t in tokens)
+        qs = qs.extra(
+            where=[f"({PG_DOCUMENT}) @@ to_tsquery('simple', %s)"], params=[tsquery]
+        )
+        rank = RawSQL(
+            f"-ts_rank(({PG_DOCUMENT}), to_tsquery('simple', %s))",
+            (tsquery,),
+            output_field=FloatField(),
+        )
+        return qs.annotate(search_rank=rank)
+
+    # Diğer veritabanlarında eski davranış
+    flt = Q()
+    for token in tokens:
+        flt &= Q(title__icontains=token) | Q(original_title__icontains=token)
+    return qs.filter(flt).annotate(search_rank=RawSQL("0", (), output_field=FloatField()))
@@ -1,5 +1,10 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
+from . import outbox
+from .cache import content_cache, content_version, serializer_variant
+from .posters import VARIANTS, url_version
 from .models import PasswordResetToken
 
 from .models import (
@@ -47,37 +52,81 @@ class ProfileSerializer(serializers.ModelSerializer):
             "follow_id",
         ]
 
+    # following_total / viewer_follow_id: ProfileViewSet sorgusunda
+    # annotate_profile_version ile gelir
+
     def get_followers_count(self, obj):
-        return Follow.objects.filter(following=obj.user).count()
+        # Follow sinyalleriyle güncel tutulan kolon
+        return obj.followers_count
 
     def get_following_count(self, obj):
+        if hasattr(obj, "following_total"):
+            return obj.following_total
         return Follow.objects.filter(follower=obj.user).count()
 
     def get_is_me(self, obj):
         request = self.context.get("request")
         if not request or not request.user.is_authenticated:
             return False
-        return obj.user == request.user
+        return obj.user_id == request.user.pk
 
     def get_is_following(self, obj):
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
-            return False
-        return Follow.objects.filter(
-            follower=request.user, following=obj.user
-        ).exists()
+        return self.get_follow_id(obj) is not None
 
     def get_follow_id(self, obj):
         request = self.context.get("request")
         if not request or not request.user.is_authenticated:
             return None
+        if hasattr(obj, "viewer_follow_id"):
+            return obj.viewer_follow_id
         follow = Follow.objects.filter(
             follower=request.user, following=obj.user
         ).first()
         return follow.id if follow else None
 
 
-class ContentSerializer(serializers.ModelSerializer):
+def _csv_param(context, name):
+    request = context.get("request")
+    if request is None:
+        return set()
+    raw = request.query_params.get(name) or ""
+    return {part.strip() for part in raw.split(",") if part.strip()}
+
+
+class SparseFieldsMixin:
+    """
+    ?fields=id,title   -> kök serializer sadece istenen alanları döner
+    ?expand=content    -> `expandable_fields` içindeki iç içe alanlar
+                          kart yerine tam temsil ile döner
+    """
+    expandable_fields = {}
+
+    def _is_root(self):
+        parent = getattr(self, "parent", None)
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        expand = _csv_param(self.context, "expand")
+        for name, serializer_class in self.expandable_fields.items():
+            if name in expand and name in fields:
+                fields[name] = serializer_class(read_only=True)
+
+        if self._is_root():
+            wanted = _csv_param(self.context, "fields")
+            if wanted:
+                fields = {
+                    name: field
+                    for name, field in fields.items()
+                    if name in wanted or field.write_only
+                }
+        return fields
+
+
+class ContentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     average_rating = serializers.FloatField(read_only=True)
     rating_count = serializers.IntegerField(read_only=True)
 
@@ -104,13 +153,72 @@ class ContentSerializer(serializers.ModelSerializer):
             "rating_count",
         ]
 
+    def get_fields(self):
+        fields = super().get_fields()
+        # ?expand=posters -> poster vekilinin boyut boyut URL'leri
+        if "posters" in _csv_param(self.context, "expand") and "poster_url" in fields:
+            fields["posters"] = serializers.SerializerMethodField()
+        return fields
+
+    def get_posters(self, obj):
+        """
+        {"thumb": {"url": ..., "width": 92}, "card": ..., "detail": ...}
+        `v` poster_url değişince URL'yi değiştirir; yanıt süresiz önbelleklenebilir.
+        """
+        if not obj.poster_url:
+            return None
+        request = self.context.get("request")
+        path = reverse("content-poster", args=[obj.pk])
+        version = url_version(obj.poster_url)
+        posters = {}
+        for size, width in VARIANTS.items():
+            url = f"{path}?size={size}&v={version}"
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            posters[size] = {"url": url, "width": width}
+        return posters
+
+    def to_representation(self, instance):
+        # Aynı içerik feed, kütüphane ve listelerde defalarca serileştirilir
+        variant = getattr(self, "_cache_variant", None)
+        if variant is None:
+            variant = serializer_variant(self)
+            request = self.context.get("request")
+            if "posters" in self.fields and request is not None:
+                # Poster URL'leri mutlak; host başına ayrı kayıt
+                variant = f"{variant}@{request.get_host()}"
+            self._cache_variant = variant
+        version = content_version(instance)
+        data = content_cache.get(instance.pk, variant, version)
+        if data is None:
+            data = dict(super().to_representation(instance))
+            content_cache.set(instance.pk, variant, version, data)
+        return dict(data)
+
+
+class ContentCardSerializer(ContentSerializer):
+    """
+    Listelerde ve iç içe kullanımda hafif temsil: açıklama, oyuncular vb. yok.
+    """
+
+    class Meta(ContentSerializer.Meta):
+        fields = [
+            "id",
+            "type",
+            "title",
+            "year",
+            "poster_url",
+            "average_rating",
+            "rating_count",
+        ]
 
 
-class UserLibraryEntrySerializer(serializers.ModelSerializer):
-    content = ContentSerializer(read_only=True)
+class UserLibraryEntrySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    content = ContentCardSerializer(read_only=True)
     content_id = serializers.PrimaryKeyRelatedField(
         queryset=Content.objects.all(), source="content", write_only=True
     )
+    expandable_fields = {"content": ContentSerializer}
 
     class Meta:
         model = UserLibraryEntry
@@ -119,14 +227,18 @@ class UserLibraryEntrySerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = self.context["request"].user
         validated_data["user"] = user
-        return super().create(validated_data)
+        with transaction.atomic():
+            entry = super().create(validated_data)
+            outbox.record(user.pk, Activity.ActivityType.LIBRARY, content_id=entry.content_id)
+        return entry
 
 
-class RatingSerializer(serializers.ModelSerializer):
-    content = ContentSerializer(read_only=True)
+class RatingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    content = ContentCardSerializer(read_only=True)
     content_id = serializers.PrimaryKeyRelatedField(
         queryset=Content.objects.all(), source="content", write_only=True
     )
+    expandable_fields = {"content": ContentSerializer}
 
     class Meta:
         model = Rating
@@ -140,12 +252,27 @@ class RatingSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = self.context["request"].user
         validated_data["user"] = user
-        # aynı (user, content) için varsa update et
-        rating, _ = Rating.objects.update_or_create(
-            user=user,
-            content=validated_data["content"],
-            defaults={"score": validated_data["score"]},
-        )
+        content = validated_data["content"]
+        with transaction.atomic():
+            # Önce Content satırı kilitlenir: aynı kullanıcının eşzamanlı iki ilk
+            # puanı sıraya girer, ikisi birden previous=None görüp iki kez sayılmaz.
+            # Özet alanları Rating post_save sinyali günceller.
+            list(Content.objects.select_for_update().filter(pk=content.pk).values_list("pk"))
+            previous = (
+                Rating.objects.filter(user=user, content=content)
+                .values_list("score", flat=True)
+                .first()
+            )
+            # aynı (user, content) için varsa update et
+            rating, _ = Rating.objects.update_or_create(
+                user=user,
+                content=content,
+                defaults={"score": validated_data["score"]},
+            )
+            if previous != rating.score:
+                outbox.record(
+                    user.pk, Activity.ActivityType.RATING, content_id=content.pk, rating_id=rating.pk
+                )
         return rating
 
 
@@ -175,11 +302,12 @@ class ReviewSerializer(serializers.ModelSerializer):
 
 
 
-class ListItemSerializer(serializers.ModelSerializer):
-    content = ContentSerializer(read_only=True)
+class ListItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    content = ContentCardSerializer(read_only=True)
     content_id = serializers.PrimaryKeyRelatedField(
         queryset=Content.objects.all(), source="content", write_only=True
     )
+    expandable_fields = {"content": ContentSerializer}
 
     class Meta:
         model = ListItem
@@ -215,9 +343,10 @@ class FollowSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ActivitySerializer(serializers.ModelSerializer):
+class ActivitySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
-    content = ContentSerializer(read_only=True)
+    content = ContentCardSerializer(read_only=True)
+    expandable_fields = {"content": ContentSerializer}
 
     class Meta:
         model = Activity
@@ -0,0 +1,182 @@
+# app/services/breaker.py
+"""
+Sağlayıcı başına devre kesici (circuit breaker).
+
+Son WINDOW saniyedeki denemelerin en az MIN_REQUESTS tanesi varsa ve
+FAILURE_RATE'i aşan kısmı başarısızsa devre açılır: OPEN_SECONDS boyunca
+istekler sağlayıcıya hiç gitmeden CircuitOpen ile döner. Süre dolunca
+yarı açık duruma geçilir; en fazla HALF_OPEN_PROBES deneme geçer, hepsi
+başarılıysa devre kapanır, biri bile başarısızsa yeniden açılır.
+
+Başarısızlık: bağlantı hatası / zaman aşımı ya da 5xx. 429 kota meselesidir,
+sayılmaz.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import requests
+from django.conf import settings
+
+from .. import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULTS = {
+    "WINDOW": 30,  # saniye
+    "MIN_REQUESTS": 10,
+    "FAILURE_RATE": 0.5,
+    "OPEN_SECONDS": 30,
+    "HALF_OPEN_PROBES": 2,
+    "PROVIDERS": {},  # {"tmdb": {"OPEN_SECONDS": 60}} sağlayıcıya özel
+}
+
+
+class CircuitOpen(requests.RequestException):
+    """
+    Devre açık; istek sağlayıcıya gönderilmedi.
+    """
+
+    def __init__(self, name: str, retry_after: float):
+        self.retry_after = max(int(retry_after + 0.999), 1)
+        super().__init__(
+            f"{name} geçici olarak devre dışı; {self.retry_after} sn sonra tekrar denenecek."
+        )
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        window: float = 30,
+        min_requests: int = 10,
+        failure_rate: float = 0.5,
+        open_seconds: float = 30,
+        half_open_probes: int = 2,
+    ):
+        self.name = name
+        self.window = window
+        self.min_requests = min_requests
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self._lock = threading.Lock()
+        self._outcomes = deque()  # (monotonic zaman, başarılı mı)
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0  # yarı açıkta geçirilen deneme
+        self._probe_successes = 0
+
+        self.opened = 0  # kaç kez açıldı
+        self.rejected = 0
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self.opened += 1
+
+    def allow(self) -> None:
+        """
+        Deneme yapılabilecekse döner, yoksa CircuitOpen fırlatır.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._opened_at + self.open_seconds - now
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name, remaining)
+                self.state = HALF_OPEN
+                self._probes = 0
+                self._probe_successes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name, 1)
+                self._probes += 1
+
+    def record(self, success: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if not success:
+                    self._open(now)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self.state = CLOSED
+                return
+            if self.state == OPEN:
+                # Açılmadan önce yola çıkmış isteklerin sonucu
+                return
+
+            self._outcomes.append((now, success))
+            self._trim(now)
+            total = len(self._outcomes)
+            if total < self.min_requests:
+                return
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if failures / total >= self.failure_rate:
+                self._open(now)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            total = len(self._outcomes)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            stats = {
+                "state": self.state,
+                "window_requests": total,
+                "window_failure_rate": round(failures / total, 4) if total else None,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+            if self.state == OPEN:
+                stats["retry_after"] = round(
+                    max(self._opened_at + self.open_seconds - now, 0), 1
+                )
+            return stats
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> Optional[CircuitBreaker]:
+    """
+    Sağlayıcı başına tek devre kesici. EXTERNAL_CIRCUIT_BREAKER = None ise kapalı.
+    """
+    user_config = getattr(settings, "EXTERNAL_CIRCUIT_BREAKER", {})
+    if user_config is None:
+        return None
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            config = {**DEFAULTS, **user_config}
+            config.update(config["PROVIDERS"].get(name, {}))
+            breaker = _breakers[name] = CircuitBreaker(
+                name,
+                window=config["WINDOW"],
+                min_requests=config["MIN_REQUESTS"],
+                failure_rate=config["FAILURE_RATE"],
+                open_seconds=config["OPEN_SECONDS"],
+                half_open_probes=config["HALF_OPEN_PROBES"],
+            )
+        return breaker
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    return {name: breaker.stats() for name, breaker in sorted(_breakers.items())}
+
+
+metrics.register("external_circuit_breakers", breaker_states)
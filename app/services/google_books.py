@@ -1,17 +1,52 @@
 # app/services/google_books.py
+import os
 import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+from .http import get_client
+from .search_cache import normalize_query, not_found_cache, search_cache
 
 
 class GoogleBooksError(Exception):
     pass
 
 
-GOOGLE_BOOKS_BASE = "https://www.googleapis.com/books/v1/volumes"
+class GoogleBooksNotFound(GoogleBooksError):
+    pass
+
+
+# Yerel test/benchmark için app/fake_providers.py'ye yönlendirilebilir
+GOOGLE_BOOKS_BASE = os.getenv(
+    "GOOGLE_BOOKS_BASE", "https://www.googleapis.com/books/v1/volumes"
+)
+GOOGLE_BOOKS_PAGE_SIZE = 20  # maxResults (API en fazla 40 kabul eder)
+
+client = get_client("google_books", GOOGLE_BOOKS_BASE)
+
 
+def _get(path: str, params: Dict[str, Any] = None) -> requests.Response:
+    try:
+        return client.get(path, params=params)
+    except requests.RequestException as e:
+        raise GoogleBooksError(f"Google Books'a ulaşılamadı: {e}") from e
 
-def search_books(query: str) -> List[Dict[str, Any]]:
-    resp = requests.get(GOOGLE_BOOKS_BASE, params={"q": query}, timeout=10)
+
+def search_books_page(query: str, start: int = 0) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    startIndex=start'tan bir sayfa ve sonraki sayfanın startIndex'i (yoksa None).
+    """
+    # Google Books'ta dil kısıtı yok; anahtarda boş dil
+    key = ("google_books", normalize_query(query), "", (start, GOOGLE_BOOKS_PAGE_SIZE))
+    results, next_start = search_cache.get_or_fetch(
+        key, lambda: _search_books(query, start), is_negative=lambda value: not value[0]
+    )
+    return [dict(item) for item in results], next_start
+
+
+def _search_books(query: str, start: int = 0):
+    resp = _get(
+        "", {"q": query, "startIndex": start, "maxResults": GOOGLE_BOOKS_PAGE_SIZE}
+    )
     if resp.status_code != 200:
         raise GoogleBooksError(f"Google Books hata verdi: {resp.status_code} {resp.text}")
     data = resp.json()
@@ -31,19 +66,37 @@ def search_books(query: str) -> List[Dict[str, Any]]:
                 "description": info.get("description") or "",
             }
         )
-    return results
+    items = len(data.get("items") or [])
+    total = data.get("totalItems") or 0
+    next_start = start + items if items and start + items < total else None
+    return results, next_start
 
 
 def get_book_details(volume_id: str) -> Dict[str, Any]:
-    url = f"{GOOGLE_BOOKS_BASE}/{volume_id}"
-    resp = requests.get(url, timeout=10)
+    """
+    Olmayan id'ler NOT_FOUND_TTL boyunca hatırlanır (GoogleBooksNotFound).
+    """
+    key = ("google_books", str(volume_id))
+    if key in not_found_cache:
+        raise GoogleBooksNotFound(f"Google Books'ta bulunamadı: {volume_id}")
+    resp = _get(f"/{volume_id}")
+    if resp.status_code == 404:
+        not_found_cache.add(key)
+        raise GoogleBooksNotFound(f"Google Books'ta bulunamadı: {volume_id}")
     if resp.status_code != 200:
         raise GoogleBooksError(
             f"Google Books detay isteği hata verdi: {resp.status_code} {resp.text}"
         )
-    data = resp.json()
-    info = data.get("volumeInfo", {})
-    image_links = info.get("imageLinks", {})
+    return normalize_book(resp.json())
+
+
+def normalize_book(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Google Books volume kaydını Content alanlarına çevirir.
+    Toplu içe aktarma (ingest_catalog) da aynı dönüşümü kullanır.
+    """
+    info = data.get("volumeInfo") or {}
+    image_links = info.get("imageLinks") or {}
 
     return {
         "external_id": data["id"],
@@ -0,0 +1,214 @@
+# app/services/http.py
+"""
+Harici sağlayıcılar (TMDb, Google Books) için ortak HTTP taşıması.
+
+Her sağlayıcının kendi requests.Session'ı ve bağlantı havuzu vardır;
+bağlantılar keep-alive ile yeniden kullanılır, her istek için yeni
+TCP+TLS el sıkışması yapılmaz. 429/5xx ve bağlantı hatalarında sınırlı
+sayıda, jitter'lı üstel beklemeyle tekrar denenir. Her deneme önce
+sağlayıcının hız sınırlayıcısından (ratelimit.py) token alır ve devre
+kesiciden (breaker.py) geçer; devre açıksa hiç beklemeden CircuitOpen döner.
+
+Tek bir get() çağrısı, beklemeler dahil DEADLINE saniyeyi aşmaz: her
+denemenin zaman aşımı kalan süreyle kısılır, kalan süreye sığmayan tekrar
+deneme yapılmaz. Etkileşimli (istek içi) çağrılarda okuma zaman aşımı hiç
+tekrar denenmez; yavaş sağlayıcı kullanıcıyı READ_TIMEOUT'tan uzun bekletmez.
+"""
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from .. import metrics
+from .breaker import get_breaker
+from .ratelimit import INTERACTIVE, current_priority, get_limiter
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+DEFAULTS = {
+    "CONNECT_TIMEOUT": 3.05,
+    "READ_TIMEOUT": 10,
+    "RETRIES": 2,  # ilk denemeye ek olarak
+    "BACKOFF": 0.3,  # saniye; her denemede iki katına çıkar
+    "MAX_BACKOFF": 5,
+    "POOL_SIZE": 10,  # sağlayıcı başına açık tutulan bağlantı
+    "DEADLINE": 12,  # saniye; tek get() çağrısının tüm denemeler dahil üst sınırı
+}
+
+
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class ProviderClient:
+    """
+    Tek bir sağlayıcıya giden isteklerin taşıması. Thread'ler arasında
+    paylaşılabilir; havuz dolarsa istek boş bağlantı için bekler.
+    """
+
+    def __init__(self, name: str, base_url: str = "", **options):
+        config = {**DEFAULTS, **getattr(settings, "EXTERNAL_HTTP", {}), **options}
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (config["CONNECT_TIMEOUT"], config["READ_TIMEOUT"])
+        self.retries = config["RETRIES"]
+        self.backoff = config["BACKOFF"]
+        self.max_backoff = config["MAX_BACKOFF"]
+        self.deadline = config["DEADLINE"]
+        self.limiter = get_limiter(name)
+        self.breaker = get_breaker(name)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=config["POOL_SIZE"],
+            pool_block=True,
+            max_retries=0,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=500)
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+        self.status_counts: Dict[str, int] = {}
+
+    def _delay(self, attempt: int, resp: Optional[requests.Response] = None) -> float:
+        if resp is not None:
+            retry_after = _retry_after(resp)
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        # full jitter: [0, backoff * 2^attempt]
+        return random.uniform(0, min(self.backoff * (2 ** attempt), self.max_backoff))
+
+    def _record(self, started: float, status_code: Optional[int]) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.requests += 1
+            self._latencies.append(elapsed)
+            key = str(status_code) if status_code else "error"
+            self.status_counts[key] = self.status_counts.get(key, 0) + 1
+
+    def _health(self, success: bool) -> None:
+        if self.breaker is not None:
+            self.breaker.record(success)
+
+    def get(
+        self, path: str, params: Optional[Dict[str, Any]] = None, **request_options
+    ) -> requests.Response:
+        """
+        `path` base_url'e eklenir (tam URL de verilebilir). Son denemenin
+        cevabını döner; bağlantı hatası tekrar denemelerden sonra da
+        sürerse requests.RequestException, kota beklemesi aşılırsa
+        RateLimited, devre açıksa CircuitOpen (ikisi de RequestException)
+        fırlatır. request_options (stream, allow_redirects) session.get'e geçer.
+
+        DEADLINE dolduğunda elde son cevap varsa o döner, yoksa son hata
+        (ya da requests.Timeout) fırlatılır.
+        """
+        url = path if path.startswith(("http://", "https://")) else f"{self.base_url}{path}"
+        deadline = time.monotonic() + self.deadline
+        retry_read_timeout = current_priority() != INTERACTIVE
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                with self._lock:
+                    self.failures += 1
+                raise requests.Timeout(f"{self.name}: {self.deadline} sn içinde cevap alınamadı.")
+            if self.breaker is not None:
+                self.breaker.allow()
+            timeout = (min(self.timeout[0], remaining), min(self.timeout[1], remaining))
+            started = time.perf_counter()
+            try:
+                resp = self.session.get(url, params=params, timeout=timeout, **request_options)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                self._record(started, None)
+                self._health(False)
+                delay = self._delay(attempt)
+                if (
+                    attempt >= self.retries
+                    or (isinstance(exc, requests.ReadTimeout) and not retry_read_timeout)
+                    or time.monotonic() + delay >= deadline
+                ):
+                    with self._lock:
+                        self.failures += 1
+                    raise
+            except requests.RequestException:
+                # Geçersiz URL vb.: isteğin hatası, sağlayıcının sağlığıyla ilgisiz
+                self._health(True)
+                raise
+            else:
+                self._record(started, resp.status_code)
+                self._health(resp.status_code < 500)
+                retry = resp.status_code in RETRY_STATUSES and attempt < self.retries
+                if retry:
+                    delay = self._delay(attempt, resp)
+                    retry = time.monotonic() + delay < deadline
+                if not retry:
+                    if resp.status_code >= 400:
+                        with self._lock:
+                            self.failures += 1
+                    return resp
+                resp.close()
+
+            with self._lock:
+                self.retried += 1
+            attempt += 1
+            time.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                "requests": self.requests,
+                "retried": self.retried,
+                "failures": self.failures,
+                "status": dict(self.status_counts),
+            }
+        if latencies:
+            def pct(p):
+                return round(latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000, 1)
+
+            stats.update(p50_ms=pct(0.5), p95_ms=pct(0.95), max_ms=pct(1.0))
+        return stats
+
+
+_clients: Dict[str, ProviderClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(name: str, base_url: str = "", **options) -> ProviderClient:
+    """
+    Sağlayıcı başına tek client (ve tek bağlantı havuzu).
+    """
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None:
+            client = _clients[name] = ProviderClient(name, base_url, **options)
+        return client
+
+
+metrics.register(
+    "external_http", lambda: {name: client.stats() for name, client in sorted(_clients.items())}
+)
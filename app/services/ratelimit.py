@@ -0,0 +1,234 @@
+# app/services/ratelimit.py
+"""
+Sağlayıcı kotaları için istemci tarafı hız sınırlayıcı.
+
+Her sağlayıcı için süreç içinde tek bir token bucket vardır (tüm thread'ler
+paylaşır). SHARED açıksa ek olarak cache üzerinde saniyelik sayaçla tüm
+worker'ların toplamı da sınırlanır.
+
+Öncelik: etkileşimli istekler (kullanıcı araması) varsayılandır. Arka plan
+işleri (`with background():`) bucket'ın RESERVE kadarını etkileşimli
+isteklere bırakır, etkileşimli bekleyen varken token almaz ve daha uzun
+bekleyebilir. Bekleme süresi aşılırsa RateLimited fırlatılır; istek
+sağlayıcıya hiç gitmez. İstek içinde çalışan kod (toplu içe aktarma dahil)
+background() kullanmaz; kullanıcı en fazla INTERACTIVE_MAX_WAIT bekler.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+import requests
+from django.conf import settings
+from django.core.cache import caches
+
+from .. import metrics
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+_priority = contextvars.ContextVar("provider_priority", default=INTERACTIVE)
+
+DEFAULTS = {
+    "SHARED": False,  # cache backend üzerinden worker'lar arası sınır
+    "CACHE_ALIAS": "default",
+    "INTERACTIVE_MAX_WAIT": 2.0,  # saniye
+    "BACKGROUND_MAX_WAIT": 60.0,
+    "BACKGROUND_RESERVE": 0.25,  # bucket'ın bu oranı etkileşimli isteklere ayrılır
+    "PROVIDERS": {},  # {"tmdb": {"RATE": 40, "BURST": 40}}  RATE: saniyede istek
+}
+
+
+class RateLimited(requests.RequestException):
+    """
+    Kota aşılmasın diye istek gönderilmedi. `retry_after`: yeni token için
+    tahmini bekleme (saniye, en az 1).
+    """
+
+    def __init__(self, name: str, retry_after: float):
+        self.retry_after = max(int(retry_after + 0.999), 1)
+        super().__init__(f"{name} kotası dolu, istek gönderilmedi.")
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@contextmanager
+def background():
+    """
+    Bu blok içindeki sağlayıcı çağrıları arka plan önceliğiyle yapılır.
+    """
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def run_in_background(fn, *args, **kwargs):
+    # Thread havuzları contextvar taşımaz; arka plan işleri için sarmalayıcı
+    with background():
+        return fn(*args, **kwargs)
+
+
+class ProviderLimiter:
+    def __init__(self, name: str, rate: float, burst: float, config: Dict[str, Any]):
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self.reserve = self.capacity * config["BACKGROUND_RESERVE"]
+        self.max_wait = {
+            INTERACTIVE: config["INTERACTIVE_MAX_WAIT"],
+            BACKGROUND: config["BACKGROUND_MAX_WAIT"],
+        }
+        self.shared = config["SHARED"]
+        self.cache_alias = config["CACHE_ALIAS"]
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._interactive_waiting = 0
+
+        self.acquired = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.waited = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.wait_seconds = {INTERACTIVE: 0.0, BACKGROUND: 0.0}
+        self.max_wait_seen = {INTERACTIVE: 0.0, BACKGROUND: 0.0}
+        self.rejected = {INTERACTIVE: 0, BACKGROUND: 0}
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _take_local(self, priority: str, deadline: float) -> bool:
+        with self._cond:
+            interactive = priority == INTERACTIVE
+            if interactive:
+                self._interactive_waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    floor = 0.0 if interactive else self.reserve
+                    blocked = not interactive and self._interactive_waiting > 0
+                    if not blocked and self._tokens >= floor + 1:
+                        self._tokens -= 1
+                        return True
+                    need = max((floor + 1 - self._tokens) / self.rate, 0.001)
+                    if blocked:
+                        need = min(need, 1.0 / self.rate)
+                    remaining = deadline - now
+                    if remaining <= 0 or need > remaining:
+                        return False
+                    self._cond.wait(need)
+            finally:
+                if interactive:
+                    self._interactive_waiting -= 1
+                    self._cond.notify_all()
+
+    def _take_shared(self, deadline: float) -> bool:
+        """
+        Saniyelik pencere sayacı: pencere başına en fazla RATE istek (tüm worker'lar).
+        """
+        cache = caches[self.cache_alias]
+        limit = max(int(self.rate), 1)
+        while True:
+            now = time.time()
+            key = f"ratelimit:{self.name}:{int(now)}"
+            cache.add(key, 0, timeout=5)
+            try:
+                count = cache.incr(key)
+            except ValueError:
+                # Anahtar arada düştüyse yeni pencere sayılır
+                cache.add(key, 1, timeout=5)
+                count = 1
+            if count <= limit:
+                return True
+            wait = int(now) + 1 - now
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def acquire(self, priority: Optional[str] = None) -> float:
+        """
+        Token alana kadar bekler, beklenen süreyi döner; süre aşılırsa RateLimited.
+        """
+        priority = priority or current_priority()
+        started = time.monotonic()
+        deadline = started + self.max_wait[priority]
+
+        ok = self._take_local(priority, deadline)
+        if ok and self.shared:
+            ok = self._take_shared(deadline)
+        waited = time.monotonic() - started
+
+        with self._cond:
+            if not ok:
+                self.rejected[priority] += 1
+                self._refill(time.monotonic())
+                retry_after = max((1 - self._tokens) / self.rate, 1.0 if self.shared else 0.0)
+            else:
+                self.acquired[priority] += 1
+                if waited > 0.001:
+                    self.waited[priority] += 1
+                    self.wait_seconds[priority] += waited
+                    self.max_wait_seen[priority] = max(self.max_wait_seen[priority], waited)
+        if not ok:
+            raise RateLimited(self.name, retry_after)
+        return waited
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            self._refill(time.monotonic())
+            return {
+                "rate": self.rate,
+                "tokens": round(self._tokens, 2),
+                **{
+                    priority: {
+                        "acquired": self.acquired[priority],
+                        "waited": self.waited[priority],
+                        "avg_wait_ms": round(
+                            self.wait_seconds[priority] / self.waited[priority] * 1000, 1
+                        )
+                        if self.waited[priority]
+                        else 0.0,
+                        "max_wait_ms": round(self.max_wait_seen[priority] * 1000, 1),
+                        "rejected": self.rejected[priority],
+                    }
+                    for priority in (INTERACTIVE, BACKGROUND)
+                },
+            }
+
+
+_limiters: Dict[str, Optional[ProviderLimiter]] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str) -> Optional[ProviderLimiter]:
+    """
+    Ayarlarda tanımlı değilse None (sınırsız).
+    """
+    with _limiters_lock:
+        if name not in _limiters:
+            config = {**DEFAULTS, **getattr(settings, "EXTERNAL_RATE_LIMITS", {})}
+            provider = config["PROVIDERS"].get(name)
+            _limiters[name] = (
+                ProviderLimiter(
+                    name,
+                    rate=provider["RATE"],
+                    burst=provider.get("BURST", provider["RATE"]),
+                    config=config,
+                )
+                if provider
+                else None
+            )
+        return _limiters[name]
+
+
+metrics.register(
+    "external_rate_limits",
+    lambda: {
+        name: limiter.stats() for name, limiter in sorted(_limiters.items()) if limiter
+    },
+)
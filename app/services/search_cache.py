@@ -0,0 +1,216 @@
+# app/services/search_cache.py
+"""
+Harici arama sonuçları için süreç içi TTL + LRU önbellek.
+
+- Anahtar: (sağlayıcı, normalize sorgu, dil, sayfa)
+- TTL dolana kadar taze; sonrasında STALE_TTL boyunca eski değer dönülür
+  ve arka planda yenilenir (stale-while-revalidate).
+- Aynı anahtar için eşzamanlı istekler tek upstream çağrısını paylaşır
+  (single-flight); hatalar önbelleğe yazılmaz.
+- Boş sonuçlar (negatif kayıtlar) yalnız NEGATIVE_TTL boyunca tutulur,
+  bayat olarak sunulmaz.
+
+NotFoundCache: detay isteğinde 404 dönen id'ler kısa süre hatırlanır,
+aynı id için sağlayıcıya tekrar gidilmez.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from django.conf import settings
+
+from .. import metrics
+from .ratelimit import run_in_background
+
+DEFAULTS = {
+    "TTL": 300,
+    "STALE_TTL": 3600,
+    "NEGATIVE_TTL": 60,
+    "NOT_FOUND_TTL": 300,
+    "MAX_ENTRIES": 2000,
+    "REFRESH_WORKERS": 2,
+}
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(str(query).split()).casefold()
+
+
+class SearchCache:
+    def __init__(
+        self, ttl=300, stale_ttl=3600, max_entries=2000, refresh_workers=2, negative_ttl=60
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        # key -> (yazılma zamanı, değer, negatif mi)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, bool]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=refresh_workers, thread_name_prefix="search-cache"
+        )
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.negative_hits = 0
+
+    def _store(self, key, value, negative=False):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value, negative)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _run(self, key, fetch: Callable[[], Any], future: Future, is_negative=None):
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                self.errors += 1
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            return
+        self._store(key, value, negative=bool(is_negative and is_negative(value)))
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def _flight(self, key):
+        """
+        (future, sahibi_mi). Kilit altında çağrılır.
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            return future, False
+        future = self._inflight[key] = Future()
+        return future, True
+
+    def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Any],
+        is_negative: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        `is_negative(değer)` doğruysa değer negatif kayıt olarak (kısa TTL) tutulur.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value, negative = entry
+                age = now - stored_at
+                if age < (self.negative_ttl if negative else self.ttl):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    if negative:
+                        self.negative_hits += 1
+                    return value
+                if not negative and age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    future, owner = self._flight(key)
+                    if owner:
+                        self.refreshes += 1
+                        # Yenileme kullanıcıyı beklettirmez: arka plan önceliği
+                        self._executor.submit(
+                            run_in_background, self._run, key, fetch, future, is_negative
+                        )
+                    return value
+                del self._entries[key]
+
+            future, owner = self._flight(key)
+            if owner:
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if owner:
+            self._run(key, fetch, future, is_negative)
+        return future.result()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            served = self.hits + self.stale_hits + self.coalesced
+            total = served + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "refreshes": self.refreshes,
+                "errors": self.errors,
+                "negative_hits": self.negative_hits,
+                "hit_rate": round(served / total, 4) if total else None,
+            }
+
+
+def from_settings() -> SearchCache:
+    config = {**DEFAULTS, **getattr(settings, "EXTERNAL_SEARCH_CACHE", {})}
+    return SearchCache(
+        ttl=config["TTL"],
+        stale_ttl=config["STALE_TTL"],
+        max_entries=config["MAX_ENTRIES"],
+        refresh_workers=config["REFRESH_WORKERS"],
+        negative_ttl=config["NEGATIVE_TTL"],
+    )
+
+
+class NotFoundCache:
+    """
+    Bulunamayan (404) kayıtların anahtarları; TTL dolunca unutulur.
+    """
+
+    def __init__(self, ttl=300, max_entries=5000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._expires: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            expires = self._expires.get(key)
+            if expires is None:
+                return False
+            if expires <= time.monotonic():
+                del self._expires[key]
+                return False
+            self.hits += 1
+            return True
+
+    def add(self, key: Hashable) -> None:
+        with self._lock:
+            self._expires[key] = time.monotonic() + self.ttl
+            self._expires.move_to_end(key)
+            while len(self._expires) > self.max_entries:
+                self._expires.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._expires.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._expires), "hits": self.hits}
+
+
+search_cache = from_settings()
+not_found_cache = NotFoundCache(
+    ttl={**DEFAULTS, **getattr(settings, "EXTERNAL_SEARCH_CACHE", {})}["NOT_FOUND_TTL"]
+)
+metrics.register("external_search_cache", search_cache.stats)
+metrics.register("external_not_found_cache", not_found_cache.stats)
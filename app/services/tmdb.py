@@ -1,32 +1,59 @@
 # app/services/tmdb.py
 import os
 import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+from .http import get_client
+from .search_cache import normalize_query, not_found_cache, search_cache
 
 TMDB_API_KEY = os.getenv("TMDB_API_KEY")  # .env'den okuyabilirsin
-TMDB_BASE_URL = "https://api.themoviedb.org/3"
+# Yerel test/benchmark için app/fake_providers.py'ye yönlendirilebilir
+TMDB_BASE_URL = os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
+TMDB_LANGUAGE = os.getenv("TMDB_LANGUAGE", "tr-TR")
+TMDB_MAX_PAGE = 500  # TMDb arama sonuçlarında erişilebilen son sayfa
+
+client = get_client("tmdb", TMDB_BASE_URL)
 
 
 class TMDBError(Exception):
     pass
 
 
+class TMDBNotFound(TMDBError):
+    pass
+
+
 def _get(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
     if not TMDB_API_KEY:
         raise TMDBError("TMDB_API_KEY ayarlı değil.")
-    url = f"{TMDB_BASE_URL}{path}"
-    query = {"api_key": TMDB_API_KEY, "language": "tr-TR", **params}
-    resp = requests.get(url, params=query, timeout=10)
+    query = {"api_key": TMDB_API_KEY, "language": TMDB_LANGUAGE, **params}
+    try:
+        resp = client.get(path, params=query)
+    except requests.RequestException as e:
+        raise TMDBError(f"TMDb'ye ulaşılamadı: {e}") from e
+    if resp.status_code == 404:
+        raise TMDBNotFound(f"TMDb'de bulunamadı: {path}")
     if resp.status_code != 200:
         raise TMDBError(f"TMDb isteği hata verdi: {resp.status_code} {resp.text}")
     return resp.json()
 
 
-def search_movies(query: str) -> List[Dict[str, Any]]:
+def search_movies_page(query: str, page: int = 1) -> Tuple[List[Dict[str, Any]], Optional[int]]:
     """
-    TMDb'de film arar, basit bir sonuç listesi döner.
+    Tek bir TMDb sonuç sayfası ve sonraki sayfa numarası (yoksa None).
+    Sayfalar search_cache üzerinden önbelleklenir.
     """
-    data = _get("/search/movie", {"query": query})
+    key = ("tmdb", normalize_query(query), TMDB_LANGUAGE, page)
+    results, next_page = search_cache.get_or_fetch(
+        key, lambda: _search_movies(query, page), is_negative=lambda value: not value[0]
+    )
+    return [dict(item) for item in results], next_page
+
+
+def _search_movies(query: str, page: int = 1):
+    data = _get("/search/movie", {"query": query, "page": page})
+    total_pages = min(data.get("total_pages") or 0, TMDB_MAX_PAGE)
+    next_page = page + 1 if page < total_pages else None
     results = []
     for item in data.get("results", []):
         results.append(
@@ -41,15 +68,31 @@ def search_movies(query: str) -> List[Dict[str, Any]]:
                 "description": item.get("overview") or "",
             }
         )
-    return results
+    return results, next_page
 
 
 def get_movie_details(tmdb_id: int) -> Dict[str, Any]:
     """
     Bir filmi tüm detaylarıyla çeker: yönetmen, oyuncular, türler, süre vb.
+    Olmayan id'ler NOT_FOUND_TTL boyunca hatırlanır (TMDBNotFound).
+    """
+    key = ("tmdb", str(tmdb_id))
+    if key in not_found_cache:
+        raise TMDBNotFound(f"TMDb'de bulunamadı: /movie/{tmdb_id}")
+    try:
+        detail = _get(f"/movie/{tmdb_id}", {"append_to_response": "credits"})
+    except TMDBNotFound:
+        not_found_cache.add(key)
+        raise
+    return normalize_movie(detail)
+
+
+def normalize_movie(detail: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    TMDb film detayını (credits ekli ya da değil) Content alanlarına çevirir.
+    Toplu içe aktarma (ingest_catalog) da aynı dönüşümü kullanır.
     """
-    detail = _get(f"/movie/{tmdb_id}", {"append_to_response": "credits"})
-    credits = detail.get("credits", {})
+    credits = detail.get("credits") or {}
     crew = credits.get("crew", [])
     cast = credits.get("cast", [])
 
@@ -0,0 +1,128 @@
+# app/services/unified_search.py
+"""
+TMDb ve Google Books'ta eşzamanlı arama.
+
+Sağlayıcılar sınırlı bir thread havuzunda paralel çağrılır; toplam süre
+en yavaş sağlayıcı kadardır (en fazla `timeout`). Süresi dolan ya da
+hata veren sağlayıcının sonuçları atlanır, hatası `errors` içinde döner.
+
+Sayfalama: her sağlayıcının konumu (TMDb sayfası, Google Books startIndex)
+opak bir cursor içinde taşınır; sonraki sayfa ancak istemci isteyince çekilir.
+"""
+import base64
+import json
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+
+from .google_books import GoogleBooksError, search_books_page
+from .tmdb import TMDB_MAX_PAGE, TMDBError, search_movies_page
+
+# type -> (source, sayfa fonksiyonu, ilk konum)
+PROVIDERS: Dict[str, tuple] = {
+    "movie": ("tmdb", search_movies_page, 1),
+    "book": ("google_books", search_books_page, 0),
+}
+
+# type -> cursor'da kabul edilen son konum (None: sınırsız)
+LAST_POSITION: Dict[str, Optional[int]] = {
+    "movie": TMDB_MAX_PAGE,
+    "book": None,
+}
+
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "EXTERNAL_SEARCH_WORKERS", 8),
+    thread_name_prefix="external-search",
+)
+
+
+def _unify(content_type: str, source: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": content_type,
+        "source": source,
+        "external_id": str(item["external_id"]),
+        "title": item.get("title"),
+        "original_title": item.get("original_title"),
+        "year": item.get("year"),
+        "poster_url": item.get("poster_url"),
+        "description": item.get("description") or "",
+    }
+
+
+def encode_cursor(positions: Dict[str, int]) -> Optional[str]:
+    if not positions:
+        return None
+    raw = json.dumps(positions, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _valid_position(content_type: str, position) -> bool:
+    if content_type not in PROVIDERS:
+        return False
+    if not isinstance(position, int) or isinstance(position, bool):
+        return False
+    last = LAST_POSITION.get(content_type)
+    return position >= PROVIDERS[content_type][2] and (last is None or position <= last)
+
+
+def decode_cursor(cursor: str) -> Dict[str, int]:
+    """
+    Geçersiz cursor için ValueError. Konumlar sağlayıcıya göre denetlenir:
+    TMDb sayfası 1..TMDB_MAX_PAGE, Google Books startIndex >= 0.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        positions = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Geçersiz cursor.") from e
+    if not isinstance(positions, dict) or not all(
+        _valid_position(t, p) for t, p in positions.items()
+    ):
+        raise ValueError("Geçersiz cursor.")
+    return positions
+
+
+def search_all(
+    query: str,
+    types: Iterable[str],
+    positions: Optional[Dict[str, int]] = None,
+    timeout: float = None,
+) -> Dict[str, Any]:
+    """
+    {"results": [...], "errors": {"book": "..."}, "next": {"movie": 2, ...}}
+    `positions` verilirse (cursor) yalnız oradaki sağlayıcıların o sayfası
+    çekilir. Sonuçlar `types` sırasıyla, her sağlayıcının kendi sıralamasında döner.
+    Hata veren sağlayıcı aynı konumla `next`'te kalır, istemci tekrar deneyebilir.
+    """
+    if timeout is None:
+        timeout = getattr(settings, "EXTERNAL_SEARCH_TIMEOUT", 6)
+    types = [t for t in dict.fromkeys(types) if t in PROVIDERS]
+    if positions is not None:
+        types = [t for t in types if t in positions]
+    positions = {t: (positions or {}).get(t, PROVIDERS[t][2]) for t in types}
+
+    futures = {}
+    for content_type in types:
+        fetch_page = PROVIDERS[content_type][1]
+        futures[content_type] = _executor.submit(fetch_page, query, positions[content_type])
+    wait(futures.values(), timeout=timeout)
+
+    results, errors, next_positions = [], {}, {}
+    for content_type, future in futures.items():
+        source = PROVIDERS[content_type][0]
+        if not future.done():
+            # Arka planda bitince search_cache'e yazılır; sonraki istek faydalanır
+            errors[content_type] = "Sağlayıcı zamanında cevap vermedi."
+            next_positions[content_type] = positions[content_type]
+            continue
+        try:
+            items, next_position = future.result()
+        except (TMDBError, GoogleBooksError) as e:
+            errors[content_type] = str(e)
+            next_positions[content_type] = positions[content_type]
+            continue
+        results.extend(_unify(content_type, source, item) for item in items)
+        if next_position is not None:
+            next_positions[content_type] = next_position
+    return {"results": results, "errors": errors, "next": next_positions}
@@ -0,0 +1,132 @@
+from django.db import connections, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import content_cache
+from .catalog import RELATION_FIELDS, sync_content_relations
+from .indexes import facet_index, title_index
+from .models import Activity, Content, Follow, Profile, Rating
+from .search import sync_search_index
+from . import timeline
+
+
+# Puan özetleri model kaydıyla güncellenir (API, admin, shell); QuerySet.update()
+# sinyal üretmez, onunla yapılan toplu düzeltmelerden sonra
+# rebuild_rating_aggregates çalıştırılmalıdır.
+
+@receiver(pre_save, sender=Rating)
+def rating_saving(sender, instance, **kwargs):
+    instance._stored = (
+        Rating.objects.filter(pk=instance.pk).values_list("content_id", "score").first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=Rating)
+def rating_saved(sender, instance, **kwargs):
+    content_id, score = getattr(instance, "_stored", None) or (None, None)
+    if content_id not in (None, instance.content_id):
+        # Puan başka içeriğe taşındı
+        Content.apply_rating_change(content_id, old_score=score)
+        score = None
+    if score == instance.score:
+        return
+    updated = Content.apply_rating_change(
+        instance.content_id, old_score=score, new_score=instance.score
+    )
+    if updated is not None:
+        instance.content = updated
+
+
+@receiver(post_delete, sender=Rating)
+def rating_deleted(sender, instance, **kwargs):
+    Content.apply_rating_change(instance.content_id, old_score=instance.score)
+
+
+@receiver(post_save, sender=Content)
+@receiver(post_delete, sender=Content)
+def content_changed(sender, instance, **kwargs):
+    content_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Content)
+def content_relations_saved(sender, instance, update_fields=None, **kwargs):
+    # Admin / ORM yazımları da ?genre= ve kişi filtrelerine yansısın (facet index
+    # türleri bu tablodan okur, o yüzden index alıcısından önce bağlıdır);
+    # bulk_create kullananlar (içe aktarma, ingest) kendileri çağırır.
+    if update_fields and not set(update_fields) & set(RELATION_FIELDS):
+        return
+    sync_content_relations([instance])
+
+
+@receiver(post_save, sender=Content)
+def content_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Puan özeti gibi index dışı alanlara yapılan yazımlar index'lere dokunmaz
+    changed = set(update_fields) if update_fields else None
+    for index in (title_index, facet_index):
+        if changed is None or changed & set(index.fields):
+            index.content_saved(instance, created)
+
+
+@receiver(post_delete, sender=Content)
+def content_deleted(sender, instance, **kwargs):
+    title_index.content_deleted(instance)
+    facet_index.content_deleted(instance)
+
+
+@receiver(post_save, sender=Rating)
+@receiver(post_delete, sender=Rating)
+def rating_changed(sender, instance, **kwargs):
+    content_cache.invalidate(instance.content_id)
+
+
+@receiver(post_save, sender=Activity)
+def activity_created(sender, instance, created, **kwargs):
+    if created:
+        timeline.fan_out(instance)
+
+
+@receiver(post_save, sender=Profile)
+def profile_created(sender, instance, created, **kwargs):
+    # Profili olmayan kullanıcının takipçileri sayılmamıştı; profil açılınca sayılır
+    if created:
+        count = Follow.objects.filter(following_id=instance.user_id).count()
+        if count:
+            Profile.objects.filter(pk=instance.pk).update(followers_count=count)
+            instance.followers_count = count
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, **kwargs):
+    if created:
+        Profile.objects.filter(user_id=instance.following_id).update(
+            followers_count=F("followers_count") + 1
+        )
+        timeline.backfill(instance.follower_id, instance.following_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    with transaction.atomic():
+        # Kilitli okuma: eşiği hangi silmenin geçtiği eşzamanlı silmelerde de kesin
+        count = (
+            Profile.objects.select_for_update()
+            .filter(user_id=instance.following_id)
+            .values_list("followers_count", flat=True)
+            .first()
+        )
+        if count:
+            Profile.objects.filter(user_id=instance.following_id).update(
+                followers_count=F("followers_count") - 1
+            )
+    timeline.purge(instance.follower_id, instance.following_id)
+    if count == timeline.config()["FANOUT_THRESHOLD"]:
+        # Eşiğin altına indi: takipçiler artık okurken birleştirmez
+        timeline.fanout_lowered(instance.following_id)
+
+
+def search_index_after_migrate(sender, using, **kwargs):
+    # apps.AppConfig.ready içinde post_migrate'e bağlanır
+    sync_search_index(connections[using])
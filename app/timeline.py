@@ -0,0 +1,442 @@
+# app/timeline.py
+"""
+Ana sayfa akışı: yazma anında dağıtım (fan-out on write), yüksek
+takipçili yazarlar için okuma anında birleştirme (hibrit).
+
+Activity oluşunca yazarın ve her takipçisinin TimelineEntry tablosuna
+birer satır eklenir; akış okuması `owner` üzerinde tek aralık taramasıdır.
+- Takip başlayınca takip edilenin son BACKFILL aktivitesi eklenir,
+  takipten çıkınca onun satırları silinir.
+- Her akış en fazla MAX_LENGTH satır tutar. Budama her yazımda değil:
+  bir akış, kendisine yazılan satırların ortalama TRIM_EVERY'de birinde
+  budanır ((owner, activity) özetiyle seçilir; hangi yazarların
+  aktivitelerini aldığından bağımsız). `manage.py rebuild_timelines
+  --trim-only` sınırı aşan tüm akışları budar, `rebuild_timelines`
+  akışları baştan kurar.
+- FANOUT_THRESHOLD ve üzeri takipçisi olan yazarın aktiviteleri yalnız
+  kendi akışına yazılır. Okuyan, takip ettiği bu yazarların son
+  aktivitelerini (yazar başına önbellekte RECENT_LENGTH kayıt) kendi
+  akışıyla (created_at, activity_id) sırasında k-yollu birleştirir.
+  Takipçi sayısı eşiğin altına inince okuyanlar o yazarı birleştirmeyi
+  bırakır; eşik üstündeyken dağıtılmamış son RECENT_LENGTH aktivitesi
+  takipçilerin akışlarına commit sonrası arka planda yazılır
+  (fanout_lowered). FANOUT_THRESHOLD ayarı yükseltilirse aynı iş için
+  `rebuild_timelines` çalıştırılmalıdır.
+"""
+import base64
+import heapq
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.db.models import Count, Q
+
+from . import metrics
+from .models import Activity, Follow, Profile, TimelineEntry
+
+DEFAULTS = {
+    "MAX_LENGTH": 800,  # kullanıcı başına tutulan satır
+    "BACKFILL": 50,  # yeni takipte eklenen geçmiş aktivite
+    "TRIM_EVERY": 50,
+    "BATCH_SIZE": 1000,
+    "FANOUT_THRESHOLD": 10000,  # bu kadar takipçisi olanın aktiviteleri dağıtılmaz
+    "RECENT_LENGTH": 200,  # yüksek takipçili yazar başına önbellekteki son aktivite
+    "RECENT_TTL": 300,
+    "CACHE_ALIAS": "default",
+    "BACKFILL_ASYNC": True,  # eşiğin altına inen yazarın dağıtımı ayrı thread'de
+}
+
+# Akış sırası: (created_at, activity_id), büyükten küçüğe
+FeedKey = Tuple[datetime, int]
+
+_lock = threading.Lock()
+_counters = {
+    "fanned_out": 0,
+    "entries_written": 0,
+    "fanout_skipped": 0,  # yüksek takipçili yazar: takipçilere yazılmadı
+    "backfilled": 0,
+    "purged": 0,
+    "trimmed": 0,
+    "reads": 0,
+    "merged_authors": 0,  # okumalarda birleştirilen yazar toplamı
+    "recent_hits": 0,
+    "recent_misses": 0,
+    "recent_fallbacks": 0,  # önbellek sayfaya yetmedi, veritabanından okundu
+}
+_read_latencies = deque(maxlen=500)  # (süre, birleştirilen yazar sayısı)
+
+
+def _count(**amounts) -> None:
+    with _lock:
+        for name, amount in amounts.items():
+            _counters[name] += amount
+
+
+def config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, "TIMELINE", {})}
+
+
+def follower_ids(user_id: int):
+    return Follow.objects.filter(following_id=user_id).values_list("follower_id", flat=True)
+
+
+def is_high_fanout(user_id: int) -> bool:
+    return Profile.objects.filter(
+        user_id=user_id, followers_count__gte=config()["FANOUT_THRESHOLD"]
+    ).exists()
+
+
+def high_fanout_following(owner_id: int) -> List[int]:
+    """
+    Okuyanın takip ettiği, akışa okuma anında katılan yazarlar.
+    """
+    return list(
+        Follow.objects.filter(
+            follower_id=owner_id,
+            following__profile__followers_count__gte=config()["FANOUT_THRESHOLD"],
+        ).values_list("following_id", flat=True)
+    )
+
+
+def fan_out(activity: Activity, owner_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Aktiviteyi yazarın ve takipçilerinin akışına ekler; yazılan satır sayısı.
+    """
+    conf = config()
+    if owner_ids is None:
+        if is_high_fanout(activity.user_id):
+            # Takipçiler okurken birleştirir; yalnız yazarın kendi akışı
+            owner_ids = [activity.user_id]
+            _recent_cache().delete(_recent_key(activity.user_id))
+            _count(fanout_skipped=1)
+        else:
+            owner_ids = [activity.user_id, *follower_ids(activity.user_id)]
+    entries = [
+        TimelineEntry(
+            owner_id=owner_id,
+            activity_id=activity.pk,
+            author_id=activity.user_id,
+            created_at=activity.created_at,
+        )
+        for owner_id in owner_ids
+    ]
+    TimelineEntry.objects.bulk_create(
+        entries, batch_size=conf["BATCH_SIZE"], ignore_conflicts=True
+    )
+    _count(fanned_out=1, entries_written=len(entries))
+    trim(
+        e.owner_id for e in entries if _trim_due(e.owner_id, activity.pk, conf["TRIM_EVERY"])
+    )
+    return len(entries)
+
+
+def _trim_due(owner_id: int, activity_id: int, every: int) -> bool:
+    # Akış başına, kendi yazımlarının ~1/every'sinde; id'lerin dizilişinden bağımsız
+    return zlib.crc32(f"{owner_id}:{activity_id}".encode()) % every == 0
+
+
+def backfill(owner_id: int, author_id: int) -> int:
+    """
+    Yeni takip: takip edilenin son aktiviteleri takipçinin akışına.
+    Yüksek takipçili yazarlar zaten okurken birleştirilir.
+    """
+    if is_high_fanout(author_id):
+        return 0
+    recent = (
+        Activity.objects.filter(user_id=author_id)
+        .order_by("-created_at", "-id")
+        .values_list("id", "created_at")[: config()["BACKFILL"]]
+    )
+    entries = [
+        TimelineEntry(
+            owner_id=owner_id, activity_id=activity_id, author_id=author_id, created_at=created_at
+        )
+        for activity_id, created_at in recent
+    ]
+    TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+    _count(backfilled=len(entries))
+    return len(entries)
+
+
+def backfill_followers(author_id: int) -> int:
+    """
+    Yazarın son RECENT_LENGTH aktivitesini tüm takipçilerinin akışına ekler
+    (olanlar atlanır); eşik üstündeyken yazılmamış satırları tamamlar.
+    """
+    conf = config()
+    recent = list(
+        Activity.objects.filter(user_id=author_id)
+        .order_by("-created_at", "-id")
+        .values_list("id", "created_at")[: conf["RECENT_LENGTH"]]
+    )
+    if not recent:
+        return 0
+    written = 0
+    batch = []
+    for follower_id in follower_ids(author_id).iterator():
+        batch.extend(
+            TimelineEntry(
+                owner_id=follower_id,
+                activity_id=activity_id,
+                author_id=author_id,
+                created_at=created_at,
+            )
+            for activity_id, created_at in recent
+        )
+        if len(batch) >= conf["BATCH_SIZE"]:
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            written += len(batch)
+            batch = []
+    if batch:
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        written += len(batch)
+    _count(backfilled=written)
+    return written
+
+
+def _backfill_followers_in_thread(author_id: int) -> None:
+    try:
+        backfill_followers(author_id)
+    finally:
+        connection.close()
+
+
+def fanout_lowered(author_id: int) -> None:
+    """
+    Yazarın takipçi sayısı FANOUT_THRESHOLD'un altına indi: okuyanlar artık
+    onu birleştirmez, eksik satırlar commit sonrası akışlara yazılır.
+    """
+    if config()["BACKFILL_ASYNC"]:
+        transaction.on_commit(
+            lambda: threading.Thread(
+                target=_backfill_followers_in_thread,
+                args=(author_id,),
+                name="timeline-backfill",
+                daemon=True,
+            ).start()
+        )
+    else:
+        transaction.on_commit(lambda: backfill_followers(author_id))
+
+
+def purge(owner_id: int, author_id: int) -> int:
+    """
+    Takipten çıkış: takip edilenin satırları akıştan silinir.
+    """
+    deleted, _ = TimelineEntry.objects.filter(owner_id=owner_id, author_id=author_id).delete()
+    _count(purged=deleted)
+    return deleted
+
+
+def trim(owner_ids: Iterable[int]) -> int:
+    """
+    Her akışta en yeni MAX_LENGTH satır kalır.
+    """
+    max_length = config()["MAX_LENGTH"]
+    deleted = 0
+    for owner_id in owner_ids:
+        cutoff = (
+            TimelineEntry.objects.filter(owner_id=owner_id)
+            .order_by("-created_at", "-activity_id")
+            .values("created_at", "activity_id")[max_length:max_length + 1]
+            .first()
+        )
+        if cutoff is None:
+            continue
+        count, _ = (
+            TimelineEntry.objects.filter(owner_id=owner_id)
+            .filter(
+                Q(created_at__lt=cutoff["created_at"])
+                | Q(created_at=cutoff["created_at"], activity_id__lte=cutoff["activity_id"])
+            )
+            .delete()
+        )
+        deleted += count
+    _count(trimmed=deleted)
+    return deleted
+
+
+def trim_all() -> int:
+    """
+    MAX_LENGTH'i aşan bütün akışları budar (periyodik temizlik).
+    """
+    over = (
+        TimelineEntry.objects.values("owner_id")
+        .annotate(n=Count("id"))
+        .filter(n__gt=config()["MAX_LENGTH"])
+        .values_list("owner_id", flat=True)
+    )
+    return trim(list(over))
+
+
+def rebuild(owner_id: int) -> int:
+    """
+    Bir akışı eski fan-in sorgusuyla baştan kurar (ilk kurulum / onarım).
+    Yüksek takipçili yazarlar dahil edilmez, okurken birleştirilirler.
+    """
+    conf = config()
+    following = (
+        Follow.objects.filter(follower_id=owner_id)
+        .exclude(following__profile__followers_count__gte=conf["FANOUT_THRESHOLD"])
+        .values_list("following_id", flat=True)
+    )
+    recent = (
+        Activity.objects.filter(Q(user_id=owner_id) | Q(user_id__in=following))
+        .order_by("-created_at", "-id")
+        .values_list("id", "user_id", "created_at")[: conf["MAX_LENGTH"]]
+    )
+    entries = [
+        TimelineEntry(
+            owner_id=owner_id, activity_id=activity_id, author_id=author_id, created_at=created_at
+        )
+        for activity_id, author_id, created_at in recent
+    ]
+    with transaction.atomic():
+        TimelineEntry.objects.filter(owner_id=owner_id).delete()
+        TimelineEntry.objects.bulk_create(entries, batch_size=conf["BATCH_SIZE"])
+    return len(entries)
+
+
+# --- okuma ---------------------------------------------------------------
+
+
+def encode_cursor(key: FeedKey) -> str:
+    raw = f"{key[0].isoformat()}|{key[1]}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> FeedKey:
+    """
+    Geçersiz cursor için ValueError.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, activity_id = raw.split("|")
+        key = (datetime.fromisoformat(created_at), int(activity_id))
+    except (ValueError, TypeError, UnicodeDecodeError) as e:
+        raise ValueError("Geçersiz cursor.") from e
+    if key[0].tzinfo is None and settings.USE_TZ:
+        raise ValueError("Geçersiz cursor.")
+    return key
+
+
+def _recent_cache():
+    return caches[config()["CACHE_ALIAS"]]
+
+
+def _recent_key(author_id: int) -> str:
+    return f"timeline:recent:{author_id}"
+
+
+def _before(qs, before: Optional[FeedKey], id_field: str):
+    if before is None:
+        return qs
+    return qs.filter(
+        Q(created_at__lt=before[0]) | Q(created_at=before[0], **{f"{id_field}__lt": before[1]})
+    )
+
+
+def author_recent(author_id: int) -> List[FeedKey]:
+    """
+    Yazarın en yeni RECENT_LENGTH aktivitesi (önbellekten).
+    """
+    conf = config()
+    cache = _recent_cache()
+    keys = cache.get(_recent_key(author_id))
+    if keys is not None:
+        _count(recent_hits=1)
+        return keys
+    _count(recent_misses=1)
+    keys = list(
+        Activity.objects.filter(user_id=author_id)
+        .order_by("-created_at", "-id")
+        .values_list("created_at", "id")[: conf["RECENT_LENGTH"]]
+    )
+    cache.set(_recent_key(author_id), keys, conf["RECENT_TTL"])
+    return keys
+
+
+def _author_stream(author_id: int, before: Optional[FeedKey], limit: int) -> List[FeedKey]:
+    recent = author_recent(author_id)
+    keys = [key for key in recent if before is None or key < before]
+    if len(keys) <= limit and len(recent) >= config()["RECENT_LENGTH"]:
+        # Sayfa önbelleğin derinliğini aşıyor
+        _count(recent_fallbacks=1)
+        keys = list(
+            _before(Activity.objects.filter(user_id=author_id), before, "id")
+            .order_by("-created_at", "-id")
+            .values_list("created_at", "id")[: limit + 1]
+        )
+    return keys[: limit + 1]
+
+
+def timeline_keys(owner_id: int, before: Optional[FeedKey] = None):
+    """
+    Okuyanın hazır akışı, (created_at, activity_id) sırasında.
+    """
+    return (
+        _before(TimelineEntry.objects.filter(owner_id=owner_id), before, "activity_id")
+        .order_by("-created_at", "-activity_id")
+        .values_list("created_at", "activity_id")
+    )
+
+
+def read_feed(
+    owner_id: int, before: Optional[FeedKey] = None, limit: int = 20
+) -> Tuple[List[FeedKey], bool]:
+    """
+    (en fazla `limit` anahtar, devamı var mı). `before` bir önceki sayfanın
+    son anahtarı (cursor).
+    """
+    started = time.perf_counter()
+    own = list(timeline_keys(owner_id, before)[: limit + 1])
+    authors = high_fanout_following(owner_id)
+    streams = [own] + [_author_stream(author_id, before, limit) for author_id in authors]
+
+    keys, seen = [], set()
+    # Eşik aşılmadan önce dağıtılmış satırlar akışta da olabilir
+    for key in heapq.merge(*streams, reverse=True):
+        if key[1] in seen:
+            continue
+        seen.add(key[1])
+        keys.append(key)
+        if len(keys) > limit:
+            break
+
+    elapsed = time.perf_counter() - started
+    with _lock:
+        _read_latencies.append((elapsed, len(authors)))
+    _count(reads=1, merged_authors=len(authors))
+    return keys[:limit], len(keys) > limit
+
+
+def stats() -> Dict[str, Any]:
+    conf = config()
+    with _lock:
+        data = dict(_counters)
+        reads = list(_read_latencies)
+    data["fanout_threshold"] = conf["FANOUT_THRESHOLD"]
+    if reads:
+        plain = sorted(t for t, n in reads if not n)
+        merged = sorted(t for t, n in reads if n)
+
+        def pct(values, p):
+            return round(values[min(int(len(values) * p), len(values) - 1)] * 1000, 2)
+
+        if plain:
+            data["read_p50_ms"] = pct(plain, 0.5)
+            data["read_p95_ms"] = pct(plain, 0.95)
+        if merged:
+            data["merged_read_p50_ms"] = pct(merged, 0.5)
+            data["merged_read_p95_ms"] = pct(merged, 0.95)
+            data["merged_authors_max"] = max(n for _, n in reads)
+    return data
+
+
+metrics.register("timeline", stats)
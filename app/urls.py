@@ -9,11 +9,14 @@ from .views import (
     ProfileViewSet,
     ExternalMovieSearchView,
     ExternalBookSearchView,
+    ExternalSearchView,
+    ExternalImportView,
     RegisterView,
     MeView,
     PasswordResetRequestView,
     PasswordResetConfirmView,
     ReviewViewSet,
+    MetricsView,
 )
 
 router = DefaultRouter()
@@ -70,4 +73,17 @@ urlpatterns = [
         ExternalBookSearchView.as_view(),
         name="external-book-search",
     ),
+    path(
+        "external/search/",
+        ExternalSearchView.as_view(),
+        name="external-search",
+    ),
+    path(
+        "external/import/",
+        ExternalImportView.as_view(),
+        name="external-import",
+    ),
+
+    # Süreç içi metrikler (admin)
+    path("metrics/", MetricsView.as_view(), name="metrics"),
 ]
@@ -1,7 +1,13 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Q, Avg, Count
+from django.db import transaction
+from django.db.models import Q
+from django.http import FileResponse
+from django.utils.cache import patch_vary_headers
 
 from rest_framework import viewsets, permissions, status, generics
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
@@ -18,6 +24,8 @@ from .models import (
     List,
     ListItem,
     Follow,
+    ContentPerson,
+    normalize_name,
 )
 from .serializers import (
     UserSerializer,
@@ -26,6 +34,7 @@ from .serializers import (
     PasswordResetRequestSerializer,
     PasswordResetConfirmSerializer,
     ContentSerializer,
+    ContentCardSerializer,
     RatingSerializer,
     ReviewSerializer,
     UserLibraryEntrySerializer,
@@ -35,8 +44,35 @@ from .serializers import (
     FollowSerializer,
 )
 
-from .services.tmdb import search_movies, get_movie_details, TMDBError
-from .services.google_books import search_books, get_book_details, GoogleBooksError
+from . import metrics
+from .conditional import (
+    CONTENT_VERSION_FIELDS,
+    ConditionalListMixin,
+    annotate_profile_version,
+    content_version,
+    make_etag,
+    not_modified,
+    profile_version,
+    set_validators,
+)
+from .catalog import (
+    DETAIL_FETCHERS,
+    content_from_details,
+    filter_by_genre,
+    filter_by_person,
+    import_contents,
+)
+from .indexes import bitmap_from_ids, facet_index, title_index
+from .posters import PosterError, VARIANTS, poster_store, url_version
+from .posters import config as poster_config
+from .refresh import note_view
+from . import outbox, timeline
+from .search import search_contents
+from .services.breaker import CircuitOpen
+from .services.ratelimit import RateLimited
+from .services.tmdb import get_movie_details, TMDBError, TMDBNotFound
+from .services.google_books import get_book_details, GoogleBooksError, GoogleBooksNotFound
+from .services.unified_search import PROVIDERS, decode_cursor, encode_cursor, search_all
 
 User = get_user_model()
 
@@ -77,16 +113,30 @@ class MeView(APIView):
         return Response(UserSerializer(request.user).data)
 
 
-class ProfileViewSet(viewsets.ReadOnlyModelViewSet):
+class ProfileViewSet(ConditionalListMixin, viewsets.ReadOnlyModelViewSet):
     """
     /api/profiles/
-      - ?username= kullanarak tek profil çekilebilir
+      - ?username= kullanarak tek profil çekilebilir (yine sayfalı döner)
     """
     serializer_class = ProfileSerializer
     permission_classes = [permissions.AllowAny]
+    vary_on_user = True
+
+    def get_list_version(self, obj):
+        return profile_version(obj, self.request)
+
+    def retrieve(self, request, *args, **kwargs):
+        profile = self.get_object()
+        etag = make_etag(*profile_version(profile, request))
+        response = not_modified(request, etag)
+        if response is None:
+            response = Response(self.get_serializer(profile).data)
+            response["ETag"] = etag
+        patch_vary_headers(response, ("Authorization",))
+        return response
 
     def get_queryset(self):
-        qs = Profile.objects.select_related("user")
+        qs = annotate_profile_version(Profile.objects.select_related("user"), self.request)
         username = self.request.query_params.get("username")
         if username:
             qs = qs.filter(user__username=username)
@@ -102,8 +152,14 @@ class MyProfileView(APIView):
 
     def get(self, request):
         profile, _ = Profile.objects.get_or_create(user=request.user)
-        serializer = ProfileSerializer(profile, context={"request": request})
-        return Response(serializer.data)
+        etag = make_etag(*profile_version(profile, request))
+        response = not_modified(request, etag)
+        if response is None:
+            serializer = ProfileSerializer(profile, context={"request": request})
+            response = Response(serializer.data)
+            response["ETag"] = etag
+        patch_vary_headers(response, ("Authorization",))
+        return response
 
     def put(self, request):
         profile, _ = Profile.objects.get_or_create(user=request.user)
@@ -120,24 +176,219 @@ class MyProfileView(APIView):
 # Content
 # -----------------------------
 
-class ContentViewSet(viewsets.ReadOnlyModelViewSet):
+class ContentViewSet(ConditionalListMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = ContentSerializer
     permission_classes = [permissions.AllowAny]
 
-    def get_queryset(self):
-        qs = Content.objects.all().annotate(
-            average_rating=Avg("ratings__score"),
-            rating_count=Count("ratings"),
+    # /batch/ ile tek istekte istenebilecek en fazla içerik
+    MAX_BATCH_SIZE = 100
+    MAX_FACET_MATCHES = 200000
+
+    PERSON_FILTERS = {
+        "director": ContentPerson.Role.DIRECTOR,
+        "writer": ContentPerson.Role.WRITER,
+        "author": ContentPerson.Role.AUTHOR,
+        "cast": ContentPerson.Role.CAST,
+    }
+
+    def get_list_version(self, obj):
+        return (obj.pk, obj.updated_at, obj.rating_count, obj.rating_sum)
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            version = (
+                Content.objects.filter(pk=kwargs.get("pk"))
+                .values(*CONTENT_VERSION_FIELDS, "source", "fetched_at")
+                .first()
+            )
+        except (TypeError, ValueError):
+            version = None
+        if version is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        # Bayatsa eldeki veri dönülür, yenileme arka plan kuyruğuna gider
+        note_view(
+            version["id"], version["source"], version["fetched_at"], version["rating_count"]
+        )
+
+        # ?fields= temsili değiştirdiği için tam path de ETag'e girer
+        etag = make_etag(*content_version(version), request.get_full_path())
+        response = not_modified(request, etag, version["updated_at"])
+        if response is not None:
+            return response
+        response = super().retrieve(request, *args, **kwargs)
+        return set_validators(response, etag, version["updated_at"])
+
+    def get_serializer_class(self):
+        # Listede kart temsili; ?fields= verilirse tam alan kümesinden seçilir
+        if self.action in ("list", "batch") and not self.request.query_params.get("fields"):
+            return ContentCardSerializer
+        return ContentSerializer
+
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def autocomplete(self, request):
+        """
+        GET /api/contents/autocomplete/?q=dun&type=movie&limit=10
+        Bellekteki başlık index'inden ön ek önerileri. Index süreç açılışında
+        arka planda kurulur; kurulana kadar öneriler veritabanındaki başlık ön
+        ekinden gelir, istek kurulumu beklemez.
+        """
+        q = request.query_params.get("q", "")
+        content_type = request.query_params.get("type")
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), 20)
+        except ValueError:
+            limit = 10
+        if content_type not in ["movie", "book"]:
+            content_type = None
+        return Response(title_index.lookup(q, content_type=content_type, limit=limit))
+
+    @action(detail=False, methods=["get", "post"], pagination_class=None)
+    def batch(self, request):
+        """
+        GET  /api/contents/batch/?ids=3,1,2
+        POST /api/contents/batch/  { "ids": [3, 1, 2] }
+        Tek sorguda çoklu içerik; sonuçlar istek sırasıyla döner,
+        bulunamayan id'ler `missing` içinde raporlanır.
+        """
+        if request.method == "POST":
+            raw = request.data.get("ids", [])
+        else:
+            raw = request.query_params.get("ids", "")
+        if isinstance(raw, str):
+            raw = [part for part in raw.split(",") if part.strip()]
+        if not isinstance(raw, list):
+            return Response(
+                {"detail": "ids bir liste olmalı."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            ids = list(dict.fromkeys(int(value) for value in raw))
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "ids sadece sayı içermeli."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(ids) > self.MAX_BATCH_SIZE:
+            return Response(
+                {"detail": f"En fazla {self.MAX_BATCH_SIZE} id istenebilir."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        found = Content.objects.in_bulk(ids)
+        serializer = self.get_serializer(
+            [found[i] for i in ids if i in found], many=True
         )
+        return Response(
+            {
+                "results": serializer.data,
+                "missing": [i for i in ids if i not in found],
+            }
+        )
+
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def facets(self, request):
+        """
+        GET /api/contents/facets/?type=movie&genre=drama&q=...
+        Geçerli filtre kombinasyonu için type / decade / year / genre / source
+        sayıları. Sayılar bellekteki bitmap index'ten gelir; q ve kişi
+        filtrelerinin eşleşmeleri en fazla MAX_FACET_MATCHES id ile sınırlanır.
+        """
+        params = request.query_params
+        filters = {facet: params.get(facet) for facet in facet_index.FACETS}
+        if filters["genre"]:
+            filters["genre"] = normalize_name(filters["genre"])
+
+        restrict, truncated = None, False
+        if params.get("q") or any(params.get(p) for p in self.PERSON_FILTERS):
+            ids = list(
+                self.get_queryset()
+                .order_by()
+                .values_list("id", flat=True)[: self.MAX_FACET_MATCHES + 1]
+            )
+            truncated = len(ids) > self.MAX_FACET_MATCHES
+            restrict = bitmap_from_ids(ids[: self.MAX_FACET_MATCHES])
+
+        data = facet_index.counts(filters, restrict=restrict)
+        data["truncated"] = truncated
+        return Response(data)
+
+    @action(detail=True, methods=["get"], pagination_class=None)
+    def poster(self, request, pk=None):
+        """
+        GET /api/contents/<id>/poster/?size=card   (thumb / card / detail / original)
+        İçeriğin posteri disk önbelleğinden; ilk istekte indirilir / küçültülür.
+        Yalnız içeriğin kendi poster_url'i sunulur (açık proxy değil).
+        """
+        size = request.query_params.get("size", "card")
+        if size not in VARIANTS and size != "original":
+            return Response(
+                {"detail": f"size şunlardan biri olmalı: {', '.join([*VARIANTS, 'original'])}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        poster_url = (
+            Content.objects.filter(pk=pk).values_list("poster_url", flat=True).first()
+            if str(pk).isdigit()
+            else None
+        )
+        if not poster_url:
+            return Response({"detail": "Poster bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
+
+        etag = make_etag(poster_url, size)
+        response = not_modified(request, etag)
+        if response is None:
+            try:
+                digest, content_type = poster_store.variant(poster_url, size)
+            except PosterError as e:
+                return Response({"detail": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+            response = FileResponse(poster_store.open(digest), content_type=content_type)
+            response["ETag"] = etag
+        # v= güncel poster_url'in sürümüyse bu URL'nin içeriği hiç değişmez;
+        # v yoksa ya da eskiyse poster_url değişebileceği için kısa süre
+        conf = poster_config()
+        if request.query_params.get("v") == url_version(poster_url):
+            response["Cache-Control"] = f"public, max-age={conf['MAX_AGE']}, immutable"
+        else:
+            response["Cache-Control"] = f"public, max-age={conf['UNVERSIONED_MAX_AGE']}"
+        return response
+
+    @property
+    def cursor_ordering(self):
+        # Aramada cursor alaka sırasını takip eder
+        if self.request.query_params.get("q"):
+            return ("search_rank", "id")
+        return ("-created_at", "-id")
+
+    def get_queryset(self):
+        # average_rating / rating_count artık Content üzerindeki özet kolonlar
+        qs = Content.objects.all()
         query = self.request.query_params.get("q")
         content_type = self.request.query_params.get("type")  # movie / book
-        if query:
-            qs = qs.filter(
-                Q(title__icontains=query)
-                | Q(original_title__icontains=query)
-            )
         if content_type in ["movie", "book"]:
             qs = qs.filter(type=content_type)
+
+        # Facet değerleriyle birebir: ?source=tmdb, ?year=1999, ?decade=1990
+        source = self.request.query_params.get("source")
+        if source:
+            qs = qs.filter(source=source)
+        for param, span in (("year", 1), ("decade", 10)):
+            value = self.request.query_params.get(param)
+            if value and value.isdigit():
+                qs = qs.filter(year__gte=int(value), year__lt=int(value) + span)
+
+        # Kişi / tür filtreleri normalize tablolardaki index'lerden gider
+        genre = self.request.query_params.get("genre")
+        if genre:
+            qs = filter_by_genre(qs, genre)
+        for param, role in self.PERSON_FILTERS.items():
+            name = self.request.query_params.get(param)
+            if name:
+                qs = filter_by_person(qs, role, name)
+
+        if query:
+            # Tam metin index üzerinden, alaka sırasına göre
+            qs = search_contents(qs, query).order_by("search_rank", "id")
         return qs
 
 
@@ -223,15 +474,45 @@ class ActivityViewSet(viewsets.ReadOnlyModelViewSet):
                 user_id=user_id
             ).order_by("-created_at")
 
+        # Tekil erişim (retrieve) için görünürlük; liste read_feed'den gelir
         following_ids = Follow.objects.filter(
             follower=user
         ).values_list("following_id", flat=True)
-
-        qs = Activity.objects.select_related("user", "content").filter(
+        return Activity.objects.select_related("user", "content").filter(
             Q(user=user) | Q(user_id__in=following_ids)
         )
-        return qs.order_by("-created_at")
-    
+
+    def list(self, request, *args, **kwargs):
+        """
+        GET /api/activities/?cursor=...&page_size=20
+        Ana akış: TimelineEntry üzerinden tek aralık taraması, yüksek takipçili
+        yazarlar okuma anında birleştirilir (app/timeline.py).
+        """
+        if request.query_params.get("user_id"):
+            return super().list(request, *args, **kwargs)
+
+        cursor = request.query_params.get("cursor")
+        try:
+            before = timeline.decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise NotFound(str(e))
+        keys, has_more = timeline.read_feed(
+            request.user.pk, before, self.paginator.get_page_size(request)
+        )
+
+        found = Activity.objects.select_related("user", "content").in_bulk(
+            [activity_id for _, activity_id in keys]
+        )
+        activities = [found[activity_id] for _, activity_id in keys if activity_id in found]
+        next_url = None
+        if has_more:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "cursor", timeline.encode_cursor(keys[-1])
+            )
+        serializer = self.get_serializer(activities, many=True)
+        return Response({"next": next_url, "previous": None, "results": serializer.data})
+
+
 class PasswordResetRequestView(APIView):
     """
     POST /api/auth/password-reset/request/
@@ -370,6 +651,8 @@ class ListItemViewSet(viewsets.ModelViewSet):
     """
     serializer_class = ListItemSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # Keyset (order, id): aynı `order`'a sahip kalemler id ile ayrılır
+    cursor_ordering = ("order", "id")
 
     def get_queryset(self):
         return ListItem.objects.filter(list__user=self.request.user).select_related(
@@ -377,19 +660,79 @@ class ListItemViewSet(viewsets.ModelViewSet):
         )
 
     def perform_create(self, serializer):
-        serializer.save()
+        with transaction.atomic():
+            item = serializer.save()
+            # Gizli listelere eklenenler akışa düşmez
+            if item.list.is_public:
+                outbox.record(
+                    item.list.user_id,
+                    Activity.ActivityType.LIST_ADD,
+                    content_id=item.content_id,
+                    list_id=item.list_id,
+                )
+
+
+# -----------------------------
+# Metrikler
+# -----------------------------
+
+class MetricsView(APIView):
+    """
+    GET /api/metrics/
+    Süreç içi sayaçlar (önbellek isabet oranları vb.), sadece admin.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(metrics.snapshot())
 
 
 # -----------------------------
 # Harici API entegrasyonu (TMDb & Google Books)
 # -----------------------------
 
-class ExternalMovieSearchView(APIView):
+def _search_positions(request, types):
     """
-    GET /api/external/movies/search/?q=...
-    TMDb üzerinden film arama.
+    ?cursor= çözülür; yoksa None (ilk sayfa). Geçersizse ValueError.
+    """
+    cursor = request.query_params.get("cursor")
+    if not cursor:
+        return None
+    positions = decode_cursor(cursor)
+    if not set(positions) <= set(types):
+        raise ValueError("Geçersiz cursor.")
+    return positions
+
+
+def _provider_error(e):
+    """
+    Sağlayıcı hatasının cevabı: bulunamadı 404, kota dolu 429 ve devre açık
+    503 (ikisi de Retry-After ile), diğerleri 502.
+    """
+    if isinstance(e, (TMDBNotFound, GoogleBooksNotFound)):
+        return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+    if isinstance(e.__cause__, RateLimited):
+        return Response(
+            {"detail": str(e)},
+            status=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={"Retry-After": str(e.__cause__.retry_after)},
+        )
+    if isinstance(e.__cause__, CircuitOpen):
+        return Response(
+            {"detail": str(e)},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(e.__cause__.retry_after)},
+        )
+    return Response({"detail": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+
+
+class _ProviderSearchView(APIView):
+    """
+    Tek sağlayıcıda sayfalı arama: { "next": <cursor|null>, "results": [...] }
+    Sonraki sayfa için ?cursor=<next> gönderilir.
     """
     permission_classes = [permissions.AllowAny]
+    content_type = None
 
     def get(self, request):
         q = request.query_params.get("q")
@@ -399,20 +742,48 @@ class ExternalMovieSearchView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         try:
-            results = search_movies(q)
-            return Response(results)
-        except TMDBError as e:
-            return Response(
-                {"detail": str(e)},
-                status=status.HTTP_502_BAD_GATEWAY,
-            )
+            positions = _search_positions(request, [self.content_type])
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        _, fetch_page, first = PROVIDERS[self.content_type]
+        position = (positions or {}).get(self.content_type, first)
+        try:
+            results, next_position = fetch_page(q, position)
+        except (TMDBError, GoogleBooksError) as e:
+            return _provider_error(e)
+        next_cursor = (
+            encode_cursor({self.content_type: next_position})
+            if next_position is not None
+            else None
+        )
+        return Response({"next": next_cursor, "results": results})
+
+
+class ExternalMovieSearchView(_ProviderSearchView):
+    """
+    GET /api/external/movies/search/?q=...&cursor=...
+    TMDb üzerinden film arama.
+    """
+    content_type = "movie"
 
 
-class ExternalBookSearchView(APIView):
+class ExternalBookSearchView(_ProviderSearchView):
     """
-    GET /api/external/books/search/?q=...
+    GET /api/external/books/search/?q=...&cursor=...
     Google Books üzerinden kitap arama.
     """
+    content_type = "book"
+
+
+class ExternalSearchView(APIView):
+    """
+    GET /api/external/search/?q=...&types=movie,book&cursor=...
+    TMDb ve Google Books'ta eşzamanlı arama; sonuçlar tek biçimde döner.
+    Veritabanında zaten olanlar `content_id` ile işaretlenir. Bir sağlayıcı
+    zamanında cevap vermezse diğerinin sonuçları `errors` ile birlikte döner.
+    `next` cursor'ı her sağlayıcının bir sonraki sayfasını taşır.
+    """
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
@@ -422,15 +793,43 @@ class ExternalBookSearchView(APIView):
                 {"detail": "q parametresi gerekli."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        try:
-            results = search_books(q)
-            return Response(results)
-        except GoogleBooksError as e:
+        raw_types = request.query_params.get("types") or ",".join(PROVIDERS)
+        types = [t.strip() for t in raw_types.split(",") if t.strip()]
+        unknown = [t for t in types if t not in PROVIDERS]
+        if unknown or not types:
             return Response(
-                {"detail": str(e)},
-                status=status.HTTP_502_BAD_GATEWAY,
+                {"detail": f"Desteklenmeyen tür: {', '.join(unknown) or raw_types}"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
+        try:
+            positions = _search_positions(request, types)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = search_all(q, types, positions)
+        data["next"] = encode_cursor(data["next"])
+        results = data["results"]
+
+        # Yereldeki karşılıklar tek sorguda
+        existing = {}
+        if results:
+            match = Q()
+            for item in results:
+                match |= Q(source=item["source"], external_id=item["external_id"])
+            existing = {
+                (source, external_id): pk
+                for pk, source, external_id in Content.objects.filter(match).values_list(
+                    "id", "source", "external_id"
+                )
+            }
+        for item in results:
+            item["content_id"] = existing.get((item["source"], item["external_id"]))
+
+        if not results and data["errors"]:
+            return Response(data, status=status.HTTP_502_BAD_GATEWAY)
+        return Response(data)
+
 
 class ExternalImportView(APIView):
     """
@@ -441,10 +840,18 @@ class ExternalImportView(APIView):
     }
 
     Harici API'den detayları çekip Content kaydı oluşturur (veya varsa getirir).
+
+    Toplu mod:
+    { "items": [{"source": "tmdb", "external_id": "123"}, ...] }
+    -> { "results": [{"source", "external_id", "status", "content" | "detail"}] }
     """
     permission_classes = [permissions.IsAuthenticated]
+    MAX_BATCH_SIZE = 50
 
     def post(self, request):
+        if "items" in request.data:
+            return self.post_batch(request)
+
         source = request.data.get("source")
         external_id = request.data.get("external_id")
 
@@ -474,33 +881,59 @@ class ExternalImportView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
         except (TMDBError, GoogleBooksError) as e:
-            return Response(
-                {"detail": str(e)},
-                status=status.HTTP_502_BAD_GATEWAY,
-            )
+            return _provider_error(e)
 
-        content = Content.objects.create(
-            type=details["type"],
-            source=details["source"],
-            external_id=str(details["external_id"]),
-            title=details.get("title") or "",
-            original_title=details.get("original_title") or "",
-            year=details.get("year"),
-            description=details.get("description") or "",
-            poster_url=details.get("poster_url") or "",
-            runtime_minutes=details.get("runtime_minutes"),
-            page_count=details.get("page_count"),
-            directors=details.get("directors", []),
-            writers=details.get("writers", []),
-            authors=details.get("authors", []),
-            genres=details.get("genres", []),
-            cast=details.get("cast", []),
-        )
+        content = content_from_details(details)
+        content.save()
 
         return Response(
             ContentSerializer(content).data,
             status=status.HTTP_201_CREATED,
         )
+
+    def post_batch(self, request):
+        items = request.data.get("items")
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "items boş olmayan bir liste olmalı."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.MAX_BATCH_SIZE:
+            return Response(
+                {"detail": f"En fazla {self.MAX_BATCH_SIZE} öğe içe aktarılabilir."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        pairs = []
+        for item in items:
+            item = item if isinstance(item, dict) else {}
+            source, external_id = item.get("source"), item.get("external_id")
+            if source in DETAIL_FETCHERS and external_id not in (None, ""):
+                pairs.append((source, str(external_id)))
+            else:
+                pairs.append(None)
+
+        imported = {
+            (result["source"], result["external_id"]): result
+            for result in import_contents([pair for pair in pairs if pair])
+        }
+        results = []
+        for item, pair in zip(items, pairs):
+            if pair is None:
+                results.append(
+                    {
+                        "source": item.get("source") if isinstance(item, dict) else None,
+                        "external_id": item.get("external_id") if isinstance(item, dict) else None,
+                        "status": "invalid",
+                        "detail": "Geçerli source ve external_id gerekli.",
+                    }
+                )
+                continue
+            result = dict(imported[pair])
+            if "content" in result:
+                result["content"] = ContentSerializer(result["content"]).data
+            results.append(result)
+        return Response({"results": results})
 class IsReviewOwnerOrReadOnly(permissions.BasePermission):
     """
     Yorumlar için:
@@ -534,4 +967,12 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         # Yeni yorum oluştururken user otomatik login user olsun
-        serializer.save(user=self.request.user)
\ No newline at end of file
+        with transaction.atomic():
+            review = serializer.save(user=self.request.user)
+            outbox.record(
+                review.user_id,
+                Activity.ActivityType.REVIEW,
+                content_id=review.content_id,
+                rating_id=review.rating_id,
+                review_id=review.pk,
+            )
\ No newline at end of file
@@ -136,6 +136,109 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.AllowAny",
     ),
+    # Liste endpoint'leri (created_at, id) üzerinden cursor ile sayfalanır.
+    # Bir view'da kapatmak için: pagination_class = None
+    "DEFAULT_PAGINATION_CLASS": "app.pagination.KeysetCursorPagination",
+    "PAGE_SIZE": 20,
+}
+
+# ?page_size= ile istenebilecek en büyük sayfa
+MAX_PAGE_SIZE = 100
+
+# Geliştirme ve testlerde locmem; production'da redis/memcached backend'i verilir.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "social-library",
+    }
+}
+
+# Serileştirilmiş Content önbelleği (app/cache.py)
+CONTENT_CACHE = {
+    "ALIAS": "default",
+    "LOCAL_MAX_ENTRIES": 5000,  # süreç içi LRU boyutu
+    "TIMEOUT": 600,  # paylaşılan cache'te saniye
+}
+
+# Harici sağlayıcı HTTP istemcisi (app/services/http.py)
+EXTERNAL_HTTP = {
+    "CONNECT_TIMEOUT": 3.05,
+    "READ_TIMEOUT": 10,
+    "RETRIES": 2,
+    "POOL_SIZE": 10,
+    "DEADLINE": 12,  # saniye; tek çağrının tüm denemeler ve beklemeler dahil süresi
+}
+
+# Sağlayıcı devre kesicisi (app/services/breaker.py); None: kapalı
+EXTERNAL_CIRCUIT_BREAKER = {
+    "WINDOW": 30,  # saniye; hata oranı bu pencerede hesaplanır
+    "MIN_REQUESTS": 10,  # pencerede bundan az deneme varsa devre açılmaz
+    "FAILURE_RATE": 0.5,
+    "OPEN_SECONDS": 30,  # açık kalma süresi; sonra yarı açık denemeler
+    "HALF_OPEN_PROBES": 2,
+}
+
+# Sağlayıcı kotaları (app/services/ratelimit.py); RATE saniyede istek
+EXTERNAL_RATE_LIMITS = {
+    "SHARED": False,  # True: cache üzerinden tüm worker'lar toplamı sınırlanır
+    "INTERACTIVE_MAX_WAIT": 2.0,
+    "BACKGROUND_MAX_WAIT": 60.0,
+    "BACKGROUND_RESERVE": 0.25,
+    "PROVIDERS": {
+        "tmdb": {"RATE": 40, "BURST": 40},
+        "google_books": {"RATE": 10, "BURST": 20},
+    },
+}
+
+# Harici arama sonuç önbelleği (app/services/search_cache.py)
+EXTERNAL_SEARCH_CACHE = {
+    "TTL": 300,  # saniye; bu süre boyunca taze
+    "STALE_TTL": 3600,  # TTL sonrası eski değer dönülüp arka planda yenilenir
+    "NEGATIVE_TTL": 60,  # boş sonuçlar bu kadar tutulur, bayat sunulmaz
+    "NOT_FOUND_TTL": 300,  # detayda 404 dönen id'ler bu kadar hatırlanır
+    "MAX_ENTRIES": 2000,
+}
+
+# /api/external/search/: sağlayıcılar paralel çağrılır, en fazla bu kadar beklenir
+EXTERNAL_SEARCH_TIMEOUT = 6
+EXTERNAL_SEARCH_WORKERS = 8
+# Toplu içe aktarmada aynı anda çekilen detay sayısı
+EXTERNAL_IMPORT_CONCURRENCY = 4
+
+# Content meta verisinin arka planda yenilenmesi (app/refresh.py)
+CONTENT_REFRESH = {
+    "MAX_AGE_DAYS": 30,  # bundan eski fetched_at bayat sayılır
+    "RATE_PER_MINUTE": 30,  # worker'ın sağlayıcılara en fazla istek hızı
+    "MAX_ATTEMPTS": 5,
+}
+
+# Activity üretimi: transactional outbox, istek dışında toplu işlenir (app/outbox.py)
+ACTIVITY_OUTBOX = {
+    "AUTO_FLUSH": True,  # False: `manage.py flush_activity_outbox --loop` çalıştırılır
+    "FLUSH_DELAY": 1.0,  # saniye; bu sürede biriken yazımlar tek partide işlenir
+    "COALESCE_WINDOW": 600,  # aynı kullanıcı/tür/içerik tekrarları bu sürede birleşir
+}
+
+# Ana sayfa akışları (app/timeline.py)
+TIMELINE = {
+    "MAX_LENGTH": 800,  # kullanıcı başına tutulan en yeni satır
+    "BACKFILL": 50,  # yeni takipte akışa eklenen geçmiş aktivite
+    # Bu kadar ve daha fazla takipçisi olanın aktiviteleri takipçilere yazılmaz,
+    # okurken yazarın son RECENT_LENGTH aktivitesinden birleştirilir
+    "FANOUT_THRESHOLD": 10000,
+    "RECENT_LENGTH": 200,
+    "RECENT_TTL": 300,  # saniye
+    # Takipçi sayısı eşiğin altına inince son RECENT_LENGTH aktivite takipçilere
+    # arka plan thread'inde yazılır (False: commit sonrası aynı istekte)
+    "BACKFILL_ASYNC": True,
+}
+
+# Poster vekili ve disk önbelleği (app/posters.py)
+POSTER_CACHE = {
+    "DIR": BASE_DIR / "poster_cache",
+    "MAX_AGE": 60 * 60 * 24 * 365,  # Cache-Control max-age (saniye), güncel v= ile
+    "UNVERSIONED_MAX_AGE": 300,  # v= yoksa ya da poster_url değiştiyse
+    "MAX_BYTES": 5 * 1024 * 1024,  # bundan büyük görseller reddedilir
 }
 
 CORS_ALLOWED_ORIGINS = [
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_wsgi_application()
+
+# Bellek içi Content index'lerini (autocomplete vb.) açılışta kur
+from app.indexes import warm_indexes  # noqa: E402
+
+warm_indexes()
@@ -1,9 +1,9 @@
 // src/api/activity.ts
 import api from "./axios";
-import type { Activity } from "../types";
+import type { Activity, Paginated } from "../types";
 
 export const fetchActivities = async (): Promise<Activity[]> => {
-  const res = await api.get<Activity[]>("/activities/");
-  return res.data;
+  const res = await api.get<Paginated<Activity>>("/activities/");
+  return res.data.results;
 };
 
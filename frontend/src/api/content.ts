@@ -1,16 +1,48 @@
 // src/api/content.ts
 import api from "./axios";
-import type { Content } from "../types";
+import type { Content, Paginated } from "../types";
 
 export const searchContents = async (
   query: string,
   type: "all" | "movie" | "book"
 ): Promise<Content[]> => {
-  const params: any = {};
+  // Kart alanları + arama sonucunda gösterilen açıklama
+  const params: any = {
+    fields: "id,type,title,year,poster_url,posters,average_rating,rating_count,description",
+    expand: "posters",
+  };
   if (query) params.q = query;
   if (type === "movie" || type === "book") params.type = type;
 
-  const res = await api.get<Content[]>("/contents/", { params });
+  const res = await api.get<Paginated<Content>>("/contents/", { params });
+  return res.data.results;
+};
+
+export interface ContentSuggestion {
+  id: number;
+  title: string;
+  type: "movie" | "book";
+  year?: number | null;
+}
+
+export const autocompleteContents = async (
+  query: string,
+  type: "all" | "movie" | "book"
+): Promise<ContentSuggestion[]> => {
+  const params: any = { q: query };
+  if (type === "movie" || type === "book") params.type = type;
+
+  const res = await api.get<ContentSuggestion[]>("/contents/autocomplete/", { params });
+  return res.data;
+};
+
+export const getContentsByIds = async (
+  ids: number[]
+): Promise<{ results: Content[]; missing: number[] }> => {
+  const res = await api.post<{ results: Content[]; missing: number[] }>(
+    "/contents/batch/",
+    { ids }
+  );
   return res.data;
 };
 
@@ -1,16 +1,55 @@
 // src/api/external.ts
 import api from "./axios";
 
-export const searchExternalMovies = async (query: string) => {
+// Sayfalı cevap: sonraki sayfa için `next` cursor'ı geri gönderilir
+export interface ExternalPage<T = any> {
+  next: string | null;
+  results: T[];
+}
+
+export const searchExternalMovies = async (
+  query: string,
+  cursor?: string | null
+): Promise<ExternalPage> => {
   const res = await api.get("/external/movies/search/", {
-    params: { q: query },
+    params: { q: query, cursor: cursor || undefined },
   });
   return res.data;
 };
 
-export const searchExternalBooks = async (query: string) => {
+export const searchExternalBooks = async (
+  query: string,
+  cursor?: string | null
+): Promise<ExternalPage> => {
   const res = await api.get("/external/books/search/", {
-    params: { q: query },
+    params: { q: query, cursor: cursor || undefined },
+  });
+  return res.data;
+};
+
+export interface ExternalSearchResult {
+  type: "movie" | "book";
+  source: "tmdb" | "google_books";
+  external_id: string;
+  title: string | null;
+  original_title: string | null;
+  year: string | null;
+  poster_url: string | null;
+  description: string;
+  content_id: number | null; // zaten içe aktarılmışsa
+}
+
+export interface ExternalSearchResponse extends ExternalPage<ExternalSearchResult> {
+  errors: Partial<Record<"movie" | "book", string>>;
+}
+
+export const searchExternal = async (
+  query: string,
+  types: Array<"movie" | "book"> = ["movie", "book"],
+  cursor?: string | null
+): Promise<ExternalSearchResponse> => {
+  const res = await api.get("/external/search/", {
+    params: { q: query, types: types.join(","), cursor: cursor || undefined },
   });
   return res.data;
 };
@@ -1,10 +1,10 @@
 // src/api/library.ts
 import api from "./axios";
-import type { LibraryEntry, LibraryStatus } from "../types";
+import type { LibraryEntry, LibraryStatus, Paginated } from "../types";
 
 export const fetchLibrary = async (): Promise<LibraryEntry[]> => {
-  const res = await api.get<LibraryEntry[]>("/library-entries/");
-  return res.data;
+  const res = await api.get<Paginated<LibraryEntry>>("/library-entries/");
+  return res.data.results;
 };
 
 export const addToLibrary = async (
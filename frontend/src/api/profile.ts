@@ -5,8 +5,8 @@ export const fetchProfileByUsername = async (username: string) => {
   const res = await api.get("/profiles/", {
     params: { username },
   });
-  // ViewSet list döndüğü için ilk elemanı alıyoruz
-  return res.data[0];
+  // Sayfalı list döndüğü için ilk sonucu alıyoruz
+  return res.data.results[0];
 };
 
 export const fetchMyProfile = async () => {
@@ -23,13 +23,13 @@ export const fetchUserLibrary = async (userId: number) => {
   const res = await api.get("/library-entries/", {
     params: { user_id: userId },
   });
-  return res.data;
+  return res.data.results;
 };
 
 export const fetchUserActivities = async (userId: number) => {
   const res = await api.get("/activities/", {
     params: { user_id: userId },
   });
-  return res.data;
+  return res.data.results;
 };
 
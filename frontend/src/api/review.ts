@@ -1,5 +1,6 @@
 // src/api/review.ts
 import api from "./axios";
+import type { Paginated } from "../types";
 
 export interface Review {
   id: number;
@@ -13,10 +14,10 @@ export interface Review {
 }
 
 export const fetchReviews = async (contentId: number) => {
-  const res = await api.get<Review[]>("/reviews/", {
+  const res = await api.get<Paginated<Review>>("/reviews/", {
     params: { content: contentId },
   });
-  return res.data;
+  return res.data.results;
 };
 
 export const createReview = async (contentId: number, text: string) => {
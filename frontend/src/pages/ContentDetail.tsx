@@ -48,7 +48,9 @@ const ContentDetail = () => {
         setLoading(true);
         setError(null);
 
-        const res = await api.get<Content>(`/contents/${contentId}/`);
+        const res = await api.get<Content>(`/contents/${contentId}/`, {
+          params: { expand: "posters" },
+        });
         setContent(res.data);
 
         // Kullanıcının bu içerikle ilgili library durumunu ve rating'ini
@@ -146,7 +148,7 @@ const ContentDetail = () => {
         {/* Poster */}
         {content.poster_url && (
           <img
-            src={content.poster_url}
+            src={content.posters?.detail.url ?? content.poster_url}
             alt={content.title}
             className="w-full md:w-48 h-auto max-h-72 object-cover rounded-xl border border-slate-800"
           />
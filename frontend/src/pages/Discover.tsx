@@ -107,7 +107,7 @@ const Discover = () => {
           >
             {item.poster_url && (
               <img
-                src={item.poster_url}
+                src={item.posters?.card.url ?? item.poster_url}
                 alt={item.title}
                 className="w-full h-56 object-cover border-b border-slate-800"
               />
@@ -9,20 +9,22 @@ import { useNavigate } from "react-router-dom";
 const DiscoverSearch = () => {
   const [query, setQuery] = useState("");
   const [results, setResults] = useState<any[]>([]);
+  const [next, setNext] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
   const [mode, setMode] = useState<"movie" | "book">("movie");
 
   const navigate = useNavigate();
 
-  const handleSearch = async () => {
+  const handleSearch = async (cursor: string | null = null) => {
     if (!query.trim()) return;
     setLoading(true);
     try {
       const data =
         mode === "movie"
-          ? await searchExternalMovies(query)
-          : await searchExternalBooks(query);
-      setResults(data);
+          ? await searchExternalMovies(query, cursor)
+          : await searchExternalBooks(query, cursor);
+      setResults((prev) => (cursor ? [...prev, ...data.results] : data.results));
+      setNext(data.next);
     } catch (err) {
       console.error(err);
       alert("Arama sırasında bir hata oluştu.");
@@ -67,7 +69,7 @@ const DiscoverSearch = () => {
         </select>
 
         <button
-          onClick={handleSearch}
+          onClick={() => handleSearch()}
           className="px-3 py-2 rounded bg-indigo-600 hover:bg-indigo-500 text-sm text-white"
         >
           Ara
@@ -104,6 +106,15 @@ const DiscoverSearch = () => {
           </div>
         ))}
       </div>
+
+      {next && !loading && (
+        <button
+          onClick={() => handleSearch(next)}
+          className="w-full px-3 py-2 rounded bg-slate-800 hover:bg-slate-700 text-sm text-slate-200"
+        >
+          Daha fazla sonuç
+        </button>
+      )}
     </div>
   );
 };
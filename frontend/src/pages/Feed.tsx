@@ -3,7 +3,7 @@ import { useEffect, useState, useContext } from "react";
 import { Link } from "react-router-dom";
 import api from "../api/axios";
 import { AuthContext } from "../context/AuthContext";
-import type { Content } from "../types";
+import type { Content, Paginated } from "../types";
 
 interface ActivityUser {
   id: number;
@@ -32,8 +32,8 @@ const Feed = () => {
       try {
         setLoading(true);
         setError(null);
-        const res = await api.get<Activity[]>("/activities/");
-        setActivities(res.data);
+        const res = await api.get<Paginated<Activity>>("/activities/");
+        setActivities(res.data.results);
       } catch (err) {
         console.error(err);
         setError("Akış yüklenirken bir hata oluştu.");
@@ -6,6 +6,8 @@ export interface User {
   email: string;
 }
 
+export type PosterSize = "thumb" | "card" | "detail";
+
 export interface Content {
   id: number;
   type: "movie" | "book";
@@ -15,6 +17,8 @@ export interface Content {
   original_title?: string;
   year?: number | null;
   poster_url?: string | null;
+  // ?expand=posters ile gelen vekil URL'leri
+  posters?: Record<PosterSize, { url: string; width: number }> | null;
   description?: string;
   page_count?: number | null;
   runtime_minutes?: number | null;
@@ -23,6 +27,13 @@ export interface Content {
 }
 
 
+// Liste endpoint'leri cursor ile sayfalanır
+export interface Paginated<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
 export type ActivityType = "rating" | "review" | "library" | "list_add";
 
 export interface Activity {